@@ -37,12 +37,23 @@ class WhisperModelConfig(BaseModel):
     compute_type: Quantization = Quantization.INT8_FLOAT16 if torch.cuda.is_available() else Quantization.DEFAULT
     cpu_threads: int = 0
     num_workers: int = Field(default_factory=lambda: int(os.getenv("WHISPER_NUM_WORKERS", "4")))
+    replicas: int = Field(default_factory=lambda: int(os.getenv("WHISPER_REPLICAS", "1")), ge=1)
+    memory_budget_mb: float | None = Field(
+        default_factory=lambda: (
+            float(os.environ["WHISPER_MODEL_MEMORY_BUDGET_MB"]) if os.getenv("WHISPER_MODEL_MEMORY_BUDGET_MB") else None
+        )
+    )
 
 
 class FasterWhisperConfig(BaseModel):
     """Default parameters and thresholds for transcription and translation."""
 
     default_model_name: str = Field(default_factory=lambda: os.getenv("DEFAULT_WHISPER_MODEL", "large-v2"))
+    extra_model_names: list[str] = Field(
+        default_factory=lambda: [
+            name.strip() for name in os.getenv("WHISPER_EXTRA_MODELS", "").split(",") if name.strip()
+        ]
+    )
     default_prompt: str = ""
     default_language: Language | None = None
     default_response_format: ResponseFormat = ResponseFormat.JSON
@@ -82,6 +93,22 @@ class FasterWhisperConfig(BaseModel):
     compression_ratio_threshold: float = 2.4
     log_prob_threshold: float = -1.0
     prompt_reset_on_temperature: float = 0.5
+    hallucination_patterns_file: str | None = Field(
+        default_factory=lambda: os.getenv("WHISPER_HALLUCINATION_PATTERNS") or None
+    )
+    decode_budget_s: float | None = Field(
+        default_factory=lambda: (
+            float(os.environ["WHISPER_DECODE_BUDGET_S"]) if os.getenv("WHISPER_DECODE_BUDGET_S") else None
+        )
+    )
+    stream_heartbeat_s: float = Field(
+        default_factory=lambda: float(os.getenv("WHISPER_STREAM_HEARTBEAT_S") or 15.0), ge=0.0
+    )
+
+    @property
+    def served_model_names(self) -> list[str]:
+        """The default model followed by the extra served models, without duplicates."""
+        return list(dict.fromkeys([self.default_model_name, *self.extra_model_names]))
 
 
 class LanguageIdConfig(BaseModel):
@@ -101,21 +128,101 @@ class LanguageIdConfig(BaseModel):
     min_language_mass_s: float = Field(default=15.0, gt=0.0)
     switch_penalty: float = Field(default=2.0, ge=0.0)
     evidence_cap_s: float = Field(default=10.0, gt=0.0)
+    encoder_cache_mb: float = Field(default=256.0, ge=0.0)
+    max_windows: int = Field(default=0, ge=0)
+    stable_batches: int = Field(default=3, ge=1)
+    precheck_windows: int = Field(default=6, ge=0)
+    precheck_threshold: float = Field(default=0.9, gt=0.0, le=1.0)
 
     @classmethod
     def from_env(cls, prefix: str = "LID_") -> "LanguageIdConfig":
-        overrides = {
-            name: os.environ[f"{prefix}{name.upper()}"]
-            for name in cls.model_fields
-            if f"{prefix}{name.upper()}" in os.environ
-        }
-        return cls.model_validate(overrides)
+        return cls.model_validate(_env_overrides(cls, prefix))
+
+
+class CascadeConfig(BaseModel):
+    """Two-tier decoding: a fast draft model decodes everything and only segments
+    whose confidence falls below these thresholds are re-decoded with the served
+    model; consumed by ``utils/model_cascade.py``.
+
+    Disabled unless ``draft_model`` is set. Every field can be overridden by an
+    environment variable named ``CASCADE_<FIELD>`` (e.g.
+    ``CASCADE_DRAFT_MODEL=small``), same as ``LanguageIdConfig``.
+    """
+
+    draft_model: str | None = None
+    min_avg_logprob: float = Field(default=-0.6, le=0.0)
+    max_compression_ratio: float = Field(default=2.0, gt=0.0)
+    max_no_speech_prob: float = Field(default=0.5, ge=0.0, le=1.0)
+    context_s: float = Field(default=1.0, ge=0.0)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.draft_model)
+
+    @classmethod
+    def from_env(cls, prefix: str = "CASCADE_") -> "CascadeConfig":
+        return cls.model_validate(_env_overrides(cls, prefix))
+
+
+class RepetitionConfig(BaseModel):
+    """Online detection of decode repetition loops; consumed by
+    ``utils/repetition_guard.py``.
+
+    Every field can be overridden by an environment variable named
+    ``REPETITION_<FIELD>`` (e.g. ``REPETITION_MIN_REPEATS=6``), same as
+    ``LanguageIdConfig``.
+    """
+
+    enabled: bool = True
+    max_period_tokens: int = Field(default=32, ge=1)
+    min_repeats: int = Field(default=4, ge=2)
+    min_span_tokens: int = Field(default=24, ge=1)
+    max_tokens_per_s: float = Field(default=25.0, gt=0.0)
+    min_rate_tokens: int = Field(default=20, ge=1)
+    min_rate_duration_s: float = Field(default=1.0, gt=0.0)
+    skip_s: float = Field(default=2.0, gt=0.0)
+    max_restarts: int = Field(default=16, ge=0)
+
+    @classmethod
+    def from_env(cls, prefix: str = "REPETITION_") -> "RepetitionConfig":
+        return cls.model_validate(_env_overrides(cls, prefix))
+
+
+class CompressionConfig(BaseModel):
+    """Negotiated compression of transcript responses; consumed by
+    ``utils/response_compression.py``.
+
+    Every field can be overridden by an environment variable named
+    ``COMPRESSION_<FIELD>`` (e.g. ``COMPRESSION_MIN_BYTES=4096``), same as
+    ``LanguageIdConfig``.
+    """
+
+    enabled: bool = True
+    min_bytes: int = Field(default=1024, ge=0)
+    offload_bytes: int = Field(default=256 * 1024, ge=0)
+    gzip_level: int = Field(default=5, ge=1, le=9)
+
+    @classmethod
+    def from_env(cls, prefix: str = "COMPRESSION_") -> "CompressionConfig":
+        return cls.model_validate(_env_overrides(cls, prefix))
+
+
+def _env_overrides(cls: type[BaseModel], prefix: str) -> dict[str, str]:
+    """Raw ``<PREFIX><FIELD>`` environment values for the fields of ``cls`` that are set."""
+    return {
+        name: os.environ[f"{prefix}{name.upper()}"]
+        for name in cls.model_fields
+        if f"{prefix}{name.upper()}" in os.environ
+    }
 
 
 class AppConfig(AbstractAppConfig):
     whisper_model: WhisperModelConfig = Field(default_factory=WhisperModelConfig)
     faster_whisper: FasterWhisperConfig = Field(default_factory=FasterWhisperConfig)
     language_id: LanguageIdConfig = Field(default_factory=LanguageIdConfig.from_env)
+    cascade: CascadeConfig = Field(default_factory=CascadeConfig.from_env)
+    repetition: RepetitionConfig = Field(default_factory=RepetitionConfig.from_env)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig.from_env)
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -135,3 +242,5 @@ def get_config() -> AppConfig:
 # Sub-config defaults exported at import time for static schema constraints.
 faster_whisper_config = get_config().faster_whisper
 language_id_config = get_config().language_id
+repetition_config = get_config().repetition
+compression_config = get_config().compression
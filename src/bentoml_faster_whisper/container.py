@@ -14,6 +14,7 @@ class Container(containers.DeclarativeContainer):
         WhisperModelProvider,
         whisper_config=config.provided.whisper_model,
         default_model_name=config.provided.faster_whisper.default_model_name,
+        cascade_config=config.provided.cascade,
     )
 
     diarization_service = providers.Singleton(DiarizationService)
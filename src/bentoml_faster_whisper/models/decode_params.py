@@ -1,11 +1,13 @@
 from typing import Annotated
 
-from annotated_types import Ge, Le, MaxLen
-from pydantic import BaseModel, Field
+from annotated_types import Ge, Gt, Le, MaxLen
+from pydantic import AliasChoices, BaseModel, Field
 
 from bentoml_faster_whisper.config import faster_whisper_config
+from bentoml_faster_whisper.models.enums import SegmentField
 from bentoml_faster_whisper.models.input_models import (
     ModelName,
+    SegmentFields,
     ValidatedResponseFormat,
     ValidatedTemperature,
     ValidatedVadOptions,
@@ -28,7 +30,19 @@ class DecodeParams(BaseModel):
     response_format: ValidatedResponseFormat = Field(
         default=faster_whisper_config.default_response_format,
         description="The format of the output, in one of these options: `json`, `text`, `srt`, `verbose_json`, "
-        "`vtt`, or `json_diarized`.",
+        "`vtt`, `json_diarized`, or `arrow` (an Apache Arrow IPC stream with one row per segment and the words "
+        "as list columns; not available for streaming or task requests).",
+    )
+    include: SegmentFields = Field(
+        default=None,
+        validation_alias=AliasChoices("include", "include[]"),
+        description="`verbose_json` only: the segment fields to return (list or comma-separated string, e.g. "
+        '"start,end,text"). Other fields are left out of every segment. Not set: all fields.',
+    )
+    compact: bool = Field(
+        default=False,
+        description="`verbose_json` only: leave the token ids and the per-segment copy of the words out of every "
+        "segment. Words are still returned once, at the top level.",
     )
     temperature: ValidatedTemperature = Field(
         default=faster_whisper_config.default_temperature,
@@ -88,3 +102,20 @@ class DecodeParams(BaseModel):
         default=faster_whisper_config.prompt_reset_on_temperature,
         description="Resets prompt if temperature is above this value. Arg has effect only if condition_on_previous_text is True.",
     )
+    decode_budget_s: Annotated[float, Gt(0.0)] | None = Field(
+        default=faster_whisper_config.decode_budget_s,
+        description="Wall-clock budget in seconds for this request. Once half of it is spent, the remaining decode "
+        "runs get at most one temperature fallback and a narrower beam; once it is spent they decode greedily at "
+        "the first temperature only. Segments decoded with cut-back settings are flagged `degraded`. Not set: "
+        "no budget.",
+    )
+
+    @property
+    def verbose_segment_fields(self) -> frozenset[str] | None:
+        """The segment fields ``verbose_json`` writes, ``None`` for all of them."""
+        if not self.include and not self.compact:
+            return None
+        fields = {field.value for field in (self.include or SegmentField)}
+        if self.compact:
+            fields -= {SegmentField.TOKENS.value, SegmentField.WORDS.value}
+        return frozenset(fields)
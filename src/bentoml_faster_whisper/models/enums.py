@@ -116,6 +116,31 @@ class ResponseFormat(enum.StrEnum):
     VERBOSE_JSON = "verbose_json"
     SRT = "srt"
     VTT = "vtt"
+    ARROW = "arrow"
+
+
+class SegmentField(enum.StrEnum):
+    """Fields of a ``verbose_json`` segment, for the ``include`` request parameter."""
+
+    ID = "id"
+    SEEK = "seek"
+    START = "start"
+    END = "end"
+    TEXT = "text"
+    TOKENS = "tokens"
+    TEMPERATURE = "temperature"
+    AVG_LOGPROB = "avg_logprob"
+    COMPRESSION_RATIO = "compression_ratio"
+    NO_SPEECH_PROB = "no_speech_prob"
+    WORDS = "words"
+    SPEAKER = "speaker"
+    LANGUAGE = "language"
+    DEGRADED = "degraded"
+
+
+class StreamFormat(enum.StrEnum):
+    NDJSON = "ndjson"
+    SSE = "sse"
 
 
 class Task(enum.StrEnum):
@@ -5,16 +5,16 @@ from bentoml.exceptions import InvalidArgument
 from pydantic import AfterValidator, BaseModel, BeforeValidator, Field
 
 from bentoml_faster_whisper.config import faster_whisper_config
-from bentoml_faster_whisper.models.enums import ResponseFormat, TimestampGranularity
+from bentoml_faster_whisper.models.enums import ResponseFormat, SegmentField, TimestampGranularity
 from bentoml_faster_whisper.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 def _validate_served_model(model: str) -> str:
-    served = faster_whisper_config.default_model_name
-    if model != served:
-        raise ValueError(f"Only '{served}' is served by this API; got '{model}'.")
+    served = faster_whisper_config.served_model_names
+    if model not in served:
+        raise ValueError(f"Model '{model}' is not served by this API; served: {', '.join(map(repr, served))}.")
     return model
 
 
@@ -22,7 +22,8 @@ ModelName = Annotated[
     str,
     AfterValidator(_validate_served_model),
     Field(
-        description=f"Whisper model to use. Only '{faster_whisper_config.default_model_name}' is served by this API.",
+        description="Whisper model to use. Served by this API: "
+        f"{', '.join(map(repr, faster_whisper_config.served_model_names))}.",
         examples=[faster_whisper_config.default_model_name],
     ),
 ]
@@ -41,6 +42,17 @@ def _convert_timestamp_granularities(
 TimestampGranularities = Annotated[list[TimestampGranularity], BeforeValidator(_convert_timestamp_granularities)]
 
 
+def _convert_segment_fields(fields: str | bytes | list[SegmentField] | None) -> list[SegmentField] | None:
+    if isinstance(fields, bytes):
+        fields = fields.decode("utf-8")
+    if isinstance(fields, str):
+        fields = [SegmentField(field.strip()) for field in fields.split(",") if field.strip()]
+    return fields or None
+
+
+SegmentFields = Annotated[list[SegmentField] | None, BeforeValidator(_convert_segment_fields)]
+
+
 def _convert_temperature(
     temperature: str | int | float | list[float],
 ) -> list[float]:
@@ -99,13 +111,13 @@ ValidatedResponseFormat = Annotated[ResponseFormat, BeforeValidator(_process_emp
 
 
 def validate_timestamp_granularities(response_format, timestamp_granularities, diarization: bool | None):
-    if (
-        timestamp_granularities != faster_whisper_config.default_timestamp_granularities
-        and response_format != ResponseFormat.VERBOSE_JSON
+    if timestamp_granularities != faster_whisper_config.default_timestamp_granularities and response_format not in (
+        ResponseFormat.VERBOSE_JSON,
+        ResponseFormat.ARROW,
     ):
         logger.warning(
             "It only makes sense to provide `timestamp_granularities[]` when `response_format` is set to "
-            "`verbose_json`. See https://platform.openai.com/docs/api-reference/audio/createTranscription#audio"
+            "`verbose_json` or `arrow`. See https://platform.openai.com/docs/api-reference/audio/createTranscription#audio"
             "-createtranscription-timestamp_granularities."
             # noqa: E501
         )
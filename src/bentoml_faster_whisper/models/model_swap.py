@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+from bentoml_faster_whisper.config import Quantization
+
+
+class ModelSwapRequest(BaseModel):
+    model: str = Field(description="Model id to serve under the default model name, e.g. a Hugging Face repo id.")
+    compute_type: Quantization | None = Field(
+        default=None,
+        description="Compute type for the new model. Not set: keep the current one.",
+    )
+
+
+class ModelSwapStatus(BaseModel):
+    model_name: str = Field(description="Public name the default model is served under.")
+    model_id: str = Field(description="Model id currently loaded behind that name.")
+    compute_type: Quantization
+    swapping: bool = Field(description="A swap is loading or warming the replacement model.")
+    last_error: str | None = Field(default=None, description="Why the last swap failed, if it did.")
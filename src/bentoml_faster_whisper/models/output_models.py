@@ -1,16 +1,20 @@
-from typing import Annotated, Generator, Iterable, Literal
+import time
+from typing import Annotated, Any, Generator, Iterable, Iterator, Literal
 
+import pydantic_core
+from bentoml.exceptions import BentoMLException
 from bentoml.validators import ContentType
 from faster_whisper.transcribe import TranscriptionInfo
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
-from bentoml_faster_whisper.models.enums import ResponseFormat
+from bentoml_faster_whisper.models.enums import ResponseFormat, SegmentField, StreamFormat
+from bentoml_faster_whisper.models.transcription_arrow_response import ARROW_MEDIA_TYPE, segments_to_arrow
 from bentoml_faster_whisper.models.transcription_json_diarized_response import (
     TranscriptionJsonDiarizedResponse,
 )
 from bentoml_faster_whisper.models.transcription_json_response import TranscriptionJsonResponse
 from bentoml_faster_whisper.models.transcription_verbose_json_response import TranscriptionVerboseJsonResponse
-from bentoml_faster_whisper.utils.core import Segment, segments_to_srt, segments_to_text, segments_to_vtt
+from bentoml_faster_whisper.utils.core import Segment, Word, segments_to_srt, segments_to_text, segments_to_vtt
 from bentoml_faster_whisper.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -31,6 +35,7 @@ def content_type_for_format(response_format: ResponseFormat) -> str:
         ResponseFormat.TEXT: "text/plain; charset=utf-8",
         ResponseFormat.VTT: "text/vtt; charset=utf-8",
         ResponseFormat.SRT: "application/x-subrip; charset=utf-8",
+        ResponseFormat.ARROW: ARROW_MEDIA_TYPE,
     }.get(response_format, "application/json")
 
 
@@ -62,56 +67,317 @@ class ModelListResponse(BaseModel):
     object: Literal["list"] = "list"
 
 
-def segments_to_response(
+# The JSON formats are written straight from the internal segments: no response model is
+# validated per request or per segment. pydantic_core applies the same serialization rules
+# as the models (field order, float formatting, escaping, non-finite floats as null), so
+# the bytes are identical to ``model_dump_json()`` of the corresponding response model.
+def _to_json(value: Any) -> str:
+    return pydantic_core.to_json(value, inf_nan_mode="null").decode()
+
+
+def _json_body(segments: list[Segment]) -> str:
+    return _to_json({"text": segments_to_text(segments)})
+
+
+def _diarized_segment(segment: Segment) -> dict[str, Any]:
+    return {
+        "start": float(segment.start),
+        "end": float(segment.end),
+        "text": segment.text,
+        "speaker": segment.speaker,
+        "language": segment.language,
+    }
+
+
+def _json_diarized_body(segments: list[Segment]) -> str:
+    return _to_json({"segments": [_diarized_segment(segment) for segment in segments]})
+
+
+_FLOAT_SEGMENT_FIELDS = frozenset({"start", "end", "temperature", "avg_logprob", "compression_ratio", "no_speech_prob"})
+
+
+def _word_dict(word: Word) -> dict[str, Any]:
+    return {
+        "start": float(word.start),
+        "end": float(word.end),
+        "word": word.word,
+        "probability": float(word.probability),
+        "speaker": word.speaker,
+    }
+
+
+def _projected_segments(segments: list[Segment], segment_fields: frozenset[str]) -> list[dict[str, Any]]:
+    # Only the selected fields are read; floats are converted as the response model would.
+    names = [field.value for field in SegmentField if field.value in segment_fields]
+    floats = [name for name in names if name in _FLOAT_SEGMENT_FIELDS]
+    with_words = SegmentField.WORDS.value in segment_fields
+    projected = []
+    for segment in segments:
+        item = {name: getattr(segment, name) for name in names}
+        for name in floats:
+            item[name] = float(item[name])
+        if with_words and segment.words is not None:
+            item["words"] = [_word_dict(word) for word in segment.words]
+        projected.append(item)
+    return projected
+
+
+def _verbose_json_body(
+    segments: list[Segment],
+    language: str,
+    duration: float,
+    text: str,
+    words: list[Word],
+    segment_fields: frozenset[str] | None = None,
+) -> str:
+    # The segments and words are already the dataclasses the model holds; skip re-checking them.
+    response = TranscriptionVerboseJsonResponse.model_construct(
+        language=language, duration=float(duration), text=text, words=words, segments=segments
+    )
+    if segment_fields is None:
+        return response.model_dump_json()
+    # ``segments`` is the model's last field: write the rest through the model and append
+    # the projected segments, so unrequested fields are never read or serialized.
+    head = response.model_dump_json(exclude={"segments"})
+    return f'{head[:-1]},"segments":{_to_json(_projected_segments(segments, segment_fields))}}}'
+
+
+def _text_pieces(segments: Iterable[Segment]) -> Iterator[str]:
+    """``segments_to_text(segments)`` in pieces, one per segment as it arrives.
+
+    Whitespace at the end of a piece is held back until text follows it, so the joined
+    pieces are stripped like the whole text.
+    """
+    pending = None
+    for segment in segments:
+        text = segment.text if pending is not None else segment.text.lstrip()
+        stripped = text.rstrip()
+        if not stripped:
+            if pending is not None:
+                pending += text
+            continue
+        yield stripped if pending is None else pending + stripped
+        pending = text[len(stripped) :]
+
+
+# Serialize like the fields of TranscriptionVerboseJsonResponse, one segment at a time.
+_SEGMENT_JSON = TypeAdapter(Segment)
+_WORDS_JSON = TypeAdapter(list[Word])
+# BentoML's error body for a 5xx status: the details are only logged.
+_UNEXPECTED_ERROR = "An unexpected error has occurred, please check the server log."
+
+
+def _error_body(error: Exception) -> dict[str, Any]:
+    """BentoML's error body for ``error``, with the status it would have been sent with."""
+    status = error.error_code.value if isinstance(error, BentoMLException) else 500
+    return {"error": str(error) if status < 500 else _UNEXPECTED_ERROR, "status": status}
+
+
+class _InBandErrors:
+    """A failure of ``segments`` after the status line was sent, written into the body.
+
+    ``segments()`` passes the segments on until one fails to arrive; ``closing()`` then
+    ends a JSON body with the members of ``_error_body``. When disabled, the failure is
+    raised as is.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.error: Exception | None = None
+
+    def segments(self, segments: Iterable[Segment]) -> Iterator[Segment]:
+        if not self.enabled:
+            yield from segments
+            return
+        try:
+            yield from segments
+        except Exception as e:
+            logger.exception("Transcription failed after the response started")
+            self.error = e
+
+    def closing(self) -> str:
+        if self.error is None:
+            return "}"
+        return "," + _to_json(_error_body(self.error))[1:]
+
+
+def _verbose_json_chunks(
+    segments: Iterable[Segment],
+    transcription_info: TranscriptionInfo,
+    segment_fields: frozenset[str] | None,
+) -> Iterator[str]:
+    # ``segments`` is written first, each segment as it arrives; the text and the words,
+    # which precede it in the schema, follow it, so only they are held until the end.
+    yield _to_json(
+        {"task": "transcribe", "language": transcription_info.language, "duration": float(transcription_info.duration)}
+    )[:-1]
+    yield ',"segments":['
+    separator = ""
+    texts: list[str] = []
+    words: list[str] = []
+    for segment in segments:
+        if segment_fields is None:
+            yield separator + _SEGMENT_JSON.dump_json(segment).decode()
+        else:
+            yield separator + _to_json(_projected_segments([segment], segment_fields))[1:-1]
+        separator = ","
+        texts.append(segment.text)
+        if segment.words:
+            words.append(_WORDS_JSON.dump_json(segment.words).decode()[1:-1])
+    yield f'],"text":{_to_json("".join(texts).strip())},"words":[{",".join(words)}]'
+
+
+def response_chunks(
     segments: Iterable[Segment],
     transcription_info: TranscriptionInfo,
     response_format: ResponseFormat,
-) -> "WhisperResponse":
-    segments = list(segments)
+    segment_fields: frozenset[str] | None = None,
+    in_band_errors: bool = False,
+) -> Iterator[str]:
+    """The body of ``segments_to_response`` written incrementally, as ``segments`` arrive.
+
+    The chunks join to exactly the same body; only one segment is held at a time. The
+    exception is ``verbose_json``: its ``segments`` are written before ``text`` and
+    ``words``, which are held until the last segment is in. Its segments hold only
+    ``segment_fields`` (``None``: all fields).
+
+    With ``in_band_errors``, the JSON formats end in ``"error"`` and ``"status"`` members
+    when ``segments`` fails, instead of raising: once the body is being sent, its status
+    can no longer change. The other formats have no place for an error and raise.
+    """
+    errors = _InBandErrors(in_band_errors)
     if response_format == ResponseFormat.TEXT:
-        return segments_to_text(segments)
+        yield from _text_pieces(segments)
     elif response_format == ResponseFormat.JSON:
-        return TranscriptionJsonResponse.from_segments(segments).model_dump_json()
+        yield '{"text":"'
+        for piece in _text_pieces(errors.segments(segments)):
+            # JSON string escaping is per character, so escaped pieces join to the escaped text.
+            yield _to_json(piece)[1:-1]
+        yield '"' + errors.closing()
     elif response_format == ResponseFormat.JSON_DIARIZED:
-        return TranscriptionJsonDiarizedResponse.from_segments(segments).model_dump_json()
+        yield '{"segments":['
+        separator = ""
+        for segment in errors.segments(segments):
+            yield separator + _to_json(_diarized_segment(segment))
+            separator = ","
+        yield "]" + errors.closing()
     elif response_format == ResponseFormat.VERBOSE_JSON:
-        return TranscriptionVerboseJsonResponse.from_segments(segments, transcription_info).model_dump_json()
+        yield from _verbose_json_chunks(errors.segments(segments), transcription_info, segment_fields)
+        yield errors.closing()
     elif response_format == ResponseFormat.VTT:
-        return "".join(segments_to_vtt(segment, i) for i, segment in enumerate(segments))
+        for i, segment in enumerate(segments):
+            yield segments_to_vtt(segment, i)
     elif response_format == ResponseFormat.SRT:
-        return "".join(segments_to_srt(segment, i) for i, segment in enumerate(segments))
+        for i, segment in enumerate(segments):
+            yield segments_to_srt(segment, i)
     else:
         raise ValueError(f"Unknown response format: {response_format}")
 
 
+def coalesce_chunks(chunks: Iterable[str], min_chars: int = 64 * 1024, max_wait_s: float = 1.0) -> Iterator[str]:
+    """Join small ``chunks`` into fewer, larger ones for sending.
+
+    A joined chunk is passed on once it holds ``min_chars`` characters, or once
+    ``max_wait_s`` passed since the last one went out and more text arrives, so a slow
+    decode still sends its segments as they come.
+    """
+    buffered: list[str] = []
+    size = 0
+    sent_at = time.monotonic()
+    for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+        if size >= min_chars or time.monotonic() - sent_at >= max_wait_s:
+            yield "".join(buffered)
+            buffered.clear()
+            size = 0
+            sent_at = time.monotonic()
+    if buffered:
+        yield "".join(buffered)
+
+
+def segments_to_response(
+    segments: Iterable[Segment],
+    transcription_info: TranscriptionInfo,
+    response_format: ResponseFormat,
+    segment_fields: frozenset[str] | None = None,
+) -> "WhisperResponse | bytes":
+    """The response body for ``response_format``: text, except for the binary ``arrow``."""
+    if response_format == ResponseFormat.ARROW:
+        return segments_to_arrow(segments, transcription_info)
+    if response_format == ResponseFormat.VERBOSE_JSON:
+        # Written whole, in the schema's field order.
+        segments = list(segments)
+        return _verbose_json_body(
+            segments,
+            transcription_info.language,
+            transcription_info.duration,
+            segments_to_text(segments),
+            Word.from_segments(segments),
+            segment_fields,
+        )
+    return "".join(response_chunks(segments, transcription_info, response_format, segment_fields))
+
+
+# An SSE comment line: clients ignore it, proxies see traffic on an otherwise idle stream.
+SSE_HEARTBEAT = ": keep-alive\n\n"
+
+
+def _sse_event(data: str, event: str | None = None) -> str:
+    # Each line of the payload gets its own ``data:`` field; clients join them with "\n".
+    fields = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return (fields if event is None else f"event: {event}\n{fields}") + "\n"
+
+
+def stream_content_type(stream_format: StreamFormat) -> str:
+    return "text/event-stream" if stream_format == StreamFormat.SSE else "application/x-ndjson"
+
+
 def segments_to_streaming_response(
     segments: Iterable[Segment],
     transcription_info: TranscriptionInfo,
     response_format: ResponseFormat,
+    stream_format: StreamFormat = StreamFormat.NDJSON,
+    segment_fields: frozenset[str] | None = None,
 ) -> Generator[str, None, None]:
-    """Stream one newline-delimited chunk per segment (NDJSON-style).
+    """Stream one chunk per segment.
+
+    With ``StreamFormat.NDJSON`` each chunk is the bare payload for the requested
+    format followed by a single ``\\n`` so consumers can split the stream on line
+    boundaries. With ``StreamFormat.SSE`` it is one Server-Sent Event whose data is
+    the payload. ``verbose_json`` segments hold only ``segment_fields`` (``None``: all).
 
-    Each chunk is the bare payload for the requested format followed by a
-    single ``\\n`` so consumers can split the stream on line boundaries. No
-    SSE (``data: ``) framing is applied; callers that need SSE must add it.
+    A failure while segments are coming in ends the stream with an ``error`` event (SSE)
+    or line (NDJSON) holding BentoML's error body and the status it would have had.
     """
+    errors = _InBandErrors(True)
 
     def segment_responses() -> Generator[str, None, None]:
-        for i, segment in enumerate(segments):
+        for i, segment in enumerate(errors.segments(segments)):
             if response_format == ResponseFormat.TEXT:
                 data = segment.text
             elif response_format == ResponseFormat.JSON:
-                data = TranscriptionJsonResponse.from_segments([segment]).model_dump_json()
+                data = _json_body([segment])
             elif response_format == ResponseFormat.JSON_DIARIZED:
-                data = TranscriptionJsonDiarizedResponse.from_segments([segment]).model_dump_json()
+                data = _json_diarized_body([segment])
             elif response_format == ResponseFormat.VERBOSE_JSON:
-                data = TranscriptionVerboseJsonResponse.from_segment(segment, transcription_info).model_dump_json()
+                data = _verbose_json_body(
+                    [segment],
+                    transcription_info.language,
+                    segment.end - segment.start,
+                    segment.text,
+                    segment.words if isinstance(segment.words, list) else [],
+                    segment_fields,
+                )
             elif response_format == ResponseFormat.VTT:
                 data = segments_to_vtt(segment, i)
             elif response_format == ResponseFormat.SRT:
                 data = segments_to_srt(segment, i)
             else:
                 raise ValueError(f"Unknown response format: {response_format}")
-            yield f"{data}\n"
+            yield _sse_event(data) if stream_format == StreamFormat.SSE else f"{data}\n"
+        if errors.error is not None:
+            data = _to_json(_error_body(errors.error))
+            yield _sse_event(data, "error") if stream_format == StreamFormat.SSE else f"{data}\n"
 
     return segment_responses()
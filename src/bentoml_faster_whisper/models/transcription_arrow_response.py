@@ -0,0 +1,107 @@
+"""The ``arrow`` response format: a transcript as one Arrow IPC stream.
+
+One row per segment. The word columns are lists, so in memory each is one flat array
+of every word in the transcript plus the segment offsets into it; a consumer reads
+``table["word_start"].combine_chunks().values`` (and ``.offsets``) without creating a
+per-word object. Speakers and languages are dictionary-encoded: their indices are
+the speaker codes, their dictionaries the labels.
+
+The schema metadata holds the transcript's ``language`` and ``duration``.
+"""
+
+from typing import Iterable
+
+import pyarrow as pa
+from faster_whisper.transcribe import TranscriptionInfo
+
+from bentoml_faster_whisper.utils.core import Segment
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+_LABEL = pa.dictionary(pa.int16(), pa.string())
+
+ARROW_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.int32()),
+        pa.field("start", pa.float64()),
+        pa.field("end", pa.float64()),
+        pa.field("text", pa.string()),
+        pa.field("speaker", _LABEL),
+        pa.field("language", _LABEL),
+        pa.field("word", pa.list_(pa.string())),
+        pa.field("word_start", pa.list_(pa.float64())),
+        pa.field("word_end", pa.list_(pa.float64())),
+        pa.field("word_probability", pa.list_(pa.float32())),
+        pa.field("word_speaker", pa.list_(_LABEL)),
+    ]
+)
+
+
+class _Labels:
+    """Dictionary encoding of a string column built as segments go by."""
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self.indices: list[int | None] = []
+
+    def append(self, label: str | None) -> None:
+        self.indices.append(None if label is None else self._codes.setdefault(label, len(self._codes)))
+
+    def array(self) -> pa.DictionaryArray:
+        return pa.DictionaryArray.from_arrays(
+            pa.array(self.indices, pa.int16()), pa.array(list(self._codes), pa.string())
+        )
+
+
+def segments_to_arrow(segments: Iterable[Segment], transcription_info: TranscriptionInfo) -> bytes:
+    """The Arrow IPC stream of ``segments``; see the module docstring for the layout."""
+    ids: list[int] = []
+    starts: list[float] = []
+    ends: list[float] = []
+    texts: list[str] = []
+    speakers = _Labels()
+    languages = _Labels()
+    offsets = [0]
+    word_texts: list[str] = []
+    word_starts: list[float] = []
+    word_ends: list[float] = []
+    word_probabilities: list[float] = []
+    word_speakers = _Labels()
+
+    for segment in segments:
+        ids.append(segment.id)
+        starts.append(segment.start)
+        ends.append(segment.end)
+        texts.append(segment.text)
+        speakers.append(segment.speaker)
+        languages.append(segment.language)
+        for word in segment.words or ():
+            word_texts.append(word.word)
+            word_starts.append(word.start)
+            word_ends.append(word.end)
+            word_probabilities.append(word.probability)
+            word_speakers.append(word.speaker)
+        offsets.append(len(word_texts))
+
+    offsets_array = pa.array(offsets, pa.int32())
+    columns = [
+        pa.array(ids, pa.int32()),
+        pa.array(starts, pa.float64()),
+        pa.array(ends, pa.float64()),
+        pa.array(texts, pa.string()),
+        speakers.array(),
+        languages.array(),
+        pa.ListArray.from_arrays(offsets_array, pa.array(word_texts, pa.string())),
+        pa.ListArray.from_arrays(offsets_array, pa.array(word_starts, pa.float64())),
+        pa.ListArray.from_arrays(offsets_array, pa.array(word_ends, pa.float64())),
+        pa.ListArray.from_arrays(offsets_array, pa.array(word_probabilities, pa.float32())),
+        pa.ListArray.from_arrays(offsets_array, word_speakers.array()),
+    ]
+    schema = ARROW_SCHEMA.with_metadata(
+        {"language": transcription_info.language or "", "duration": repr(float(transcription_info.duration))}
+    )
+    batch = pa.RecordBatch.from_arrays(columns, schema=schema)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
@@ -7,7 +7,7 @@ from pydantic import AliasChoices, BeforeValidator, ConfigDict, Field
 
 from bentoml_faster_whisper.config import faster_whisper_config
 from bentoml_faster_whisper.models.decode_params import DecodeParams
-from bentoml_faster_whisper.models.enums import Language
+from bentoml_faster_whisper.models.enums import Language, StreamFormat
 from bentoml_faster_whisper.models.input_models import TimestampGranularities
 from bentoml_faster_whisper.utils.logger import get_logger
 
@@ -96,7 +96,7 @@ class TranscriptionRequest(DecodeParams):
         default=faster_whisper_config.default_timestamp_granularities,
         validation_alias=AliasChoices("timestamp_granularities", "timestamp_granularities[]"),
         description="The timestamp granularities to populate for this transcription. response_format must be "
-        "set verbose_json to use timestamp granularities.",
+        "set to verbose_json or arrow to use timestamp granularities.",
     )
     diarization: bool = Field(
         default=faster_whisper_config.diarization,
@@ -111,3 +111,19 @@ class TranscriptionRequest(DecodeParams):
         default=None,
         description="A unique identifier for reporting the progress of a task.",
     )
+    partial_on_timeout: bool = Field(
+        default=False,
+        description="If True, a request that reaches the service timeout returns the segments decoded so far "
+        "(with the `x-partial-result: deadline` header) instead of failing with 504. Diarization and language "
+        "detection cannot return partial results and still fail.",
+    )
+    stream_format: StreamFormat = Field(
+        default=StreamFormat.NDJSON,
+        description="Framing of the streaming endpoint's chunks: `ndjson` (one payload per line) or `sse` "
+        "(Server-Sent Events, with keep-alive comments while nothing else is sent). Ignored by the other endpoints.",
+    )
+    stream_flush_s: Annotated[float, Ge(0), Le(30)] = Field(
+        default=0.0,
+        description="Streaming only: send the segments decoded within this many seconds after the first "
+        "unsent one together, in one write. 0 sends every segment at once.",
+    )
@@ -1,29 +1,43 @@
+import asyncio
 import os
-from collections.abc import Generator
+import secrets
+import time
+from collections.abc import Generator, Iterator
 from typing import Annotated, Any
 
+import anyio.from_thread
 import bentoml
-from fastapi import FastAPI, HTTPException
+from bentoml.exceptions import InvalidArgument
+from fastapi import FastAPI, Header, HTTPException
 from fastapi import Path as FastAPIPath
+from fastapi.responses import Response, StreamingResponse
 
 from bentoml_faster_whisper.config import faster_whisper_config
+from bentoml_faster_whisper.models.enums import ResponseFormat, StreamFormat
 from bentoml_faster_whisper.models.input_models import (
     validate_timestamp_granularities,
 )
+from bentoml_faster_whisper.models.model_swap import ModelSwapRequest, ModelSwapStatus
 from bentoml_faster_whisper.models.output_models import (
+    SSE_HEARTBEAT,
     ModelListResponse,
     ModelObject,
     WhisperResponse,
+    coalesce_chunks,
     content_type_for_format,
     segments_to_response,
     segments_to_streaming_response,
+    stream_content_type,
 )
 from bentoml_faster_whisper.models.progress_response import ProgressResponse
 from bentoml_faster_whisper.models.transcription_request import TranscriptionRequest
 from bentoml_faster_whisper.models.translation_request import TranslationRequest
 from bentoml_faster_whisper.container import Container
+from bentoml_faster_whisper.utils.cancellation import CancellationToken
 from bentoml_faster_whisper.utils.core import Segment
 from bentoml_faster_whisper.utils.logger import configure_logging, get_logger
+from bentoml_faster_whisper.utils.response_compression import CompressionMiddleware
+from bentoml_faster_whisper.utils.stream_pacing import paced_chunks
 from bentoml_faster_whisper.utils.transcription_cleaner import clean_transcription_segments
 
 logger = get_logger(__name__)
@@ -36,6 +50,8 @@ configure_logging()
 
 _HIDDEN_TASK_ROUTE_SUFFIXES = ("/task/cancel", "/task/retry")
 _DIARIZATION_PROGRESS_SHARE = 0.3
+# Bodies that are not text: served as they are over HTTP, not by streaming or task requests.
+_BINARY_FORMATS = frozenset({ResponseFormat.ARROW})
 
 
 def _hide_task_routes_from_openapi() -> None:
@@ -63,6 +79,10 @@ _hide_task_routes_from_openapi()
 TIMEOUT = int(os.getenv("TIMEOUT", 3000))
 MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", 4))
 WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() not in ("false", "0", "no")
+# Admin routes (model hot-swap) answer 404 unless a bearer token is configured.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+# Internal deadlines end this much before TIMEOUT, leaving time to send the (partial) response.
+_DEADLINE_MARGIN_S = 2.0
 DURATION_BUCKETS_S = [
     1.0,
     5.0,
@@ -80,6 +100,56 @@ DURATION_BUCKETS_S = [
 ]
 
 
+def _require_admin(authorization: str | None) -> None:
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(authorization or "", f"Bearer {ADMIN_API_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def _request_cancellation(
+    ctx: "bentoml.Context | None" = None,
+    deadline_s: float | None = None,
+    partial_on_deadline: bool = False,
+) -> CancellationToken:
+    """Token cancelled once the request is gone: client disconnected, or task cancelled / timed out.
+
+    The probe asks the event loop from BentoML's worker thread running the API; from any
+    other thread (the decode pool, direct calls in tests) it cannot tell. ``deadline_s``
+    counts from now, so build the token at request entry.
+    """
+    request = ctx.request if ctx is not None else None
+
+    def request_gone() -> bool | None:
+        try:
+            anyio.from_thread.check_cancelled()
+            return request is not None and anyio.from_thread.run(request.is_disconnected)
+        except RuntimeError:
+            return None
+        except asyncio.CancelledError:
+            return True
+
+    return CancellationToken(probe=request_gone, deadline_s=deadline_s, partial_on_deadline=partial_on_deadline)
+
+
+def _request_deadline_s() -> float:
+    return max(TIMEOUT - _DEADLINE_MARGIN_S, 0.0)
+
+
+def _require_text_format(response_format: ResponseFormat, endpoint: str) -> None:
+    if response_format in _BINARY_FORMATS:
+        raise InvalidArgument(f"response_format {response_format} is not available for {endpoint} requests")
+
+
+def _http_body(
+    ctx: "bentoml.Context | None", body: WhisperResponse | bytes, response_format: ResponseFormat
+) -> WhisperResponse | bytes | Response:
+    """``body``, sent as is over HTTP when it is binary rather than encoded as the declared JSON."""
+    if ctx is None or not isinstance(body, bytes):
+        return body
+    return Response(body, media_type=content_type_for_format(response_format))
+
+
 @bentoml.service(
     title="Faster Whisper API",
     description="This is a custom Faster Whisper API that is fully compatible with the OpenAI SDK and offers additional options.",
@@ -115,10 +185,11 @@ class FasterWhisper:
         ctx: bentoml.Context = None,  # ty: ignore[invalid-parameter-default]
         **params: Any,
     ) -> WhisperResponse:
+        deadline_s = _request_deadline_s()
         request = TranscriptionRequest.from_dict(params)
         self._prepare_transcribe(request)
         self._set_response_content_type(ctx, request.response_format)
-        return self.handler.transcribe_audio(request)
+        return self._transcribe_within_deadline(ctx, request, deadline_s)
 
     @bentoml.api(route="/v1/audio/transcriptions/batch", input_spec=TranscriptionRequest)  # type: ignore
     def batch_transcribe(
@@ -127,10 +198,11 @@ class FasterWhisper:
         **params: Any,
     ) -> WhisperResponse:
         """Transcribe audio (kept for OpenAI API backward compatibility)."""
+        deadline_s = _request_deadline_s()
         request = TranscriptionRequest.from_dict(params)
         self._prepare_transcribe(request)
         self._set_response_content_type(ctx, request.response_format)
-        return self.handler.transcribe_audio(request)
+        return self._transcribe_within_deadline(ctx, request, deadline_s)
 
     @bentoml.task(
         route="/v1/audio/transcriptions/task",
@@ -139,6 +211,7 @@ class FasterWhisper:
     def task_transcribe(self, **params: Any) -> WhisperResponse:
         request = TranscriptionRequest.from_dict(params)
         self._prepare_transcribe(request)
+        _require_text_format(request.response_format, "task")
 
         result: list[Segment] = []
 
@@ -170,9 +243,10 @@ class FasterWhisper:
                 request,
                 diarization_progress_callback=diarization_progress_callback,
                 decode_progress_callback=decode_progress_callback,
+                cancel=_request_cancellation(),
             )
 
-            for segment in segments:
+            for segment in clean_transcription_segments(segments, transcription_info):
                 if report_progress is not None:
                     fraction = segment.end / transcription_info.duration if transcription_info.duration else 0.0
                     report_progress(
@@ -183,8 +257,9 @@ class FasterWhisper:
 
                 result.append(segment)
 
-            result = list(clean_transcription_segments(result, transcription_info))
-            return segments_to_response(result, transcription_info, request.response_format)
+            return segments_to_response(
+                result, transcription_info, request.response_format, request.verbose_segment_fields
+            )
         finally:
             if segments is not None:
                 segments.close()
@@ -192,20 +267,47 @@ class FasterWhisper:
                 self.progress_handler.remove_progress(request.progress_id)
 
     @bentoml.api(route="/v1/audio/transcriptions/stream", input_spec=TranscriptionRequest)  # type: ignore
-    def streaming_transcribe(self, **params: Any) -> Generator[str, None, None]:
+    def streaming_transcribe(
+        self,
+        ctx: bentoml.Context = None,  # ty: ignore[invalid-parameter-default]
+        **params: Any,
+    ) -> Generator[str, None, None]:
+        started_at = time.monotonic()
+        deadline_s = _request_deadline_s()
         request = TranscriptionRequest.from_dict(params)
 
         self._prepare_transcribe(request)
+        _require_text_format(request.response_format, "streaming")
+        if ctx is not None:
+            ctx.response.headers["content-type"] = stream_content_type(request.stream_format)
+
+        cancel = _request_cancellation(ctx, deadline_s, request.partial_on_timeout)
+
+        def produce() -> Iterator[str]:
+            # Runs on the pacing thread: the request probe cannot tell from there, so
+            # a client that goes away is reported through ``on_close`` instead.
+            segments, transcription_info = self.handler.prepare_audio_segments(request, cancel=cancel)
+            try:
+                cleaned = clean_transcription_segments(segments, transcription_info)
+                yield from segments_to_streaming_response(
+                    cleaned,
+                    transcription_info,
+                    request.response_format,
+                    request.stream_format,
+                    request.verbose_segment_fields,
+                )
+            finally:
+                segments.close()
 
-        segments, transcription_info = self.handler.prepare_audio_segments(request)
-        cleaned = clean_transcription_segments(segments, transcription_info)
-        generator = segments_to_streaming_response(cleaned, transcription_info, request.response_format)
-
-        try:
-            for chunk in generator:
-                yield chunk
-        finally:
-            segments.close()
+        yield from paced_chunks(
+            produce,
+            started_at,
+            request.stream_format,
+            heartbeat=SSE_HEARTBEAT if request.stream_format == StreamFormat.SSE else None,
+            heartbeat_s=self.config.faster_whisper.stream_heartbeat_s,
+            flush_s=request.stream_flush_s,
+            on_close=lambda: cancel.cancel("request gone"),
+        )
 
     @bentoml.api(route="/v1/audio/translations", input_spec=TranslationRequest)  # type: ignore
     def translate(
@@ -216,17 +318,17 @@ class FasterWhisper:
         request = TranslationRequest.from_dict(params)
         self._configure_vad_options(request)
         self._set_response_content_type(ctx, request.response_format)
-        return self.handler.translate_audio(request)
+        return _http_body(ctx, self.handler.translate_audio(request), request.response_format)
 
     @fastapi.get("/progress/{progress_id}")
     async def get_progress(self, progress_id: str) -> ProgressResponse:
         """Retrieve progress for a running transcription task."""
         return self.progress_handler.get_progress(progress_id)
 
-    def _served_model_object(self) -> ModelObject:
-        """The single model this API serves, as a static OpenAI-style ModelObject."""
+    def _served_model_object(self, model_name: str) -> ModelObject:
+        """A served model as a static OpenAI-style ModelObject."""
         return ModelObject(
-            id=self.config.faster_whisper.default_model_name,
+            id=model_name,
             created=1668556800,
             object_="model",
             owned_by="Systran",
@@ -236,7 +338,9 @@ class FasterWhisper:
     @fastapi.get("/models")
     async def get_models(self) -> ModelListResponse:
         """List models served by this endpoint."""
-        return ModelListResponse(data=[self._served_model_object()])
+        return ModelListResponse(
+            data=[self._served_model_object(name) for name in self.config.faster_whisper.served_model_names]
+        )
 
     @fastapi.get("/models/{model_name:path}")
     async def get_model(
@@ -244,13 +348,65 @@ class FasterWhisper:
         model_name: Annotated[str, FastAPIPath(examples=[faster_whisper_config.default_model_name])],
     ) -> ModelObject:
         """Retrieve details of a specific served model."""
-        served = self.config.faster_whisper.default_model_name
-        if model_name != served:
+        served = self.config.faster_whisper.served_model_names
+        if model_name not in served:
             raise HTTPException(
                 status_code=404,
-                detail=f"Model '{model_name}' not found. Only '{served}' is served.",
+                detail=f"Model '{model_name}' not found. Served: {', '.join(map(repr, served))}.",
             )
-        return self._served_model_object()
+        return self._served_model_object(model_name)
+
+    def _model_swap_status(self) -> ModelSwapStatus:
+        model_manager = self.handler.model_manager
+        return ModelSwapStatus(
+            model_name=model_manager.default_model_name,
+            model_id=model_manager.model_id,
+            compute_type=model_manager.whisper_config.compute_type,
+            swapping=model_manager.swapping,
+            last_error=model_manager.last_swap_error,
+        )
+
+    @fastapi.get("/admin/model", include_in_schema=False)
+    async def get_model_swap_status(self, authorization: Annotated[str | None, Header()] = None) -> ModelSwapStatus:
+        """Model currently served under the default name, and the state of any hot-swap."""
+        _require_admin(authorization)
+        return self._model_swap_status()
+
+    @fastapi.post("/admin/model", status_code=202, include_in_schema=False)
+    async def swap_model(
+        self,
+        body: ModelSwapRequest,
+        authorization: Annotated[str | None, Header()] = None,
+    ) -> ModelSwapStatus:
+        """Hot-swap the default model: load and warm the replacement in the background, then switch.
+
+        Applies to the worker process that receives the call.
+        """
+        _require_admin(authorization)
+        try:
+            self.handler.swap_model(body.model, body.compute_type)
+        except RuntimeError as e:
+            raise HTTPException(status_code=409, detail=str(e)) from e
+        return self._model_swap_status()
+
+    def _transcribe_within_deadline(
+        self, ctx: "bentoml.Context | None", request: TranscriptionRequest, deadline_s: float
+    ) -> WhisperResponse | bytes | Response:
+        """Transcribe ``request``; over HTTP, a text body is sent while segments are decoded.
+
+        Partial results are only known to be partial at the end, when the header marking
+        them can no longer be sent, so those requests get the whole body at once.
+        """
+        cancel = _request_cancellation(ctx, deadline_s, request.partial_on_timeout)
+        if ctx is not None and request.response_format not in _BINARY_FORMATS and not request.partial_on_timeout:
+            chunks = self.handler.transcribe_audio_chunks(request, cancel=cancel)
+            return StreamingResponse(
+                coalesce_chunks(chunks), media_type=content_type_for_format(request.response_format)
+            )
+        response = self.handler.transcribe_audio(request, cancel=cancel)
+        if cancel.truncated and ctx is not None:
+            ctx.response.headers["x-partial-result"] = "deadline"
+        return _http_body(ctx, response, request.response_format)
 
     def _set_response_content_type(self, ctx: "bentoml.Context | None", response_format) -> None:
         """Set HTTP Content-Type header on BentoML context based on target response format."""
@@ -269,3 +425,6 @@ class FasterWhisper:
     def _configure_vad_options(self, request: TranscriptionRequest | TranslationRequest):
         if request.vad_parameters.max_speech_duration_s == 999_999:
             request.vad_parameters.max_speech_duration_s = float("inf")
+
+
+FasterWhisper.add_asgi_middleware(CompressionMiddleware)
@@ -13,6 +13,7 @@ from bentoml.exceptions import InvalidArgument
 from pyannote.audio import Pipeline
 from pyannote.core import Segment
 
+from bentoml_faster_whisper.utils.cancellation import CancellationToken
 from bentoml_faster_whisper.utils.core import clamp, positive_env
 from bentoml_faster_whisper.utils.logger import get_logger, log_exceptions
 
@@ -27,10 +28,19 @@ _DIARIZATION_STEP_WEIGHTS: dict[str, float] = {
 
 
 class _DiarizationProgressHook:
-    """pyannote-compatible hook mapping internal diarization steps to a monotonic 0..1 fraction."""
+    """pyannote-compatible hook mapping internal diarization steps to a monotonic 0..1 fraction.
 
-    def __init__(self, on_progress: Callable[[float], None]) -> None:
+    pyannote calls it after every step and batch, so it is also where a cancelled
+    request stops the pipeline: ``cancel.check()`` raises out of it.
+    """
+
+    def __init__(
+        self,
+        on_progress: Callable[[float], None] | None,
+        cancel: CancellationToken | None = None,
+    ) -> None:
         self._on_progress = on_progress
+        self._cancel = cancel
         self._last = 0.0
         self._base: dict[str, float] = {}
         offset = 0.0
@@ -52,8 +62,10 @@ class _DiarizationProgressHook:
         total: int | None = None,
         completed: int | None = None,
     ) -> None:
+        if self._cancel is not None:
+            self._cancel.check()
         weight = _DIARIZATION_STEP_WEIGHTS.get(step_name)
-        if weight is None:
+        if weight is None or self._on_progress is None:
             return
         within = (completed / total) if (total and completed is not None) else 1.0
         within = clamp(within, 0.0, 1.0)
@@ -159,8 +171,12 @@ class DiarizationService:
         audio_path: str,
         num_speaker: int | None = None,
         progress_callback: Callable[[float], None] | None = None,
+        cancel: CancellationToken | None = None,
     ) -> Iterable[DiarizationSegment]:
-        """Perform speaker diarization on the given audio file."""
+        """Perform speaker diarization on the given audio file.
+
+        With ``cancel``, the pipeline stops at its next step or batch once the token is cancelled.
+        """
         if not os.path.isfile(audio_path):
             raise FileNotFoundError(f"File not found: {audio_path}")
 
@@ -172,9 +188,11 @@ class DiarizationService:
 
         with _as_wav(audio_path) as wav_path:
             with self._lock:
+                if cancel is not None:
+                    cancel.check()  # may have waited on the lock behind another request
                 try:
-                    if progress_callback is not None:
-                        with _DiarizationProgressHook(progress_callback) as hook:
+                    if progress_callback is not None or cancel is not None:
+                        with _DiarizationProgressHook(progress_callback, cancel) as hook:
                             output = self.pipeline(wav_path, num_speakers=num_speaker, hook=hook)
                     else:
                         output = self.pipeline(wav_path, num_speakers=num_speaker)
@@ -1,7 +1,10 @@
 import contextlib
 import dataclasses
+import itertools
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Callable, Iterable, Iterator
 
 import av
@@ -9,27 +12,43 @@ import numpy as np
 from bentoml.exceptions import InvalidArgument
 from faster_whisper import WhisperModel
 from faster_whisper.audio import decode_audio
+from faster_whisper.transcribe import TranscriptionInfo
 from faster_whisper.vad import VadOptions
 
+from bentoml_faster_whisper.config import Quantization, language_id_config
 from bentoml_faster_whisper.models.decode_params import DecodeParams
 from bentoml_faster_whisper.models.enums import ResponseFormat, Task
 from bentoml_faster_whisper.models.output_models import (
     WhisperResponse,
+    response_chunks,
     segments_to_response,
 )
 from bentoml_faster_whisper.models.transcription_request import TranscriptionRequest
 from bentoml_faster_whisper.models.translation_request import TranslationRequest
 from bentoml_faster_whisper.services.diarization_service import DiarizationSegment, DiarizationService
 from bentoml_faster_whisper.services.model_manager import WhisperModelProvider
+from bentoml_faster_whisper.services.replica_pool import model_instances
 from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.cancellation import (
+    PROBE_INTERVAL_S,
+    CancellationToken,
+    DeadlineExceeded,
+    RequestCancelled,
+)
 from bentoml_faster_whisper.utils.core import Segment
+from bentoml_faster_whisper.utils.decode_budget import DecodeBudget, transcribe_budgeted
+from bentoml_faster_whisper.utils.encoder_cache import EncoderCache
+from bentoml_faster_whisper.utils.feature_store import FeatureStore
 from bentoml_faster_whisper.utils.language_id import (
+    detect_dominant_language,
     detect_turn_language_probs,
     fill_missing_rows_from_intervals,
     resolve_language_inventory,
+    sample_turn_language_probs,
     viterbi_smooth_languages,
 )
 from bentoml_faster_whisper.utils.speech_regions import (
+    SPEECH_PAD_S,
     WHISPER_SAMPLE_RATE,
     collapse_decoded_to_speech,
     diarization_to_speech_intervals,
@@ -38,8 +57,12 @@ from bentoml_faster_whisper.utils.speech_regions import (
     turns_to_language_runs,
 )
 from bentoml_faster_whisper.utils.logger import get_logger
+from bentoml_faster_whisper.utils.model_cascade import CascadeWhisper
+from bentoml_faster_whisper.utils.repetition_guard import transcribe_guarded
+from bentoml_faster_whisper.utils.segment_pipeline import SegmentPipeline, SegmentStream
 from bentoml_faster_whisper.utils.transcription_cleaner import clean_transcription_segments
-from bentoml_faster_whisper.utils.whisper_diarization_merger import merge_whisper_diarization
+from bentoml_faster_whisper.utils.whisper_diarization_merger import SpeakerMerger
+from bentoml_faster_whisper.utils.word_alignment import SpeakerTurnIndex, add_words_where_speakers_change
 
 logger = get_logger(__name__)
 
@@ -55,11 +78,25 @@ def _audio_decode_errors_as_invalid() -> Iterator[None]:
         raise InvalidArgument("Failed to decode audio file") from e
 
 
-def _strip_words(segments: Iterable[Segment]) -> Iterable[Segment]:
-    """Drop per-word timestamps lazily after speaker merging is complete."""
-    for seg in segments:
-        seg.words = None
-        yield seg
+def _strip_words(segment: Segment) -> None:
+    """Drop per-word timestamps once speaker merging no longer needs them."""
+    segment.words = None
+
+
+def _raise_run_failure(futures: Iterable[Future]) -> None:
+    """Re-raise the error of the decode run that failed, rather than the cancellations it caused."""
+    for future in futures:
+        if future.cancelled():
+            continue
+        error = future.exception()
+        if error is not None and not isinstance(error, RequestCancelled):
+            raise error
+
+
+def _record_cancelled(stage: str, exc: BaseException, t0: float) -> None:
+    metrics.cancelled_work_seconds().labels(stage).inc(time.perf_counter() - t0)
+    if isinstance(exc, DeadlineExceeded):
+        metrics.deadline_exceeded().labels("failed").inc()
 
 
 def _language_mass(runs: list[tuple[str, list[tuple[float, float]]]]) -> dict[str, float]:
@@ -113,8 +150,7 @@ class FasterWhisperHandler:
     def warmup(self, warm_diarization: bool = True) -> None:
         """Load models into VRAM at worker startup so the first request is fast."""
         try:
-            whisper = self.model_manager.get()
-            self._warm_decode(whisper)
+            self._warm(self.model_manager.get())
             logger.info("Warmed Whisper model", model_id=self.model_manager.model_id)
         except Exception:
             logger.exception("Whisper warmup failed", model_id=self.model_manager.model_id)
@@ -126,6 +162,22 @@ class FasterWhisperHandler:
             except Exception:
                 logger.warning("Diarization warmup failed; continuing without pre-loaded pipeline", exc_info=True)
 
+    def swap_model(self, model_id: str, compute_type: Quantization | None = None) -> threading.Thread:
+        """Hot-swap the default model in the background: load and warm ``model_id``, then switch to it.
+
+        Raises ``RuntimeError`` if a swap is already running.
+        """
+        return self.model_manager.start_swap(model_id, compute_type, warm=self._warm)
+
+    @classmethod
+    def _warm(cls, whisper: WhisperModel) -> None:
+        """Warm every instance a request may be dispatched to: each replica of each cascade tier."""
+        # Silence never reaches a cascade's re-decode tier, so each tier is warmed directly.
+        tiers = [whisper.draft, whisper.large] if isinstance(whisper, CascadeWhisper) else [whisper]
+        for tier in tiers:
+            for instance in model_instances(tier):
+                cls._warm_decode(instance)
+
     @staticmethod
     def _warm_decode(whisper: WhisperModel) -> None:
         """Run throwaway decode on silence to trigger CUDA kernel compilation."""
@@ -137,40 +189,83 @@ class FasterWhisperHandler:
     def transcribe_audio(
         self,
         request: TranscriptionRequest,
-    ) -> WhisperResponse:
+        cancel: CancellationToken | None = None,
+    ) -> WhisperResponse | bytes:
         """Transcribe audio request and format response."""
-        segments, transcription_info = self.prepare_audio_segments(request)
+        segments, transcription_info = self.prepare_audio_segments(request, cancel=cancel)
         try:
             cleaned = clean_transcription_segments(segments, transcription_info)
-            return segments_to_response(cleaned, transcription_info, request.response_format)
+            return segments_to_response(
+                cleaned, transcription_info, request.response_format, request.verbose_segment_fields
+            )
         finally:
             segments.close()
 
-    def translate_audio(self, request: TranslationRequest) -> WhisperResponse:
+    def transcribe_audio_chunks(
+        self,
+        request: TranscriptionRequest,
+        cancel: CancellationToken | None = None,
+    ) -> Iterator[str]:
+        """Like ``transcribe_audio``, but the response body is written while segments are decoded.
+
+        Returns once the first cleaned segment is in, so failures before it (audio decoding,
+        diarization, language detection, the first decode window) are raised from here and
+        can still become an error response. A later failure is reported in the body: see
+        ``response_chunks``.
+        """
+        segments, transcription_info = self.prepare_audio_segments(request, cancel=cancel)
+        try:
+            cleaned = iter(clean_transcription_segments(segments, transcription_info))
+            first = next(cleaned, None)
+        except BaseException:
+            segments.close()
+            raise
+
+        def body() -> Iterator[str]:
+            try:
+                arrived = cleaned if first is None else itertools.chain((first,), cleaned)
+                yield from response_chunks(
+                    arrived,
+                    transcription_info,
+                    request.response_format,
+                    request.verbose_segment_fields,
+                    in_band_errors=True,
+                )
+            finally:
+                segments.close()
+
+        return body()
+
+    def translate_audio(self, request: TranslationRequest) -> WhisperResponse | bytes:
         """Translate audio file to English and format response."""
         t0 = time.perf_counter()
-        whisper = self.model_manager.get()
-        word_timestamps = request.response_format == ResponseFormat.VERBOSE_JSON
+        word_timestamps = request.response_format in (ResponseFormat.VERBOSE_JSON, ResponseFormat.ARROW)
         decode_options = self._decode_options(request, word_timestamps)
-        with _audio_decode_errors_as_invalid():
-            decoded = decode_audio(str(request.file), sampling_rate=WHISPER_SAMPLE_RATE)
-        try:
-            segments, transcription_info = whisper.transcribe(
-                decoded,
-                task=Task.TRANSLATE,
-                vad_filter=request.vad_filter,
-                vad_parameters=VadOptions(**request.vad_parameters.model_dump()),
-                **decode_options,
-            )
-            segments = Segment.from_faster_whisper_segments(segments)
-            cleaned = clean_transcription_segments(segments, transcription_info, text_language="en")
-            response = segments_to_response(cleaned, transcription_info, request.response_format)
-        except Exception as e:
-            metrics.record_failure("decode", e)
-            raise
+        budget = DecodeBudget(request.decode_budget_s, request.temperature, t0)
+        with self.model_manager.lease(request.model) as whisper:
+            with _audio_decode_errors_as_invalid():
+                decoded = decode_audio(str(request.file), sampling_rate=WHISPER_SAMPLE_RATE)
+            try:
+                segments, transcription_info = self._transcribe_budgeted(
+                    whisper,
+                    decoded,
+                    budget,
+                    decode_options,
+                    task=Task.TRANSLATE,
+                    vad_filter=request.vad_filter,
+                    vad_parameters=VadOptions(**request.vad_parameters.model_dump()),
+                )
+                cleaned = clean_transcription_segments(segments, transcription_info, text_language="en")
+                response = segments_to_response(
+                    cleaned, transcription_info, request.response_format, request.verbose_segment_fields
+                )
+            except Exception as e:
+                metrics.record_failure("decode", e)
+                raise
 
         metrics.observe_decode(transcription_info.duration, transcription_info.language)
         metrics.observe_realtime_factor(t0, transcription_info.duration)
+        metrics.decode_fallbacks().observe(budget.fallbacks)
         return response
 
     def prepare_audio_segments(
@@ -178,9 +273,22 @@ class FasterWhisperHandler:
         request: TranscriptionRequest,
         diarization_progress_callback: Callable[[float], None] | None = None,
         decode_progress_callback: Callable[[float], None] | None = None,
+        cancel: CancellationToken | None = None,
     ):
-        """Prepare audio segments, applying optional speaker diarization and language run splitting."""
+        """Prepare audio segments, applying optional speaker diarization and language run splitting.
+
+        ``cancel`` stops diarization, queued and running decode runs, and the lazy segment
+        stream within one step / window once cancelled; closing the returned stream
+        early cancels it too. Past its deadline the same checks raise ``DeadlineExceeded``,
+        or, with ``partial_on_deadline``, end the decode with the segments it has.
+
+        Speaker merging and word stripping run in the returned stream's ``SegmentPipeline``;
+        cleaning it before the first segment is pulled adds to the same single pass.
+        """
         t0 = time.perf_counter()
+        budget = DecodeBudget(request.decode_budget_s, request.temperature, t0)
+        if cancel is None:
+            cancel = CancellationToken()
 
         dia_segments: list[DiarizationSegment] = []
         if request.diarization:
@@ -191,8 +299,12 @@ class FasterWhisperHandler:
                         str(request.file),
                         request.diarization_speaker_count,
                         progress_callback=diarization_progress_callback,
+                        cancel=cancel,
                     )
                 )
+            except RequestCancelled as e:
+                _record_cancelled("diarization", e, t0)
+                raise
             except Exception as e:
                 metrics.record_failure("diarization", e)
                 raise
@@ -200,7 +312,7 @@ class FasterWhisperHandler:
             metrics.speaker_count().observe(len({seg.speaker for seg in dia_segments}))
 
         intervals = diarization_to_speech_intervals(dia_segments) if dia_segments else []
-        word_timestamps = ("word" in request.timestamp_granularities) or bool(dia_segments)
+        words_requested = "word" in request.timestamp_granularities
 
         decoded: np.ndarray | None = None
         has_speech = False
@@ -211,8 +323,16 @@ class FasterWhisperHandler:
             original_duration_s = decoded.shape[0] / WHISPER_SAMPLE_RATE
             has_speech = bool(speech_intervals_to_chunks(intervals, decoded.shape[0], WHISPER_SAMPLE_RATE))
 
-        whisper = self.model_manager.get()
+        # Speaker attribution needs word timings only for segments spanning a speaker change, so
+        # diarized runs decode without them and align just those segments afterwards.
+        turn_index = SpeakerTurnIndex(dia_segments) if has_speech and not words_requested else None
+        word_timestamps = words_requested or (bool(dia_segments) and not has_speech)
+
+        # Held until the returned generator is closed or collected: its segments are decoded lazily.
+        lease = self.model_manager.lease(request.model)
+        whisper = lease.model
         try:
+            cancel.check()
             decode_options = self._decode_options(request, word_timestamps)
             if has_speech:
                 assert decoded is not None
@@ -228,6 +348,10 @@ class FasterWhisperHandler:
                         decode_options,
                         language_candidates=candidates,
                         progress_callback=decode_progress_callback,
+                        budget=budget,
+                        turn_index=turn_index,
+                        cancel=cancel,
+                        feature_store=FeatureStore(decoded),
                     )
                 else:
                     resolved = [str(request.language)] * len(turns)
@@ -240,41 +364,102 @@ class FasterWhisperHandler:
                         decode_options,
                         tag_language=False,
                         progress_callback=decode_progress_callback,
+                        budget=budget,
+                        turn_index=turn_index,
+                        cancel=cancel,
+                        feature_store=FeatureStore(decoded),
                     )
             else:
                 if decoded is None:
                     with _audio_decode_errors_as_invalid():
                         decoded = decode_audio(str(request.file), sampling_rate=WHISPER_SAMPLE_RATE)
-                segments, transcription_info = whisper.transcribe(
+                segments, transcription_info = self._transcribe_budgeted(
+                    whisper,
                     decoded,
+                    budget,
+                    decode_options,
+                    cancel=cancel,
                     language=request.language,
                     vad_filter=request.vad_filter,
                     vad_parameters=VadOptions(**request.vad_parameters.model_dump()),
-                    **decode_options,
                 )
-                segments = Segment.from_faster_whisper_segments(segments)
 
+            pipeline = SegmentPipeline()
             if dia_segments:
-                segments = merge_whisper_diarization(segments, dia_segments)
-
-            if "word" not in request.timestamp_granularities:
-                segments = _strip_words(segments)
+                pipeline.add(splitters=[SpeakerMerger(dia_segments)])
+            if not words_requested:
+                pipeline.add(finishers=[_strip_words])
         except Exception as e:
-            metrics.record_failure("decode", e)
+            lease.release()
+            if isinstance(e, RequestCancelled):
+                _record_cancelled("decode", e, t0)
+            else:
+                metrics.record_failure("decode", e)
             raise
 
         metrics.observe_decode(transcription_info.duration, transcription_info.language)
 
         def _held_segments():
             try:
-                yield from segments
+                yield from pipeline(segments)
+            except (RequestCancelled, GeneratorExit) as e:
+                # Closed or cancelled before the last segment: stop whatever is still decoding.
+                cancel.cancel("segments closed")
+                _record_cancelled("decode", e, t0)
+                raise
             except Exception as e:
                 metrics.record_failure("decode", e)
                 raise
+            else:
+                if cancel.truncated:
+                    logger.warning("Deadline reached, returning partial transcription", model=request.model)
+                    metrics.deadline_exceeded().labels("partial").inc()
             finally:
                 metrics.observe_realtime_factor(t0, transcription_info.duration)
+                metrics.decode_fallbacks().observe(budget.fallbacks)
+                lease.release()
 
-        return _held_segments(), transcription_info
+        held = _held_segments()
+        # close() on a generator that never started skips its finally block.
+        weakref.finalize(held, lease.release)
+        return SegmentStream(held, pipeline), transcription_info
+
+    @staticmethod
+    def _transcribe_budgeted(
+        whisper: WhisperModel,
+        decoded: np.ndarray,
+        budget: DecodeBudget,
+        decode_options: dict,
+        cancel: CancellationToken | None = None,
+        **options,
+    ) -> tuple[Iterable[Segment], TranscriptionInfo]:
+        """Decode all of ``decoded`` in one guarded run whose options follow ``budget`` as it runs out.
+
+        Once the budget crosses a tier the run restarts from the last segment's end with
+        cut-back options, in the language the first decode detected; the segments those
+        stretches produce are flagged ``degraded``.
+        """
+        detected: str | None = None
+
+        def transcribe(offset_s: float, run_options: dict):
+            nonlocal detected
+            start = round(offset_s * WHISPER_SAMPLE_RATE)
+            language = options.get("language") or detected
+            fw_segments, info = transcribe_guarded(
+                whisper, decoded[start:], **{**options, "language": language}, **run_options
+            )
+            detected = detected or info.language
+            if cancel is not None:
+                fw_segments = cancel.checked(fw_segments)
+            return budget.track(fw_segments), info
+
+        flagged, info = transcribe_budgeted(transcribe, budget, decode_options, decoded.shape[0] / WHISPER_SAMPLE_RATE)
+
+        def segments() -> Iterator[Segment]:
+            for fw_segment, degraded in flagged:
+                yield from Segment.from_faster_whisper_segments((fw_segment,), degraded=degraded)
+
+        return segments(), info
 
     @staticmethod
     def _decode_options(request: DecodeParams, word_timestamps: bool) -> dict:
@@ -306,20 +491,42 @@ class FasterWhisperHandler:
         decode_options: dict,
         language_candidates: list[str] | None = None,
         progress_callback: Callable[[float], None] | None = None,
+        budget: DecodeBudget | None = None,
+        turn_index: SpeakerTurnIndex | None = None,
+        cancel: CancellationToken | None = None,
+        feature_store: FeatureStore | None = None,
     ):
-        """Detect language per speaker turn and decode same-language runs."""
-        durations = [end - start for start, end in turns]
-        prob_rows = detect_turn_language_probs(whisper, decoded, turns)
-        prob_rows = fill_missing_rows_from_intervals(whisper, decoded, turns, prob_rows)
-
-        if any(row is not None for row in prob_rows):
-            inventory = resolve_language_inventory(prob_rows, durations, language_candidates)
-            resolved = viterbi_smooth_languages(prob_rows, durations, inventory)
+        """Detect language per speaker turn and decode same-language runs.
+
+        Language ID and the runs' decoding slice their mel features from ``feature_store``.
+        Turns are detected padded like their runs, so a run decoding a single turn reuses
+        that turn's first-window encoder output from the request's ``EncoderCache``. With
+        ``LID_MAX_WINDOWS`` set, detection is budgeted (see ``sample_turn_language_probs``).
+        A pre-check on a few sampled turns first (``detect_dominant_language``) sends
+        monolingual files straight to decoding in their one language.
+        """
+        if feature_store is None:
+            feature_store = FeatureStore(decoded)
+        encoder_cache = self._request_encoder_cache(whisper)
+        dominant = None
+        if language_id_config.precheck_windows:
+            dominant = detect_dominant_language(
+                whisper,
+                decoded,
+                turns,
+                language_candidates,
+                cancel=cancel,
+                feature_store=feature_store,
+                pad_s=SPEECH_PAD_S,
+                encoder_cache=encoder_cache,
+            )
+            metrics.language_precheck().labels(outcome="mixed" if dominant is None else "single").inc()
+        if dominant is not None:
+            resolved = [dominant] * len(turns)
         else:
-            collapsed = collapse_decoded_to_speech(decoded, intervals)
-            assert collapsed is not None
-            language, _, _ = whisper.detect_language(audio=collapsed[0])
-            resolved = [language] * len(turns)
+            resolved = self._resolve_turn_languages(
+                whisper, decoded, intervals, turns, language_candidates, cancel, feature_store, encoder_cache
+            )
 
         return self._decode_language_runs(
             whisper,
@@ -330,8 +537,70 @@ class FasterWhisperHandler:
             decode_options,
             tag_language=True,
             progress_callback=progress_callback,
+            budget=budget,
+            turn_index=turn_index,
+            cancel=cancel,
+            feature_store=feature_store,
+            encoder_cache=encoder_cache,
         )
 
+    @staticmethod
+    def _request_encoder_cache(whisper: WhisperModel) -> EncoderCache | None:
+        """The request's cache for language ID encodings, or ``None`` when the decode runs could never reuse them.
+
+        With a cascade, language ID encodes with the served model but the runs decode with
+        the draft model, whose encoder output (and often mel count) differs.
+        """
+        if isinstance(whisper, CascadeWhisper):
+            return None
+        return EncoderCache(int(language_id_config.encoder_cache_mb * 2**20))
+
+    @staticmethod
+    def _resolve_turn_languages(
+        whisper: WhisperModel,
+        decoded: np.ndarray,
+        intervals: list[tuple[float, float]],
+        turns: list[tuple[float, float]],
+        language_candidates: list[str] | None,
+        cancel: CancellationToken | None,
+        feature_store: FeatureStore,
+        encoder_cache: EncoderCache | None,
+    ) -> list[str]:
+        """Per-turn language ID: detection (budgeted or two-pass), inventory and Viterbi smoothing."""
+        durations = [end - start for start, end in turns]
+        if language_id_config.max_windows:
+            prob_rows = sample_turn_language_probs(
+                whisper,
+                decoded,
+                turns,
+                language_candidates,
+                cancel=cancel,
+                feature_store=feature_store,
+                pad_s=SPEECH_PAD_S,
+                encoder_cache=encoder_cache,
+            )
+        else:
+            prob_rows = detect_turn_language_probs(
+                whisper,
+                decoded,
+                turns,
+                cancel=cancel,
+                feature_store=feature_store,
+                pad_s=SPEECH_PAD_S,
+                encoder_cache=encoder_cache,
+            )
+            prob_rows = fill_missing_rows_from_intervals(
+                whisper, decoded, turns, prob_rows, cancel=cancel, feature_store=feature_store
+            )
+
+        if any(row is not None for row in prob_rows):
+            inventory = resolve_language_inventory(prob_rows, durations, language_candidates)
+            return viterbi_smooth_languages(prob_rows, durations, inventory)
+        collapsed = collapse_decoded_to_speech(decoded, intervals)
+        assert collapsed is not None
+        language, _, _ = whisper.detect_language(audio=feature_store.attach(*collapsed))
+        return [language] * len(turns)
+
     def _decode_language_runs(
         self,
         whisper: WhisperModel,
@@ -342,8 +611,30 @@ class FasterWhisperHandler:
         decode_options: dict,
         tag_language: bool,
         progress_callback: Callable[[float], None] | None = None,
+        budget: DecodeBudget | None = None,
+        turn_index: SpeakerTurnIndex | None = None,
+        cancel: CancellationToken | None = None,
+        feature_store: FeatureStore | None = None,
+        encoder_cache: EncoderCache | None = None,
     ):
-        """Decode turns as bounded runs concurrently across worker threads."""
+        """Decode turns as bounded runs concurrently across worker threads.
+
+        Each run asks ``budget`` for its options when it starts, so runs that begin
+        late in an over-budget request decode with fewer fallbacks and a narrower beam.
+        With ``turn_index``, runs decoded without word timestamps get words aligned for
+        the segments that span a speaker change (see ``add_words_where_speakers_change``).
+        Once ``cancel`` is cancelled, queued runs are dropped and running ones stop at
+        their next window; a failing run cancels the others the same way. Past the
+        deadline of a partial request, runs keep the segments decoded so far instead.
+        Runs take their mel features from ``feature_store`` rather than recomputing them,
+        and windows language ID already encoded from ``encoder_cache``.
+        """
+        if budget is None:
+            budget = DecodeBudget(None, decode_options.get("temperature") or [])
+        if cancel is None:
+            cancel = CancellationToken()
+        if feature_store is None:
+            feature_store = FeatureStore(decoded)
         whisper_config = self.model_manager.whisper_config
         concurrency = max(1, whisper_config.num_workers)
         runs = turns_to_language_runs(turns, resolved)
@@ -360,28 +651,71 @@ class FasterWhisperHandler:
             progress_callback(min(1.0, done_mass / total_mass) if total_mass else 1.0)
 
         def decode_run(language: str, run_intervals: list[tuple[float, float]]):
-            run_collapsed = collapse_decoded_to_speech(decoded, run_intervals)
+            if cancel.check_or_truncate():
+                return None
+            # The run's audio is only used inside this call, so it may live in the thread's reusable buffer.
+            run_collapsed = collapse_decoded_to_speech(decoded, run_intervals, reuse_buffer=True)
             if run_collapsed is None:
                 return None
             run_audio, run_chunks = run_collapsed
-            fw_segments, info = whisper.transcribe(run_audio, language=language, vad_filter=False, **decode_options)
-            restored = list(restore_and_split_segments(fw_segments, run_chunks, run_intervals, original_duration_s))
-            if tag_language:
+            run_options, degraded = budget.run_options(decode_options)
+            if degraded:
+                metrics.degraded_decode_runs().inc()
+            # The segment generator encodes lazily, so the cache serves until it is drained.
+            with encoder_cache.serving() if encoder_cache is not None else contextlib.nullcontext():
+                fw_segments, info = transcribe_guarded(
+                    whisper,
+                    feature_store.attach(run_audio, run_chunks),
+                    language=language,
+                    vad_filter=False,
+                    **run_options,
+                )
+                fw_segments = budget.track(cancel.checked(fw_segments))
+                if turn_index is not None:
+                    fw_segments = add_words_where_speakers_change(
+                        whisper, run_audio, fw_segments, run_chunks, turn_index, language
+                    )
+                restored = list(restore_and_split_segments(fw_segments, run_chunks, run_intervals, original_duration_s))
+            if tag_language or degraded:
                 for seg in restored:
-                    seg.language = language
+                    if tag_language:
+                        seg.language = language
+                    seg.degraded = degraded
             return info, restored
 
+        def decode_run_or_cancel(language: str, run_intervals: list[tuple[float, float]]):
+            try:
+                return decode_run(language, run_intervals)
+            except Exception:
+                # The request fails anyway; stop the sibling runs right away.
+                cancel.cancel("decode run failed")
+                raise
+
         if concurrency > 1 and len(runs) > 1:
             results: list = [None] * len(runs)
             with ThreadPoolExecutor(max_workers=concurrency) as executor:
                 futures = {
-                    executor.submit(decode_run, language, run_intervals): index
+                    executor.submit(decode_run_or_cancel, language, run_intervals): index
                     for index, (language, run_intervals) in enumerate(runs)
                 }
-                for future in as_completed(futures):
-                    index = futures[future]
-                    results[index] = future.result()
-                    report(index)
+                pending = set(futures)
+                try:
+                    while pending and not cancel.cancelled:
+                        # Wake up periodically so this (request) thread can probe for cancellation.
+                        done, pending = wait(pending, timeout=PROBE_INTERVAL_S, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            if future.exception() is None:
+                                index = futures[future]
+                                results[index] = future.result()
+                                report(index)
+                        with contextlib.suppress(RequestCancelled):
+                            cancel.check_or_truncate()
+                finally:
+                    # Queued runs never start; running ones stop at their next window before the pool exits.
+                    for future in pending:
+                        future.cancel()
+            _raise_run_failure(futures)
+            cancel.check_or_truncate()
         else:
             results = []
             for index, (language, run_intervals) in enumerate(runs):
@@ -390,8 +724,17 @@ class FasterWhisperHandler:
 
         template_info = next((info for result in results if result is not None for info in [result[0]]), None)
         if template_info is None:
+            if cancel.truncated:
+                raise DeadlineExceeded("deadline exceeded before any speech run was decoded")
             raise RuntimeError("no decodable speech runs after collapsing diarization turns")
 
+        if encoder_cache is not None and encoder_cache.hits + encoder_cache.misses:
+            logger.debug(
+                "Decode runs reused language ID encoder outputs",
+                hits=encoder_cache.hits,
+                misses=encoder_cache.misses,
+                cached_mb=round(encoder_cache.used_bytes / 2**20, 1),
+            )
         transcription_info = _synthesize_multilang_info(runs, template_info, original_duration_s)
 
         def ordered_segments() -> Iterable[Segment]:
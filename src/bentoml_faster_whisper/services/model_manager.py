@@ -1,56 +1,350 @@
 from __future__ import annotations
 
+import contextlib
+import dataclasses
+import os
 import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import cast
 
 from faster_whisper import WhisperModel
+from faster_whisper.utils import download_model
 
-from bentoml_faster_whisper.config import WhisperModelConfig
+from bentoml_faster_whisper.config import CascadeConfig, Quantization, WhisperModelConfig
+from bentoml_faster_whisper.services.replica_pool import ReplicaPool, model_instances, replica_placements
 from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.encoder_cache import install_encoder_cache
+from bentoml_faster_whisper.utils.feature_store import StoredFeatureExtractor
 from bentoml_faster_whisper.utils.logger import get_logger
+from bentoml_faster_whisper.utils.model_cascade import CascadeWhisper
 
 logger = get_logger(__name__)
 
 
+def _unload_weights(model: WhisperModel) -> None:
+    """Free the CTranslate2 weights of every instance behind ``model``, even while it is still referenced."""
+    tiers = [model.draft, model.large] if isinstance(model, CascadeWhisper) else [model]
+    for tier in tiers:
+        for instance in model_instances(tier):
+            instance.model.unload_model()
+
+
+@dataclasses.dataclass
+class _Resident:
+    model_id: str
+    model: WhisperModel
+    footprint_mb: float
+    loaded: int = 1
+    leases: int = 0
+    retired: bool = False
+
+
+class ModelLease:
+    """A hold on a resident model: it is neither evicted nor freed while the lease is held.
+
+    ``release()`` is idempotent, so it can be both called from a ``finally`` and
+    registered as a finalizer. Used as a context manager it yields the model.
+    """
+
+    def __init__(self, provider: WhisperModelProvider, entry: _Resident) -> None:
+        self._provider = provider
+        self._entry = entry
+        self.model_id = entry.model_id
+        self.model = entry.model
+        self._released = False
+
+    def release(self) -> None:
+        with self._provider._lock:
+            if self._released:
+                return
+            self._released = True
+            self._entry.leases -= 1
+            if self._entry.retired and self._entry.leases == 0:
+                self._provider._free_locked(self._entry, "Swapped-out model freed")
+
+    def __enter__(self) -> WhisperModel:
+        return self.model
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.release()
+
+
 class WhisperModelProvider:
-    """Loads the single served Whisper model once and keeps it resident.
-
-    The model id (the only model this API serves) is passed in as ``default_model_name``;
-    device / compute / thread settings come from ``WhisperModelConfig``. Both are supplied
-    by the DI container from the app config. The first ``get()`` loads the weights under a
-    lock; every later ``get()`` returns the same instance. The model is never unloaded, so
-    callers may let the lazy ``transcribe()`` generators outlive the calling method without
-    any ref-count guard.
+    """Loads Whisper models on demand and keeps them resident under a memory budget.
+
+    The default model is served under ``default_model_name``; device / compute /
+    thread settings and the memory budget come from ``WhisperModelConfig``. All are
+    supplied by the DI container from the app config. The first ``get()`` or
+    ``lease()`` of a model name loads its weights; later calls return the same instance.
+
+    Before a load would exceed ``memory_budget_mb``, the least-recently-used models
+    with no outstanding lease are evicted; a model whose weights the load itself
+    downloads is sized only once it is loaded, so the check runs again then. Evicted
+    models have their weights unloaded. A model whose lazy ``transcribe()``
+    generators may outlive the calling method must therefore be held through
+    ``lease()`` until they are closed; a plain ``get()`` does not pin it. Without a
+    budget nothing is ever evicted. When only leased models are resident, the load
+    goes ahead over budget and logs a warning rather than failing the request.
+
+    ``swap()`` / ``start_swap()`` replace the model behind the default name without
+    a restart: the replacement (``model_id``) is loaded and warmed while the current
+    one keeps serving, then new leases switch to it atomically and the old model is
+    freed once its last lease is released. Both are resident in between, outside
+    the memory budget.
+
+    With a ``CascadeConfig`` whose ``draft_model`` is set, the provider also loads
+    that smaller model next to the default one and ``get()`` returns a
+    ``CascadeWhisper`` wrapping both: a drop-in for the served model that drafts with
+    the small one and re-decodes only low-confidence spans with the served one.
+
+    With ``replicas`` > 1 every model is loaded as a ``ReplicaPool`` of independent
+    instances placed by ``replica_placements`` (one per device index, or CPU
+    instances sharing the thread budget); its footprint counts once per replica.
     """
 
-    def __init__(self, whisper_config: WhisperModelConfig, default_model_name: str) -> None:
+    def __init__(
+        self,
+        whisper_config: WhisperModelConfig,
+        default_model_name: str,
+        cascade_config: CascadeConfig | None = None,
+    ) -> None:
         self.whisper_config = whisper_config
+        self.default_model_name = default_model_name
         self.model_id = default_model_name
+        self.cascade_config = cascade_config or CascadeConfig()
+        self.last_swap_error: str | None = None
         self._lock = threading.Lock()
-        self._model: WhisperModel | None = None
+        self._load_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._models: OrderedDict[str, _Resident] = OrderedDict()
+
+    def get(self, model_name: str | None = None) -> WhisperModel:
+        """Return the resident model instance (loading it on first call), without pinning it."""
+        return self._resident(model_name or self.default_model_name, hold=False).model
+
+    def lease(self, model_name: str | None = None) -> ModelLease:
+        """Return the resident model (loading it on first call) pinned until the lease is released."""
+        return ModelLease(self, self._resident(model_name or self.default_model_name, hold=True))
+
+    def resident_models(self) -> list[str]:
+        """Resident model names, least recently used first."""
+        with self._lock:
+            return list(self._models)
+
+    @property
+    def swapping(self) -> bool:
+        return self._swap_lock.locked()
+
+    def swap(
+        self,
+        model_id: str,
+        compute_type: Quantization | None = None,
+        warm: Callable[[WhisperModel], None] | None = None,
+    ) -> None:
+        """Load ``model_id`` (optionally with another compute type), warm it and serve it as the default.
 
-    def get(self) -> WhisperModel:
-        """Return the resident Whisper model instance (loading it on first call)."""
-        if self._model is None:
+        Blocks until the switch; raises ``RuntimeError`` if another swap is running.
+        """
+        if not self._swap_lock.acquire(blocking=False):
+            raise RuntimeError("A model swap is already in progress")
+        try:
+            self._swap(model_id, compute_type, warm)
+        finally:
+            self._swap_lock.release()
+
+    def start_swap(
+        self,
+        model_id: str,
+        compute_type: Quantization | None = None,
+        warm: Callable[[WhisperModel], None] | None = None,
+    ) -> threading.Thread:
+        """Run ``swap()`` on a background thread; a failure is logged and kept in ``last_swap_error``.
+
+        Raises ``RuntimeError`` right away if another swap is running.
+        """
+        if not self._swap_lock.acquire(blocking=False):
+            raise RuntimeError("A model swap is already in progress")
+
+        def run() -> None:
+            try:
+                # A failure is already logged and recorded in last_swap_error by _swap.
+                with contextlib.suppress(Exception):
+                    self._swap(model_id, compute_type, warm)
+            finally:
+                self._swap_lock.release()
+
+        thread = threading.Thread(target=run, name="whisper-model-swap", daemon=True)
+        thread.start()
+        return thread
+
+    def _swap(
+        self,
+        model_id: str,
+        compute_type: Quantization | None,
+        warm: Callable[[WhisperModel], None] | None,
+    ) -> None:
+        start = time.perf_counter()
+        config = self.whisper_config
+        if compute_type is not None:
+            config = config.model_copy(update={"compute_type": compute_type})
+        logger.info("Swapping default model", from_model_id=self.model_id, to_model_id=model_id)
+        try:
+            entry = self._build_resident(self.default_model_name, model_id, config)
+            if warm is not None:
+                warm(entry.model)
+        except Exception as e:
+            self.last_swap_error = f"{type(e).__name__}: {e}"
+            metrics.model_swaps().labels("failed").inc()
+            logger.exception("Model swap failed; keeping the current model", model_id=model_id)
+            raise
+
+        with self._load_lock, self._lock:
+            previous = self._models.pop(self.default_model_name, None)
+            self._models[self.default_model_name] = entry
+            self.model_id = model_id
+            self.whisper_config = config
+            if previous is not None:
+                previous.retired = True
+                if previous.leases == 0:
+                    self._free_locked(previous, "Swapped-out model freed")
+        swap_duration = time.perf_counter() - start
+        self.last_swap_error = None
+        metrics.model_swaps().labels("succeeded").inc()
+        metrics.model_swap_duration().observe(swap_duration)
+        logger.info("Default model swapped", model_id=model_id, swap_duration=swap_duration)
+
+    def _resident(self, model_name: str, hold: bool) -> _Resident:
+        entry = self._touch(model_name, hold)
+        if entry is not None:
+            return entry
+        with self._load_lock:
+            entry = self._touch(model_name, hold)
+            if entry is not None:
+                return entry
+            is_default = model_name == self.default_model_name
+            model_id = self.model_id if is_default else model_name
+            self._evict_for(self._footprint_mb(model_id, self.whisper_config, with_draft=is_default))
+            entry = self._build_resident(model_name, model_id, self.whisper_config)
+            # Weights the load downloaded were sized as 0 above.
+            self._evict_for(entry.footprint_mb)
             with self._lock:
-                if self._model is None:
-                    self._model = self._load()
-        return self._model
+                entry.leases = int(hold)
+                self._models[model_name] = entry
+            return entry
+
+    def _build_resident(self, model_name: str, model_id: str, config: WhisperModelConfig) -> _Resident:
+        is_default = model_name == self.default_model_name
+        model = self._load_model(model_id, config)
+        loaded = 1
+        if is_default and self.cascade_config.enabled:
+            assert self.cascade_config.draft_model is not None
+            draft = self._load_model(self.cascade_config.draft_model, config)
+            model = cast(WhisperModel, CascadeWhisper(draft, model, self.cascade_config))
+            loaded = 2
+        # Measured after loading: a first load downloads the weights.
+        return _Resident(model_id, model, self._footprint_mb(model_id, config, with_draft=is_default), loaded)
+
+    def _touch(self, model_name: str, hold: bool) -> _Resident | None:
+        with self._lock:
+            entry = self._models.get(model_name)
+            if entry is None:
+                return None
+            self._models.move_to_end(model_name)
+            entry.leases += int(hold)
+            return entry
+
+    def _free_locked(self, entry: _Resident, event: str) -> None:
+        """Unload a model no longer served and drop its accounting; the caller holds ``_lock``.
 
-    def _load(self) -> WhisperModel:
-        logger.debug("Loading model", model_id=self.model_id)
+        Its weights are unloaded explicitly: ``get()`` callers may still reference it.
+        """
+        _unload_weights(entry.model)
+        metrics.models_loaded().dec(entry.loaded)
+        logger.info(event, model_id=entry.model_id, footprint_mb=entry.footprint_mb)
+
+    def _evict_for(self, footprint_mb: float) -> None:
+        """Evict idle models, least recently used first, until ``footprint_mb`` more fits the budget."""
+        budget_mb = self.whisper_config.memory_budget_mb
+        if budget_mb is None:
+            return
+        with self._lock:
+            used_mb = sum(entry.footprint_mb for entry in self._models.values())
+            for model_name, entry in list(self._models.items()):
+                if used_mb + footprint_mb <= budget_mb:
+                    break
+                if entry.leases > 0:
+                    continue
+                del self._models[model_name]
+                used_mb -= entry.footprint_mb
+                self._free_locked(entry, "Model evicted")
+            if used_mb + footprint_mb > budget_mb:
+                logger.warning(
+                    "Loading model over memory budget; all resident models are leased",
+                    used_mb=used_mb,
+                    footprint_mb=footprint_mb,
+                    budget_mb=budget_mb,
+                )
+
+    def _footprint_mb(self, model_id: str, config: WhisperModelConfig, with_draft: bool) -> float:
+        """Estimated memory of a model: its on-disk weights, halved for int8 compute types.
+
+        Resolved from the local cache only, so estimating never triggers a download;
+        a model not yet on disk counts as 0 until its load has downloaded it.
+        """
+        model_ids = [model_id]
+        if with_draft and self.cascade_config.enabled:
+            assert self.cascade_config.draft_model is not None
+            model_ids.append(self.cascade_config.draft_model)
+        total_bytes = 0
+        for size_or_id in model_ids:
+            try:
+                path = size_or_id if os.path.isdir(size_or_id) else download_model(size_or_id, local_files_only=True)
+                total_bytes += os.path.getsize(os.path.join(path, "model.bin"))
+            except (OSError, ValueError):
+                logger.debug("No local weights to size model", model_id=size_or_id)
+        scale = 0.5 if str(config.compute_type).startswith("int8") else 1.0
+        return total_bytes * scale * config.replicas / 2**20
+
+    def _load_model(self, model_id: str, config: WhisperModelConfig | None = None) -> WhisperModel:
+        config = config or self.whisper_config
+        logger.debug("Loading model", model_id=model_id, replicas=config.replicas)
         start = time.perf_counter()
-        model = WhisperModel(
-            self.model_id,
-            device=self.whisper_config.inference_device,
-            device_index=self.whisper_config.device_index,
-            compute_type=self.whisper_config.compute_type,
-            cpu_threads=self.whisper_config.cpu_threads,
-            num_workers=self.whisper_config.num_workers,
-        )
+        if config.replicas == 1:
+            model = self._build(model_id, config, config.device_index, config.cpu_threads)
+        else:
+            model = cast(
+                WhisperModel,
+                ReplicaPool(
+                    (f"{model_id}/{i}", self._build(model_id, config, **placement))
+                    for i, placement in enumerate(replica_placements(config))
+                ),
+            )
         load_duration = time.perf_counter() - start
         metrics.model_load_duration().observe(load_duration)
         metrics.model_loads_total().inc()
         metrics.models_loaded().inc()
-        logger.info("Model loaded", model_id=self.model_id, load_duration=load_duration)
+        logger.info("Model loaded", model_id=model_id, load_duration=load_duration)
+        return model
+
+    @staticmethod
+    def _build(
+        model_id: str,
+        config: WhisperModelConfig,
+        device_index: int | list[int],
+        cpu_threads: int,
+    ) -> WhisperModel:
+        model = WhisperModel(
+            model_id,
+            device=config.inference_device,
+            device_index=device_index,
+            compute_type=config.compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=config.num_workers,
+        )
+        # Lets decode runs reuse the request's FeatureStore instead of recomputing their mel features.
+        model.feature_extractor = StoredFeatureExtractor(model.feature_extractor)  # type: ignore[assignment]
+        # Lets decode runs reuse the encoder outputs of the request's language ID windows.
+        install_encoder_cache(model, model_id)
         return model
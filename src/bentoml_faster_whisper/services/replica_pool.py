@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import time
+import weakref
+from typing import Any, Iterable, Iterator
+
+import ctranslate2
+from faster_whisper import WhisperModel
+
+from bentoml_faster_whisper.config import Device, WhisperModelConfig
+from bentoml_faster_whisper.utils import metrics
+
+
+def replica_placements(config: WhisperModelConfig) -> list[dict[str, Any]]:
+    """``WhisperModel`` placement kwargs for each of ``config.replicas`` replicas.
+
+    On GPU the replicas are spread round-robin over ``device_index`` (an int places
+    them all on one device). On CPU the ``cpu_threads`` budget (``0``: all cores) is
+    split evenly, so N replicas do not oversubscribe the cores a single model used.
+    """
+    indices = config.device_index if isinstance(config.device_index, list) else [config.device_index]
+    on_cpu = config.inference_device == Device.CPU or (
+        config.inference_device == Device.AUTO and ctranslate2.get_cuda_device_count() == 0
+    )
+    cpu_threads = config.cpu_threads
+    if on_cpu:
+        cpu_threads = max(1, (config.cpu_threads or os.cpu_count() or 1) // config.replicas)
+    return [{"device_index": indices[i % len(indices)], "cpu_threads": cpu_threads} for i in range(config.replicas)]
+
+
+class _Replica:
+    def __init__(self, label: str, model: WhisperModel) -> None:
+        self.label = label
+        self.model = model
+        self.inflight = 0
+        self.dispatched = 0
+
+
+class _Hold:
+    """One dispatch to a replica; ``release()`` is idempotent so it can also be a finalizer."""
+
+    def __init__(self, pool: ReplicaPool, replica: _Replica) -> None:
+        self._pool = pool
+        self.replica = replica
+        self._start = time.perf_counter()
+        self._released = False
+
+    def release(self) -> None:
+        with self._pool._lock:
+            if self._released:
+                return
+            self._released = True
+            self.replica.inflight -= 1
+            inflight = self.replica.inflight
+        metrics.replica_inflight().labels(self.replica.label).set(inflight)
+        metrics.replica_busy_seconds().labels(self.replica.label).inc(time.perf_counter() - self._start)
+
+
+class ReplicaPool:
+    """Independent ``WhisperModel`` replicas behind the ``WhisperModel`` interface.
+
+    Every ``transcribe()`` call is dispatched to the replica with the fewest decodes
+    in flight (ties go to the one dispatched least often) and holds it until its lazy
+    segment generator is exhausted, closed or collected. Since the handler decodes
+    each language run with its own ``transcribe()`` call, the runs of one request
+    spread across replicas as well as concurrent requests do.
+
+    A sequence of calls whose results feed each other (an ``encode()`` followed by
+    ``model.detect_language()`` or ``find_alignment()`` on its output) must run on one
+    replica, which may sit on another device than the next least-loaded one: it goes
+    through ``acquire()`` (or ``pinned()``), which holds a replica for the sequence.
+    Other attributes are read from the currently least-loaded replica, so only
+    single, self-contained calls (``detect_language()``, ``feature_extractor``) may
+    use them directly.
+
+    Per-replica utilisation is exported as ``whisper_replica_inflight`` and
+    ``whisper_replica_busy_seconds`` (labelled by replica), whose rate is the
+    share of wall-clock time the replica spent decoding.
+    """
+
+    def __init__(self, models: Iterable[tuple[str, WhisperModel]]) -> None:
+        self._replicas = [_Replica(label, model) for label, model in models]
+        if not self._replicas:
+            raise ValueError("a replica pool needs at least one model")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._replicas)
+
+    def models(self) -> list[WhisperModel]:
+        """Every replica's model, e.g. to warm each one up."""
+        return [replica.model for replica in self._replicas]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._least_loaded().model, name)
+
+    @contextlib.contextmanager
+    def acquire(self) -> Iterator[WhisperModel]:
+        """Hold the least-loaded replica, counted as in flight, for the calls made inside the block."""
+        hold = self._acquire()
+        try:
+            yield hold.replica.model
+        finally:
+            hold.release()
+
+    def transcribe(self, audio: Any, *args: Any, **kwargs: Any) -> tuple[Iterator[Any], Any]:
+        hold = self._acquire()
+        try:
+            segments, info = hold.replica.model.transcribe(audio, *args, **kwargs)
+        except BaseException:
+            hold.release()
+            raise
+        held = _held_segments(segments, hold)
+        weakref.finalize(held, hold.release)
+        return held, info
+
+    def _least_loaded(self) -> _Replica:
+        return min(self._replicas, key=lambda replica: (replica.inflight, replica.dispatched))
+
+    def _acquire(self) -> _Hold:
+        with self._lock:
+            replica = self._least_loaded()
+            replica.inflight += 1
+            replica.dispatched += 1
+            inflight = replica.inflight
+        metrics.replica_inflight().labels(replica.label).set(inflight)
+        return _Hold(self, replica)
+
+
+def pinned(model: WhisperModel) -> contextlib.AbstractContextManager[WhisperModel]:
+    """``model`` pinned to one instance for a sequence of calls.
+
+    A ``ReplicaPool`` (also as the large model of a ``CascadeWhisper``) holds one of
+    its replicas; any other model is used as it is.
+    """
+    acquire = getattr(model, "acquire", None)
+    return acquire() if acquire is not None else contextlib.nullcontext(model)
+
+
+def model_instances(model: WhisperModel) -> list[WhisperModel]:
+    """The independent instances behind ``model``: a pool's replicas, else ``model`` itself."""
+    return model.models() if isinstance(model, ReplicaPool) else [model]
+
+
+def _held_segments(segments: Iterable[Any], hold: _Hold) -> Iterator[Any]:
+    try:
+        yield from segments
+    finally:
+        hold.release()
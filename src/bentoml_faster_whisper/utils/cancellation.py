@@ -0,0 +1,139 @@
+"""Cooperative cancellation of one request's diarization and decode work.
+
+Closing a request's segment generator only stops the lazy part of a decode; the
+diarization pipeline and the decode runs already handed to the worker pool keep
+the GPU busy until they finish. A ``CancellationToken`` is checked between units
+of that work (a pyannote hook step, a language-ID batch, a decode run, one 30 s
+window of a run's segment generator), so an abandoned request stops within one unit.
+
+The service builds tokens whose ``probe`` asks BentoML's event loop whether the
+request is gone (client disconnected, task cancelled or timed out); the probe only
+answers from the request's own worker threads, other threads see ``cancel()``.
+The same tokens carry the request's deadline, so work that could only finish after
+the traffic-layer timeout fails fast with ``DeadlineExceeded`` (HTTP 504) or, for
+requests that accept partial results, stops decoding and keeps what it has.
+"""
+
+import threading
+import time
+from http import HTTPStatus
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from bentoml.exceptions import BentoMLException
+
+_T = TypeVar("_T")
+
+PROBE_INTERVAL_S = 0.5
+DEADLINE_EXCEEDED = "deadline exceeded"
+
+
+class RequestCancelled(Exception):
+    """The request's work was abandoned; raised from the next cancellation check."""
+
+
+class DeadlineExceeded(RequestCancelled, BentoMLException):
+    """The request ran out of time before its answer was ready."""
+
+    error_code = HTTPStatus.GATEWAY_TIMEOUT
+
+
+class CancellationToken:
+    """Thread-safe, idempotent cancellation flag and deadline shared by one request's work.
+
+    ``probe`` returns ``True`` when the request is gone, ``False`` when it is not, or
+    ``None`` when it cannot tell from the calling thread. It is polled by ``check()``
+    at most every ``probe_interval_s``; ``cancelled`` never polls, so it is cheap to
+    read from any thread.
+
+    ``deadline_s`` (seconds from construction) makes checks past it fail with
+    ``DeadlineExceeded``. With ``partial_on_deadline``, checks that guard decode
+    output use ``check_or_truncate()`` instead and stop quietly, marking the token
+    ``truncated``; stages that cannot return anything partial still fail.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool | None] | None = None,
+        probe_interval_s: float = PROBE_INTERVAL_S,
+        deadline_s: float | None = None,
+        partial_on_deadline: bool = False,
+    ) -> None:
+        self._event = threading.Event()
+        self._probe = probe
+        self._probe_interval_s = probe_interval_s
+        self._next_probe = 0.0
+        self._deadline = time.monotonic() + deadline_s if deadline_s is not None else None
+        self.partial_on_deadline = partial_on_deadline
+        self.truncated = False
+        self.reason: str | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    @property
+    def remaining_s(self) -> float | None:
+        return None if self._deadline is None else max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def check(self) -> None:
+        """Raise ``RequestCancelled`` if the token is (or the probe finds it should be) cancelled.
+
+        Past the deadline the token is cancelled and ``DeadlineExceeded`` is raised.
+        """
+        self.check_or_truncate(partial=False)
+
+    def check_or_truncate(self, partial: bool | None = None) -> bool:
+        """Like ``check()``, but past the deadline of a partial request return ``True`` instead.
+
+        Returns ``False`` when work may go on; ``partial`` overrides ``partial_on_deadline``.
+        """
+        if partial is None:
+            partial = self.partial_on_deadline
+        if not self._event.is_set() and self._probe is not None:
+            now = time.monotonic()
+            if now >= self._next_probe:
+                gone = self._probe()
+                if gone is not None:
+                    self._next_probe = now + self._probe_interval_s
+                if gone:
+                    self.cancel("request gone")
+        if self._event.is_set():
+            if self.reason == DEADLINE_EXCEEDED:
+                raise DeadlineExceeded(self.reason)
+            raise RequestCancelled(self.reason)
+        if self.expired:
+            if partial:
+                self.truncated = True
+                return True
+            self.cancel(DEADLINE_EXCEEDED)
+            raise DeadlineExceeded(self.reason)
+        return False
+
+    def checked(self, items: Iterable[_T]) -> Iterator[_T]:
+        """Yield ``items``, checking the token before pulling each one.
+
+        For faster-whisper's lazy segment generator a pull decodes the next window, so
+        cancellation takes effect within one window; past the deadline of a partial
+        request the stream just ends. The source is closed on exit.
+        """
+        iterator = iter(items)
+        try:
+            while not self.check_or_truncate():
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import dataclasses
 import os
 from typing import TYPE_CHECKING, Callable, TypeVar
 
-from pydantic import BaseModel
-
 from bentoml_faster_whisper.utils.logger import get_logger
 
 if TYPE_CHECKING:
@@ -36,7 +35,11 @@ def positive_env(name: str, default: _NumberT, cast: Callable[[str], _NumberT])
     return value
 
 
-class Word(BaseModel):
+# Segments and words are created, split, merged and cleaned many times per request, so the
+# pipeline uses plain slotted dataclasses; pydantic only takes them in (without copying or
+# re-validating) as fields of the response models, which serialize them to JSON.
+@dataclasses.dataclass(slots=True)
+class Word:
     start: float
     end: float
     word: str
@@ -56,7 +59,8 @@ class Word(BaseModel):
         return words
 
 
-class Segment(BaseModel):
+@dataclasses.dataclass(slots=True)
+class Segment:
     id: int
     seek: int
     start: float
@@ -72,9 +76,13 @@ class Segment(BaseModel):
     language: str | None = None
     """Per-segment decode language; only set when the language was auto-detected per
     speech region (diarized request without an explicit language)."""
+    degraded: bool = False
+    """Decoded with fallback/beam settings cut back by the request's decode budget."""
 
     @classmethod
-    def from_faster_whisper_segments(cls, segments: Iterable[faster_whisper.transcribe.Segment]) -> Iterable[Segment]:
+    def from_faster_whisper_segments(
+        cls, segments: Iterable[faster_whisper.transcribe.Segment], degraded: bool = False
+    ) -> Iterable[Segment]:
         for segment in segments:
             yield cls(
                 id=segment.id,
@@ -98,6 +106,7 @@ class Segment(BaseModel):
                 ]
                 if segment.words is not None
                 else None,
+                degraded=degraded,
             )
 
 
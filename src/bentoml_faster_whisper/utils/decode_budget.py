@@ -0,0 +1,147 @@
+"""Per-request wall-clock decode budget.
+
+faster-whisper re-decodes a window at every fallback temperature whose result fails
+the compression-ratio / log-prob checks, each time sampling ``best_of`` candidates;
+with the defaults one noisy region can re-decode six times. A request with a budget
+hands every decode run options scaled to what is left of it: past half the budget the
+run gets at most one fallback and a narrow beam, once it is spent the run decodes
+greedily at the first temperature only. Segments of such runs are flagged
+``degraded`` so clients can tell a cut-back decode from a full one.
+
+A request decoded in one run (no diarization) would only ever see the options of its
+start, so ``transcribe_budgeted`` re-derives them after every segment and, when the
+budget crosses into the next tier, restarts the decode from that segment's end.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Protocol, Sequence, TypeVar
+
+from faster_whisper.transcribe import Segment as FWSegment
+
+from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.model_cascade import shift_segment
+
+_REDUCED_SHARE = 0.5
+_REDUCED_TEMPERATURES = 2
+_REDUCED_BEAM = 2
+
+
+class _DecodedWindow(Protocol):
+    @property
+    def seek(self) -> int: ...
+
+    @property
+    def temperature(self) -> float | None: ...
+
+
+_WindowT = TypeVar("_WindowT", bound=_DecodedWindow)
+
+
+class DecodeBudget:
+    """Wall-clock budget of one request, plus the temperature fallbacks it spent.
+
+    ``budget_s=None`` never degrades a run but still counts fallbacks, so the
+    per-request fallback metric covers unbudgeted traffic too. The budget is timed
+    from ``t0`` (request entry), so time spent in diarization counts against it.
+    """
+
+    def __init__(self, budget_s: float | None, temperatures: Sequence[float], t0: float | None = None) -> None:
+        self.budget_s = budget_s
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self._temperatures = list(temperatures)
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def remaining_share(self) -> float:
+        """Share of the budget still left, ``1.0`` when unbudgeted."""
+        if self.budget_s is None:
+            return 1.0
+        return max(0.0, 1.0 - (time.perf_counter() - self.t0) / self.budget_s)
+
+    def run_options(self, decode_options: dict) -> tuple[dict, bool]:
+        """``transcribe()`` options for the next decode run and whether they were cut back."""
+        remaining = self.remaining_share()
+        if remaining > _REDUCED_SHARE:
+            return decode_options, False
+
+        temperatures = list(decode_options.get("temperature") or [0.0])
+        if remaining > 0.0:
+            max_temperatures, max_best_of, max_beam = _REDUCED_TEMPERATURES, _REDUCED_TEMPERATURES, _REDUCED_BEAM
+        else:
+            max_temperatures, max_best_of, max_beam = 1, 1, 1
+        options = dict(
+            decode_options,
+            temperature=temperatures[:max_temperatures],
+            best_of=min(decode_options.get("best_of", 1), max_best_of),
+            beam_size=min(decode_options.get("beam_size", 1), max_beam),
+        )
+        degraded = any(options[key] != decode_options.get(key) for key in ("temperature", "best_of", "beam_size"))
+        return options, degraded
+
+    def track(self, segments: Iterable[_WindowT]) -> Iterator[_WindowT]:
+        """Pass one ``transcribe()`` call's segments through, counting its fallbacks.
+
+        A window's fallbacks are the temperatures tried before the one that was kept,
+        counted once per window (``seek``) however many segments it produced. Safe to
+        call from concurrent decode runs.
+        """
+        seen: set[int] = set()
+        for segment in segments:
+            if segment.seek not in seen:
+                seen.add(segment.seek)
+                fallbacks = self._fallbacks_at(segment.temperature)
+                if fallbacks:
+                    with self._lock:
+                        self.fallbacks += fallbacks
+            yield segment
+
+    def _fallbacks_at(self, temperature: float | None) -> int:
+        if temperature is None or temperature not in self._temperatures:
+            return 0
+        return self._temperatures.index(temperature)
+
+
+def transcribe_budgeted(
+    transcribe: Callable[[float, dict], tuple[Iterable[FWSegment], Any]],
+    budget: DecodeBudget,
+    decode_options: dict,
+    duration_s: float,
+) -> tuple[Iterator[tuple[FWSegment, bool]], Any]:
+    """One decode run whose options follow ``budget`` while it runs, not just at its start.
+
+    ``transcribe(offset_s, options)`` decodes the audio from ``offset_s`` on (``duration_s``
+    long in all), with timestamps relative to ``offset_s``. Yields each segment with
+    whether it was decoded with cut-back options; the info is the first call's.
+    """
+    options, degraded = budget.run_options(decode_options)
+    if degraded:
+        metrics.degraded_decode_runs().inc()
+    first, info = transcribe(0.0, options)
+
+    def segments() -> Iterator[tuple[FWSegment, bool]]:
+        nonlocal options, degraded
+        current, offset_s = first, 0.0
+        while True:
+            resume_s = None
+            try:
+                for segment in current:
+                    if offset_s:
+                        segment = shift_segment(segment, offset_s)
+                    yield segment, degraded
+                    next_options, next_degraded = budget.run_options(decode_options)
+                    if next_options != options:
+                        resume_s = segment.end
+                        break
+            finally:
+                close = getattr(current, "close", None)
+                if close is not None:
+                    close()
+            if resume_s is None or resume_s >= duration_s:
+                return
+            options, degraded = next_options, next_degraded
+            if degraded:
+                metrics.degraded_decode_runs().inc()
+            current, offset_s = transcribe(resume_s, options)[0], resume_s
+
+    return segments(), info
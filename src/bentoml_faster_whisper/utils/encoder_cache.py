@@ -0,0 +1,129 @@
+"""Encoder outputs of language ID's windows, reused by the decode runs of the same request.
+
+Language ID encodes the first 30 s window of every turn, and a run made of a single
+turn encodes that same window again as its first decode window. An ``EncoderCache``
+keeps (within a byte budget) the outputs language ID hands it, and models built by
+the model manager look every window their decode encodes up in the cache serving the
+calling thread, so a window with exactly the same features skips the encoder.
+
+Windows are matched by a digest of their features, which is exact for the cases that
+matter: language ID slices a turn padded like its run from the request's
+``FeatureStore`` and drops the extractor's trailing frame as ``transcribe()`` does,
+so an unclamped single-turn run's first window is bit-identical to its LID window.
+Entries are also keyed by model and device, so a draft model or another GPU never
+gets an output that is not its own.
+"""
+
+import contextlib
+import hashlib
+import threading
+from typing import Any, Iterator, Sequence
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+from bentoml_faster_whisper.utils import metrics
+
+_serving = threading.local()
+
+
+def _digest(window: np.ndarray) -> tuple:
+    features = np.ascontiguousarray(window)
+    return features.shape, hashlib.blake2b(features.data, digest_size=16).digest()
+
+
+def _split_batch(output: ctranslate2.StorageView, count: int) -> list[tuple[ctranslate2.StorageView, Any]]:
+    """One single-item ``StorageView`` per batch item, each with the array that owns its memory."""
+    if output.device == "cpu":
+        batch = np.array(output)
+        items = [np.ascontiguousarray(batch[i : i + 1]) for i in range(count)]
+    else:
+        import torch
+
+        # Shares the output's device memory; the clones outlive it.
+        batch = torch.as_tensor(output)
+        items = [batch[i : i + 1].clone() for i in range(count)]
+    return [(ctranslate2.StorageView.from_array(item), item) for item in items]
+
+
+def _nbytes(item: Any) -> int:
+    return int(item.nbytes) if isinstance(item, np.ndarray) else item.element_size() * item.numel()
+
+
+class EncoderCache:
+    """One request's encoder outputs by (model, device, window features), bounded by ``budget_bytes``.
+
+    Once the budget is used up further outputs are dropped rather than evicting
+    earlier ones: decode runs follow the file's order, like language ID's windows.
+    """
+
+    def __init__(self, budget_bytes: int) -> None:
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple, tuple[ctranslate2.StorageView, Any]] = {}
+        self._lock = threading.Lock()
+
+    def store(
+        self,
+        model_key: str | None,
+        windows: Sequence[np.ndarray | None],
+        output: ctranslate2.StorageView,
+    ) -> None:
+        """Keep the outputs of the batch items whose ``windows`` entry is not ``None``."""
+        if model_key is None or self.used_bytes >= self.budget_bytes or all(w is None for w in windows):
+            return
+        device = (output.device, output.device_index)
+        with self._lock:
+            for window, (view, item) in zip(windows, _split_batch(output, len(windows))):
+                if window is None:
+                    continue
+                size = _nbytes(item)
+                if self.used_bytes + size > self.budget_bytes:
+                    return
+                self._entries[(model_key, device, *_digest(window))] = (view, item)
+                self.used_bytes += size
+
+    def lookup(self, model_key: str, device: tuple[str, int], window: np.ndarray) -> ctranslate2.StorageView | None:
+        with self._lock:
+            entry = self._entries.get((model_key, device, *_digest(window))) if self._entries else None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        metrics.encoder_cache_lookups().labels(outcome="miss" if entry is None else "hit").inc()
+        return None if entry is None else entry[0]
+
+    @contextlib.contextmanager
+    def serving(self) -> Iterator["EncoderCache"]:
+        """Answer the encoder passes of cache-aware models on the calling thread from this cache."""
+        previous = getattr(_serving, "cache", None)
+        _serving.cache = self
+        try:
+            yield self
+        finally:
+            _serving.cache = previous
+
+
+def install_encoder_cache(model: WhisperModel, model_key: str) -> None:
+    """Make ``model.encode`` look single windows up in the cache serving the calling thread.
+
+    ``model.encoder_cache_key`` tells language ID under which key to store its outputs.
+    """
+    encode = model.encode
+    to_cpu = model.model.device == "cuda" and len(model.model.device_index) > 1
+    device = ("cpu", 0) if to_cpu or model.model.device == "cpu" else ("cuda", model.model.device_index[0])
+
+    def encode_or_reuse(features: np.ndarray) -> ctranslate2.StorageView:
+        cache = getattr(_serving, "cache", None)
+        # transcribe() encodes one 2-D window at a time; batches (LID, alignment) always run.
+        if cache is not None and features.ndim == 2:
+            cached = cache.lookup(model_key, device, features)
+            if cached is not None:
+                return cached
+        return encode(features)
+
+    model.encode = encode_or_reuse  # type: ignore[method-assign]
+    model.encoder_cache_key = model_key  # type: ignore[attr-defined]
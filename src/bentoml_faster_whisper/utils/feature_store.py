@@ -0,0 +1,167 @@
+"""Log-mel features of one request's decoded file, computed once and sliced per turn and run.
+
+Language ID extracts features per turn, the second detection pass again per merged
+interval, and every decode run's ``transcribe()`` once more for its collapsed audio,
+so speech covered by several of them goes through the STFT several times. A
+``FeatureStore`` computes the file's log-mel frames lazily in 30 s blocks, only the
+blocks a call's chunks touch, and answers each of those calls by gathering their
+frames. Blocks are kept per feature configuration (a draft model may use a different
+mel count), the ``MAX_CACHED_BLOCKS`` most recently used of each, so a long file
+never holds its whole mel spectrogram. The STFT runs outside the store's lock; two
+runs needing the same missing block at once may both compute it.
+
+Frames sit on the file's hop grid: a chunk starting between grid points gets frames
+shifted by less than one hop (10 ms), and the frames at a chunk's edges see the real
+neighbouring audio instead of ``FeatureExtractor``'s reflect padding. Each slice is
+normalized on its own, like ``FeatureExtractor`` normalizes each call's output.
+
+``transcribe()`` only accepts audio, so decode runs hand it ``FeatureStore.attach()``
+arrays, which ``StoredFeatureExtractor`` (installed on every loaded model) recognizes.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Sequence
+
+import numpy as np
+from faster_whisper.feature_extractor import FeatureExtractor
+
+BLOCK_FRAMES = 3000
+# Per feature configuration: one hour of audio, about 115 MiB of 80-bin frames.
+MAX_CACHED_BLOCKS = 120
+# FeatureExtractor.__call__ appends this many zero samples before its STFT.
+_EXTRACTOR_PADDING = 160
+
+
+class _FeaturedAudio(np.ndarray):
+    """Audio carrying the store and chunks its features can be gathered from.
+
+    Views and slices of it are plain audio again (no ``__array_finalize__``), so a
+    caller cutting a span out of it gets that span's features computed as usual.
+    """
+
+    feature_source: tuple["FeatureStore", list[dict]]
+
+
+class _MelFrames:
+    """Unnormalized log10 mel frames of the file's recently used blocks for one feature configuration."""
+
+    def __init__(self, extractor: FeatureExtractor, audio: np.ndarray) -> None:
+        self.extractor = extractor
+        self.num_mels = extractor.mel_filters.shape[0]
+        self.num_frames = (audio.shape[0] + _EXTRACTOR_PADDING) // extractor.hop_length
+        self.blocks: OrderedDict[int, np.ndarray] = OrderedDict()
+        self.window = np.hanning(extractor.n_fft + 1)[:-1].astype(np.float32)
+
+
+class FeatureStore:
+    """Lazily computed log-mel frames of one decoded file, shared by a request's LID and decode runs."""
+
+    def __init__(self, audio: np.ndarray) -> None:
+        self._audio = audio if audio.dtype == np.float32 else audio.astype(np.float32)
+        self._mels: dict[tuple[int, int, int], _MelFrames] = {}
+        self._lock = threading.Lock()
+
+    def features(self, extractor: FeatureExtractor, chunks: Sequence[dict]) -> np.ndarray:
+        """Normalized log-mel of the concatenated sample ``chunks``, shaped like ``extractor(audio)``."""
+        if not chunks:
+            raise ValueError("features need at least one chunk")
+        mel = self._mel(extractor)
+        hop = extractor.hop_length
+        starts = np.array([chunk["start"] for chunk in chunks], dtype=np.int64)
+        lengths = np.array([chunk["end"] - chunk["start"] for chunk in chunks], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        # One frame per hop of the concatenated audio (plus the padded tail, as the extractor
+        # returns), each taken from the file frame nearest to the sample it stands for.
+        positions = np.arange((int(lengths.sum()) + _EXTRACTOR_PADDING) // hop, dtype=np.int64) * hop
+        chunk_index = np.searchsorted(offsets, positions, side="right") - 1
+        samples = starts[chunk_index] + np.minimum(positions - offsets[chunk_index], lengths[chunk_index])
+        frame_index = np.clip(np.rint(samples / hop).astype(np.int64), 0, mel.num_frames - 1)
+        block_index = frame_index // BLOCK_FRAMES
+
+        log_spec = np.empty((mel.num_mels, frame_index.size), dtype=np.float32)
+        for block in np.unique(block_index).tolist():
+            selected = block_index == block
+            log_spec[:, selected] = self._block(mel, block)[:, frame_index[selected] - block * BLOCK_FRAMES]
+        if log_spec.size:
+            np.maximum(log_spec, log_spec.max() - 8.0, out=log_spec)
+        log_spec += 4.0
+        log_spec /= 4.0
+        return log_spec
+
+    def attach(self, audio: np.ndarray, chunks: list[dict]) -> np.ndarray:
+        """``audio`` (the concatenation of ``chunks``) as an array whose features come from this store."""
+        featured = audio.view(_FeaturedAudio)
+        featured.feature_source = (self, chunks)
+        return featured
+
+    def _mel(self, extractor: FeatureExtractor) -> _MelFrames:
+        key = (extractor.n_fft, extractor.hop_length, extractor.mel_filters.shape[0])
+        with self._lock:
+            mel = self._mels.get(key)
+            if mel is None:
+                mel = self._mels[key] = _MelFrames(extractor, self._audio)
+        return mel
+
+    def _block(self, mel: _MelFrames, block: int) -> np.ndarray:
+        """Frames of ``block``, computed unless still cached."""
+        with self._lock:
+            frames = mel.blocks.get(block)
+            if frames is not None:
+                mel.blocks.move_to_end(block)
+                return frames
+        frames = self._compute(mel, block)
+        with self._lock:
+            mel.blocks[block] = frames
+            mel.blocks.move_to_end(block)
+            while len(mel.blocks) > MAX_CACHED_BLOCKS:
+                mel.blocks.popitem(last=False)
+        return frames
+
+    def _compute(self, mel: _MelFrames, block: int) -> np.ndarray:
+        extractor = mel.extractor
+        n_fft, hop = extractor.n_fft, extractor.hop_length
+        f0 = block * BLOCK_FRAMES
+        f1 = min(f0 + BLOCK_FRAMES, mel.num_frames)
+        # Frame f covers samples [f * hop - n_fft // 2, f * hop + n_fft // 2) of the file plus
+        # its zero padding, reflected at both ends, exactly as the extractor's centered STFT.
+        samples = self._padded_samples(f0 * hop - n_fft // 2, (f1 - 1) * hop + n_fft // 2)
+        stft = extractor.stft(samples, n_fft, hop, window=mel.window, center=False, return_complex=True)
+        magnitudes = np.abs(stft.astype(np.complex64)) ** 2
+        mel_spec = extractor.mel_filters @ magnitudes
+        return np.log10(np.clip(mel_spec, a_min=1e-10, a_max=None)).astype(np.float32, copy=False)
+
+    def _padded_samples(self, start: int, end: int) -> np.ndarray:
+        """Samples ``[start, end)`` of the file followed by the extractor's zero padding, reflected outside it."""
+        padded_length = self._audio.shape[0] + _EXTRACTOR_PADDING
+        lo, hi = max(start, 0), min(end, padded_length)
+        piece = self._audio[lo : min(hi, self._audio.shape[0])]
+        if hi > self._audio.shape[0]:
+            piece = np.concatenate([piece, np.zeros(hi - max(lo, self._audio.shape[0]), dtype=np.float32)])
+        if lo > start or end > hi:
+            piece = np.pad(piece, (lo - start, end - hi), mode="reflect")
+        return piece
+
+
+class StoredFeatureExtractor:
+    """``FeatureExtractor`` that takes features of ``FeatureStore.attach()`` audio from its store.
+
+    Any other audio, and calls with non-default padding, go to the wrapped extractor.
+    """
+
+    def __init__(self, extractor: FeatureExtractor) -> None:
+        self.extractor = extractor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.extractor, name)
+
+    def __call__(self, waveform: np.ndarray, padding: int = _EXTRACTOR_PADDING, chunk_length: int | None = None):
+        source = getattr(waveform, "feature_source", None)
+        if source is None or padding != _EXTRACTOR_PADDING:
+            return self.extractor(waveform, padding=padding, chunk_length=chunk_length)
+        if chunk_length is not None:
+            # Same side effect as FeatureExtractor.__call__, which transcribe() relies on.
+            self.extractor.n_samples = chunk_length * self.extractor.sampling_rate
+            self.extractor.nb_max_frames = self.extractor.n_samples // self.extractor.hop_length
+        store, chunks = source
+        return store.features(self.extractor, chunks)
@@ -1,3 +1,23 @@
+"""Known Whisper hallucinations: subtitle credits and boilerplate it emits on silence.
+
+``detect_hallucinations`` matches a segment's text against ``HALLUCINATIONS`` (plus
+the deployment's pattern file, if any) after normalizing both sides, so variants in
+casing, punctuation, spacing or a trailing year (``"Untertitel im Auftrag des ZDF,
+2023"``) are caught too. The year is only ignored after at least two words: a phrase
+like ``" SWR 2021"`` must not turn into one that matches a real ``"SWR."``. The
+matcher is built once at import and its per-segment cost does not grow with the
+number of phrases.
+"""
+
+import re
+import string
+import unicodedata
+from typing import Iterable, Mapping
+
+from bentoml_faster_whisper.config import faster_whisper_config
+
+ANY_LANGUAGE = "*"
+
 HALLUCINATIONS = {
     "en": {"www.mooji.org"},
     "nl": {
@@ -84,10 +104,120 @@ HALLUCINATIONS = {
 }
 
 
-# The blacklist entries keep Whisper's leading token space, but matching happens on
-# stripped text — compare stripped-to-stripped or the padded entries never match.
-_STRIPPED_HALLUCINATIONS = {language: {text.strip() for text in texts} for language, texts in HALLUCINATIONS.items()}
+_NON_WORD = re.compile(r"[\W_]+")
+_WORD = re.compile(r"[^\W_]+")
+_EDGE_PUNCTUATION = string.punctuation + "¡¿«»‹›“”„‘’…–—"
+_TRAILING_YEAR = re.compile(r"\S+ \S+( (?:19|20)\d\d)$")
+
+
+def normalize_hallucination(text: str) -> str:
+    """Casefolded words of ``text``, without punctuation or a trailing year that follows two words or more."""
+    words = _NON_WORD.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+    year = _TRAILING_YEAR.search(words)
+    return words[: year.start(1)] if year else words
+
+
+class HallucinationMatcher:
+    """Hallucination phrases by normalized text, indexed across all languages.
+
+    ``phrases`` maps a language code (``ANY_LANGUAGE`` for every language) to its
+    phrases. A text whose first two words start no phrase is rejected without being
+    normalized, which covers nearly all real speech. Phrases that keep no words once
+    normalized (mis-encoded entries) match their exact stripped text only.
+    """
+
+    def __init__(self, phrases: Mapping[str, Iterable[str]]) -> None:
+        self._keys: dict[str, set[str]] = {}
+        self._exact: dict[str, set[str]] = {}
+        for language, texts in phrases.items():
+            for text in texts:
+                key = normalize_hallucination(text)
+                if key:
+                    self._keys.setdefault(key, set()).add(language)
+                else:
+                    self._exact.setdefault(text.strip(), set()).add(language)
+        # Prefix index: the first word of every key, and the first two of keys with more.
+        self._first_words = frozenset(key.split(" ", 1)[0] for key in self._keys)
+        self._one_word_keys = frozenset(key for key in self._keys if " " not in key)
+        self._first_two_words = frozenset(" ".join(key.split(" ", 2)[:2]) for key in self._keys if " " in key)
+
+    def __call__(self, text: str, language: str) -> bool:
+        languages = self._exact.get(text.strip()) if self._exact else None
+        if languages is None:
+            if not self._may_match(text):
+                return False
+            languages = self._keys.get(normalize_hallucination(text))
+            if languages is None:
+                return False
+        return language in languages or ANY_LANGUAGE in languages
+
+    def _may_match(self, text: str) -> bool:
+        """Whether ``text`` starts like some key, checked without normalizing all of it."""
+        tokens = text.split(maxsplit=2)
+        if not tokens:
+            return False
+        first = tokens[0].strip(_EDGE_PUNCTUATION)
+        if not first.isalnum():
+            return self._may_match_by_words(text)
+        first = _word_key(first)
+        if first not in self._first_words:
+            return False
+        if first in self._one_word_keys:
+            return True
+        if len(tokens) < 2:
+            return False
+        second = tokens[1].strip(_EDGE_PUNCTUATION)
+        if not second.isalnum():
+            return self._may_match_by_words(text)
+        return f"{first} {_word_key(second)}" in self._first_two_words
+
+    def _may_match_by_words(self, text: str) -> bool:
+        """``_may_match`` for text whose leading tokens are not plain words: split like the normalization."""
+        first = _WORD.search(text)
+        if first is None:
+            return False
+        first_word = _word_key(first.group())
+        if first_word not in self._first_words:
+            return False
+        if first_word in self._one_word_keys:
+            return True
+        second = _WORD.search(text, first.end())
+        return second is not None and f"{first_word} {_word_key(second.group())}" in self._first_two_words
+
+
+def _word_key(word: str) -> str:
+    return (word if word.isascii() else unicodedata.normalize("NFKC", word)).casefold()
+
+
+def load_hallucination_patterns(path: str) -> dict[str, set[str]]:
+    """Phrases from a pattern file: one ``<language>\\t<phrase>`` per line.
+
+    ``*`` as the language matches every language; blank lines and lines starting
+    with ``#`` are skipped.
+    """
+    phrases: dict[str, set[str]] = {}
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            language, separator, phrase = line.partition("\t")
+            if not separator or not phrase.strip():
+                raise ValueError(f"{path}:{number}: expected '<language>\\t<phrase>'")
+            phrases.setdefault(language.strip(), set()).add(phrase)
+    return phrases
+
+
+def _deployment_phrases() -> dict[str, set[str]]:
+    phrases = {language: set(texts) for language, texts in HALLUCINATIONS.items()}
+    if faster_whisper_config.hallucination_patterns_file:
+        for language, texts in load_hallucination_patterns(faster_whisper_config.hallucination_patterns_file).items():
+            phrases.setdefault(language, set()).update(texts)
+    return phrases
+
+
+_matcher = HallucinationMatcher(_deployment_phrases())
 
 
 def detect_hallucinations(text: str, language: str) -> bool:
-    return text.strip() in _STRIPPED_HALLUCINATIONS.get(language, set())
+    return _matcher(text, language)
@@ -11,15 +11,18 @@ deployment through ``LID_*`` environment variables; the function parameters
 below exist for tests and default to the config values.
 """
 
-import math
-from typing import Sequence
+from typing import Callable, Sequence
 
 import numpy as np
 from faster_whisper import WhisperModel
 from faster_whisper.audio import pad_or_trim
 
 from bentoml_faster_whisper.config import language_id_config
-from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE, pad_and_merge_intervals
+from bentoml_faster_whisper.services.replica_pool import pinned
+from bentoml_faster_whisper.utils.cancellation import CancellationToken
+from bentoml_faster_whisper.utils.encoder_cache import EncoderCache
+from bentoml_faster_whisper.utils.feature_store import FeatureStore
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE, IntervalIndex, pad_and_merge_intervals
 
 _MIN_PROB = 1e-6
 
@@ -30,6 +33,10 @@ def detect_turn_language_probs(
     turns: Sequence[tuple[float, float]],
     batch_size: int | None = None,
     min_turn_s: float | None = None,
+    cancel: CancellationToken | None = None,
+    feature_store: FeatureStore | None = None,
+    pad_s: float = 0.0,
+    encoder_cache: EncoderCache | None = None,
 ) -> list[dict[str, float] | None]:
     """Detect one full language probability distribution per turn, batched.
 
@@ -38,45 +45,214 @@ def detect_turn_language_probs(
     turn can come back as any language with high confidence); the Viterbi
     smoothing resolves them from context instead. Turns longer than one 30s
     window get the duration-weighted average over all their windows, so one
-    ambiguous stretch can't pin the whole turn alone.
+    ambiguous stretch can't pin the whole turn alone. ``cancel`` is checked
+    before every encoder batch. Models built by the model manager slice the
+    features from ``feature_store`` (one for ``decoded`` is made if not given),
+    so overlapping turns and the later decode runs share the STFT.
+
+    Detection sees each turn widened by ``pad_s`` on both sides (the minimum
+    length still applies to the turn itself). Passing the decode runs' padding
+    and an ``encoder_cache`` keeps each turn's first window encoding, which the
+    run decoding that turn alone reuses instead of encoding it again.
     """
     if batch_size is None:
         batch_size = language_id_config.batch_size
+    windows = _turn_windows(whisper, decoded, turns, min_turn_s, feature_store, pad_s)
+    return _detect_windows(whisper, windows, len(turns), batch_size, cancel, encoder_cache)
+
+
+def sample_turn_language_probs(
+    whisper: WhisperModel,
+    decoded: np.ndarray,
+    turns: Sequence[tuple[float, float]],
+    candidates: Sequence[str] | None = None,
+    max_windows: int | None = None,
+    stable_batches: int | None = None,
+    batch_size: int | None = None,
+    min_turn_s: float | None = None,
+    cancel: CancellationToken | None = None,
+    feature_store: FeatureStore | None = None,
+    pad_s: float = 0.0,
+    encoder_cache: EncoderCache | None = None,
+) -> list[dict[str, float] | None]:
+    """Budgeted ``detect_turn_language_probs``: at most ``max_windows`` encoder windows per file.
+
+    Windows are encoded longest turn first, so the budget goes to the turns that
+    carry the most speech and the most reliable detections. After every batch the
+    inventory and the Viterbi decisions are resolved over all turns; once they
+    come out the same ``stable_batches`` batches in a row, detection stops. Turns
+    left undetected (and turns shorter than ``min_turn_s``: there is no second
+    pass) return ``None`` and follow their context in the smoothing.
+    """
+    if max_windows is None:
+        max_windows = language_id_config.max_windows
+    if stable_batches is None:
+        stable_batches = language_id_config.stable_batches
+    if batch_size is None:
+        batch_size = language_id_config.batch_size
+    windows = _turn_windows(whisper, decoded, turns, min_turn_s, feature_store, pad_s)
+    durations = [end - start for start, end in turns]
+    # sorted() is stable: a turn's windows stay together and in order, ties keep file order.
+    windows = sorted(windows, key=lambda window: -durations[window[0]])
+    if max_windows:
+        windows = windows[:max_windows]
+
+    previous: tuple[set[str], list[str]] | None = None
+    unchanged = 0
+
+    def stable(rows: list[dict[str, float] | None]) -> bool:
+        nonlocal previous, unchanged
+        inventory = resolve_language_inventory(rows, durations, candidates)
+        # The inventory's order follows the mass and may shift without changing any decision.
+        decisions = (set(inventory), viterbi_smooth_languages(rows, durations, inventory))
+        unchanged = unchanged + 1 if decisions == previous else 0
+        previous = decisions
+        return unchanged >= stable_batches
+
+    return _detect_windows(whisper, windows, len(turns), batch_size, cancel, encoder_cache, stable)
+
+
+def detect_dominant_language(
+    whisper: WhisperModel,
+    decoded: np.ndarray,
+    turns: Sequence[tuple[float, float]],
+    candidates: Sequence[str] | None = None,
+    num_windows: int | None = None,
+    threshold: float | None = None,
+    min_turn_s: float | None = None,
+    cancel: CancellationToken | None = None,
+    feature_store: FeatureStore | None = None,
+    pad_s: float = 0.0,
+    encoder_cache: EncoderCache | None = None,
+) -> str | None:
+    """The file's only language if a few sampled turns agree on it, else ``None``.
+
+    Encodes the first window of ``num_windows`` turns spread evenly over the
+    speech (one turn at each quantile of the cumulative turn duration, turns
+    shorter than ``min_turn_s`` excluded) in one batch. A language is returned
+    when its duration-weighted mean probability over the sample reaches
+    ``threshold`` (and it is one of ``candidates``, if given); a mixed or
+    uncertain sample returns ``None`` and the caller runs per-turn detection.
+    """
+    if num_windows is None:
+        num_windows = language_id_config.precheck_windows
+    if threshold is None:
+        threshold = language_id_config.precheck_threshold
+    if min_turn_s is None:
+        min_turn_s = language_id_config.min_turn_s
+    eligible = [turn for turn in turns if turn[1] - turn[0] >= min_turn_s]
+    if not eligible or num_windows <= 0:
+        return None
+
+    cumulative = np.cumsum([end - start for start, end in eligible])
+    quantiles = (np.arange(num_windows) + 0.5) / num_windows * cumulative[-1]
+    picked = sorted(set(np.searchsorted(cumulative, quantiles).tolist()))
+    sample = [eligible[i] for i in picked]
+    windows = [
+        window for window in _turn_windows(whisper, decoded, sample, min_turn_s, feature_store, pad_s) if window[3] == 0
+    ]
+    rows = _detect_windows(whisper, windows, len(sample), max(len(windows), 1), cancel, encoder_cache)
+
+    mass: dict[str, float] = {}
+    total = 0.0
+    for (start_s, end_s), row in zip(sample, rows):
+        if row is None:
+            continue
+        weight = min(end_s - start_s, 30.0)
+        for language, prob in row.items():
+            mass[language] = mass.get(language, 0.0) + weight * prob
+        total += weight
+    if not mass:
+        return None
+    language = max(mass, key=lambda name: mass[name])
+    if mass[language] < threshold * total or (candidates and language not in candidates):
+        return None
+    return language
+
+
+# (turn index, evidence weight in seconds, one padded 30s mel window, window offset)
+_Window = tuple[int, float, np.ndarray, int]
+
+
+def _turn_windows(
+    whisper: WhisperModel,
+    decoded: np.ndarray,
+    turns: Sequence[tuple[float, float]],
+    min_turn_s: float | None,
+    feature_store: FeatureStore | None,
+    pad_s: float,
+) -> list[_Window]:
     if min_turn_s is None:
         min_turn_s = language_id_config.min_turn_s
     extractor = whisper.feature_extractor
     frames_per_second = extractor.nb_max_frames / 30.0
     min_frames = int(min_turn_s * frames_per_second)
+    if feature_store is None:
+        feature_store = FeatureStore(decoded)
 
-    # (turn index, evidence weight in seconds, one padded 30s mel window)
-    windows: list[tuple[int, float, np.ndarray]] = []
+    windows: list[_Window] = []
     for idx, (start_s, end_s) in enumerate(turns):
-        chunk = decoded[int(start_s * WHISPER_SAMPLE_RATE) : int(end_s * WHISPER_SAMPLE_RATE)]
-        if chunk.shape[0] < int(min_turn_s * WHISPER_SAMPLE_RATE):
+        start = min(int(start_s * WHISPER_SAMPLE_RATE), decoded.shape[0])
+        end = min(int(end_s * WHISPER_SAMPLE_RATE), decoded.shape[0])
+        if end - start < int(min_turn_s * WHISPER_SAMPLE_RATE):
             continue
-        features = extractor(chunk)
+        if pad_s:
+            start = min(int(max(start_s - pad_s, 0.0) * WHISPER_SAMPLE_RATE), decoded.shape[0])
+            end = min(int((end_s + pad_s) * WHISPER_SAMPLE_RATE), decoded.shape[0])
+        features = extractor(feature_store.attach(decoded[start:end], [{"start": start, "end": end}]))
+        # The last frame only covers the extractor's zero padding; transcribe() skips it too.
+        features = features[..., : max(features.shape[-1] - 1, 1)]
         for offset in range(0, features.shape[-1], extractor.nb_max_frames):
             window = features[..., offset : offset + extractor.nb_max_frames]
             if offset > 0 and window.shape[-1] < min_frames:
                 break  # tail too short to detect on; the earlier windows carry the turn
-            windows.append((idx, window.shape[-1] / frames_per_second, pad_or_trim(window)))
+            windows.append((idx, window.shape[-1] / frames_per_second, pad_or_trim(window), offset))
+    return windows
+
 
+def _detect_windows(
+    whisper: WhisperModel,
+    windows: Sequence[_Window],
+    num_turns: int,
+    batch_size: int,
+    cancel: CancellationToken | None,
+    encoder_cache: EncoderCache | None,
+    stop: Callable[[list[dict[str, float] | None]], bool] | None = None,
+) -> list[dict[str, float] | None]:
+    """Encode ``windows`` in batches and average each turn's distributions; ``stop`` may end early."""
     mass: dict[int, dict[str, float]] = {}
     total_weight: dict[int, float] = {}
+
+    def rows() -> list[dict[str, float] | None]:
+        turn_rows: list[dict[str, float] | None] = [None] * num_turns
+        for idx, turn_mass in mass.items():
+            turn_rows[idx] = {language: value / total_weight[idx] for language, value in turn_mass.items()}
+        return turn_rows
+
     for batch_start in range(0, len(windows), batch_size):
+        if cancel is not None:
+            cancel.check()
         batch = windows[batch_start : batch_start + batch_size]
-        encoder_output = whisper.encode(np.stack([window for _, _, window in batch]))
-        for (idx, weight, _), results in zip(batch, whisper.model.detect_language(encoder_output)):
+        # The encoder output lives on the device of the instance that computed it.
+        with pinned(whisper) as model:
+            encoder_output = model.encode(np.stack([window for _, _, window, _ in batch]))
+            if encoder_cache is not None:
+                # Decoding seeks past the first window by what it decoded, so only that one lines up.
+                encoder_cache.store(
+                    getattr(model, "encoder_cache_key", None),
+                    [window if offset == 0 else None for _, _, window, offset in batch],
+                    encoder_output,
+                )
+            detected = model.model.detect_language(encoder_output)
+        for (idx, weight, _, _), results in zip(batch, detected):
             turn_mass = mass.setdefault(idx, {})
             for token, prob in results:
                 language = token[2:-2]  # "<|de|>" -> "de"
                 turn_mass[language] = turn_mass.get(language, 0.0) + weight * prob
             total_weight[idx] = total_weight.get(idx, 0.0) + weight
-
-    rows: list[dict[str, float] | None] = [None] * len(turns)
-    for idx, turn_mass in mass.items():
-        rows[idx] = {language: value / total_weight[idx] for language, value in turn_mass.items()}
-    return rows
+        if stop is not None and stop(rows()):
+            break
+    return rows()
 
 
 def fill_missing_rows_from_intervals(
@@ -86,6 +262,8 @@ def fill_missing_rows_from_intervals(
     rows: Sequence[dict[str, float] | None],
     batch_size: int | None = None,
     min_turn_s: float | None = None,
+    cancel: CancellationToken | None = None,
+    feature_store: FeatureStore | None = None,
 ) -> list[dict[str, float] | None]:
     """Second detection pass for turns too short to detect on alone: pad/merge
     all turns into speech intervals — several short turns in quick succession
@@ -99,17 +277,13 @@ def fill_missing_rows_from_intervals(
         return filled
 
     intervals = pad_and_merge_intervals(turns)
-
-    def covering_interval(turn: tuple[float, float]) -> int | None:
-        midpoint = (turn[0] + turn[1]) / 2
-        for i, (start_s, end_s) in enumerate(intervals):
-            if start_s <= midpoint <= end_s:
-                return i
-        return None
-
-    turn_to_interval = {idx: covering_interval(turns[idx]) for idx in missing}
+    midpoints = np.array([(turns[idx][0] + turns[idx][1]) / 2 for idx in missing], dtype=np.float64)
+    covering = IntervalIndex(intervals).find_many(midpoints).tolist()
+    turn_to_interval = {idx: None if i < 0 else i for idx, i in zip(missing, covering)}
     needed = sorted({i for i in turn_to_interval.values() if i is not None})
-    interval_rows = detect_turn_language_probs(whisper, decoded, [intervals[i] for i in needed], batch_size, min_turn_s)
+    interval_rows = detect_turn_language_probs(
+        whisper, decoded, [intervals[i] for i in needed], batch_size, min_turn_s, cancel, feature_store
+    )
     row_by_interval = dict(zip(needed, interval_rows))
 
     for idx in missing:
@@ -189,25 +363,35 @@ def viterbi_smooth_languages(
     if evidence_cap_s is None:
         evidence_cap_s = language_id_config.evidence_cap_s
 
-    emissions: list[list[float]] = []
-    for row, duration in zip(prob_rows, durations, strict=True):
-        if row is None:
-            emissions.append([0.0] * len(inventory))
-            continue
-        probs = [max(row.get(language, 0.0), _MIN_PROB) for language in inventory]
-        norm = sum(probs)
-        weight = min(duration, evidence_cap_s)
-        emissions.append([weight * math.log(prob / norm) for prob in probs])
+    if len(durations) != len(prob_rows):
+        raise ValueError("prob_rows and durations must have the same length")
+
+    # Emissions in log space, one row per turn: detected probabilities renormalized over the
+    # inventory and weighted by the capped duration; undetected turns emit uniformly (zeros).
+    uniform = [0.0] * len(inventory)
+    probs = np.array(
+        [uniform if row is None else [row.get(language, 0.0) for language in inventory] for row in prob_rows]
+    )
+    np.maximum(probs, _MIN_PROB, out=probs)
+    norm = probs[:, 0].copy()
+    for k in range(1, len(inventory)):
+        norm += probs[:, k]  # column by column: same summation order as sum() over a row
+    weights = np.minimum(np.asarray(durations, dtype=np.float64), evidence_cap_s)
+    detected = np.fromiter((row is not None for row in prob_rows), dtype=bool, count=len(prob_rows))
+    emissions = np.where(detected[:, None], weights[:, None] * np.log(probs / norm[:, None]), 0.0).tolist()
 
+    # Staying costs nothing and switching costs switch_penalty from any language, so the only
+    # switch worth taking is from the best-scoring one. The recurrence is sequential and runs on
+    # plain floats: per-step NumPy calls over a handful of languages cost more than the arithmetic.
+    languages = range(len(inventory))
     scores = emissions[0]
     backpointers: list[list[int]] = []
     for emission in emissions[1:]:
-        best_idx = max(range(len(inventory)), key=lambda i: scores[i])
+        best_idx = max(languages, key=scores.__getitem__)  # first maximum wins ties
+        switch = scores[best_idx] - switch_penalty
         step_pointers = []
         step_scores = []
-        for j, e in enumerate(emission):
-            stay = scores[j]
-            switch = scores[best_idx] - switch_penalty
+        for j, (stay, e) in enumerate(zip(scores, emission)):
             if best_idx != j and switch > stay:
                 step_pointers.append(best_idx)
                 step_scores.append(switch + e)
@@ -217,7 +401,7 @@ def viterbi_smooth_languages(
         backpointers.append(step_pointers)
         scores = step_scores
 
-    idx = max(range(len(inventory)), key=lambda i: scores[i])
+    idx = max(languages, key=scores.__getitem__)
     path = [idx]
     for step_pointers in reversed(backpointers):
         idx = step_pointers[path[-1]]
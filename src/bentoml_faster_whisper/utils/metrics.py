@@ -47,8 +47,12 @@ REALTIME_FACTOR_BUCKETS = [
     float("inf"),
 ]
 SPEAKER_COUNT_BUCKETS = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0, float("inf")]
+STREAM_FIRST_CHUNK_BUCKETS_S = [0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, float("inf")]
+COMPRESSION_RATIO_BUCKETS = [1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 12.0, 16.0, 24.0, float("inf")]
+COMPRESSION_DURATION_BUCKETS_S = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, float("inf")]
 DIARIZATION_DURATION_BUCKETS_S = [0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, float("inf")]
 MODEL_LOAD_DURATION_BUCKETS_S = [0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, float("inf")]
+DECODE_FALLBACK_BUCKETS = [0.0, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, float("inf")]
 
 
 @functools.lru_cache(maxsize=1)
@@ -148,6 +152,214 @@ def model_loads_total():
     )
 
 
+@functools.lru_cache(maxsize=1)
+def model_swaps():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="model_swaps",
+        documentation="Hot-swaps of the default Whisper model, by outcome",
+        labelnames=["outcome"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def model_swap_duration():
+    from prometheus_client import Histogram
+
+    return Histogram(
+        name="model_swap_duration_seconds",
+        documentation="Wall-clock time from starting a model hot-swap to serving the new model (load + warm-up)",
+        buckets=MODEL_LOAD_DURATION_BUCKETS_S,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def decode_fallbacks():
+    from prometheus_client import Histogram
+
+    return Histogram(
+        name="decode_temperature_fallbacks",
+        documentation="Temperature fallbacks (window re-decodes) taken per transcription request",
+        buckets=DECODE_FALLBACK_BUCKETS,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def degraded_decode_runs():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="degraded_decode_runs",
+        documentation="Decode runs whose fallback/beam settings were cut back by the request's decode budget",
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def cascade_draft_seconds():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="cascade_draft_audio_seconds",
+        documentation="Audio seconds decoded by the cascade draft model",
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def cascade_redecoded_seconds():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="cascade_redecoded_audio_seconds",
+        documentation="Audio seconds of low-confidence draft output re-decoded by the served model",
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def replica_inflight():
+    from prometheus_client import Gauge
+
+    return Gauge(
+        name="whisper_replica_inflight",
+        documentation="Decodes currently dispatched to a Whisper model replica",
+        labelnames=["replica"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def replica_busy_seconds():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="whisper_replica_busy_seconds",
+        documentation="Wall-clock seconds a Whisper model replica spent holding dispatched decodes",
+        labelnames=["replica"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def word_aligned_segments():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="diarized_segments_word_alignment",
+        documentation="Segments of diarized requests by whether word timings were aligned for speaker attribution",
+        labelnames=["outcome"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def cancelled_work_seconds():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="cancelled_work_seconds",
+        documentation="Seconds requests spent on diarization / decode before being abandoned, by stage reached",
+        labelnames=["stage"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def deadline_exceeded():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="deadline_exceeded_requests",
+        documentation="Requests that ran past their deadline, by whether they failed or returned partial results",
+        labelnames=["outcome"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def encoder_cache_lookups():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="encoder_cache_lookups",
+        documentation="Decode-run encoder passes answered from language ID's encoder outputs (hit) or computed (miss)",
+        labelnames=["outcome"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def language_precheck():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="language_precheck_requests",
+        documentation="Multi-language requests by whether the sampled pre-check found a single language",
+        labelnames=["outcome"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def repetition_loops():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="repetition_loops",
+        documentation="Decode repetition loops cut short, by how they were recognised",
+        labelnames=["reason"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def repetition_skipped_seconds():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="repetition_skipped_audio_seconds",
+        documentation="Seconds of audio skipped after a decode repetition loop",
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def stream_first_chunk_seconds():
+    from prometheus_client import Histogram
+
+    return Histogram(
+        name="stream_first_chunk_seconds",
+        documentation="Time from a streaming request to its first segment chunk (time to first byte)",
+        labelnames=["format"],
+        buckets=STREAM_FIRST_CHUNK_BUCKETS_S,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def stream_chunks():
+    from prometheus_client import Counter
+
+    return Counter(
+        name="stream_chunks",
+        documentation="Chunks written by streaming requests, by stream format and kind (segments / heartbeat)",
+        labelnames=["format", "kind"],
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def response_compression_ratio():
+    from prometheus_client import Histogram
+
+    return Histogram(
+        name="response_compression_ratio",
+        documentation="Uncompressed over compressed size of compressed response bodies, by content coding",
+        labelnames=["encoding"],
+        buckets=COMPRESSION_RATIO_BUCKETS,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def response_compression_seconds():
+    from prometheus_client import Histogram
+
+    return Histogram(
+        name="response_compression_seconds",
+        documentation="Time spent compressing one response body, by content coding",
+        labelnames=["encoding"],
+        buckets=COMPRESSION_DURATION_BUCKETS_S,
+    )
+
+
 def record_failure(stage: str, exc: BaseException) -> None:
     """Record transcription failure counter labeled by stage and exception type."""
     transcription_failures().labels(stage, type(exc).__name__).inc()
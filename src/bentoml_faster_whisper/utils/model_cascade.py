@@ -0,0 +1,142 @@
+"""Two-tier decoding: a fast draft model first, the served model only where it is unsure.
+
+Most audio is clean speech that a small model transcribes as well as ``large-v2``.
+``CascadeWhisper`` decodes every ``transcribe()`` call with the draft model and
+re-decodes only runs of draft segments that fail the ``CascadeConfig`` confidence
+checks (low ``avg_logprob``, high ``compression_ratio`` or high ``no_speech_prob``)
+with the served model, splicing the result back in by timestamp. Each re-decoded
+span is widened by ``context_s`` on both sides for acoustic context, but never past
+the neighbouring kept draft segments, so no speech is transcribed twice.
+
+The wrapper is a drop-in for ``WhisperModel``: language detection, the encoder and
+every other attribute delegate to the served model, and translation bypasses the
+draft (small/distil models translate poorly or not at all). Output segments are
+plain faster-whisper ``Segment`` objects, so the response schema is unchanged.
+"""
+
+import dataclasses
+import itertools
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+from faster_whisper import WhisperModel
+from faster_whisper.transcribe import Segment as FWSegment
+from faster_whisper.transcribe import TranscriptionInfo
+
+from bentoml_faster_whisper.config import CascadeConfig
+from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+
+_FRAMES_PER_SECOND = 100  # Whisper mel hop: 160 samples at 16 kHz
+
+
+def needs_redecode(segment: FWSegment, config: CascadeConfig) -> bool:
+    """True when a draft segment is not confident enough to keep."""
+    return (
+        segment.avg_logprob < config.min_avg_logprob
+        or segment.compression_ratio > config.max_compression_ratio
+        or segment.no_speech_prob > config.max_no_speech_prob
+    )
+
+
+class CascadeWhisper:
+    """``WhisperModel`` stand-in that decodes with ``draft`` and re-decodes weak spans with ``large``."""
+
+    def __init__(self, draft: WhisperModel, large: WhisperModel, config: CascadeConfig) -> None:
+        self.draft = draft
+        self.large = large
+        self.config = config
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.large, name)
+
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        language: str | None = None,
+        task: str = "transcribe",
+        **options: Any,
+    ) -> tuple[Iterator[FWSegment], TranscriptionInfo]:
+        if task != "transcribe":
+            return self.large.transcribe(audio, language=language, task=task, **options)
+
+        detected = None
+        if language is None:
+            # Small models identify languages (dialects especially) far less reliably.
+            language, probability, all_probs = self.large.detect_language(
+                audio=audio,
+                vad_filter=options.get("vad_filter", False),
+                vad_parameters=options.get("vad_parameters"),
+            )
+            detected = (probability, all_probs)
+
+        draft_segments, info = self.draft.transcribe(audio, language=language, **options)
+        if detected is not None:
+            info = dataclasses.replace(info, language_probability=detected[0], all_language_probs=detected[1])
+        metrics.cascade_draft_seconds().inc(info.duration)
+        return self._splice(audio, draft_segments, info.language, options), info
+
+    def _splice(
+        self,
+        audio: np.ndarray,
+        draft_segments: Iterable[FWSegment],
+        language: str,
+        options: dict[str, Any],
+    ) -> Iterator[FWSegment]:
+        """Yield draft segments, replacing each run of weak ones with a re-decode of its span.
+
+        Lazy like ``transcribe()``: a weak run is re-decoded as soon as the next kept
+        segment (or the end of the audio) bounds it.
+        """
+        ids = itertools.count()
+        pending: list[FWSegment] = []
+        kept_end_s = 0.0
+        for segment in draft_segments:
+            if needs_redecode(segment, self.config):
+                pending.append(segment)
+                continue
+            if pending:
+                for redecoded in self._redecode(audio, pending, kept_end_s, segment.start, language, options):
+                    yield dataclasses.replace(redecoded, id=next(ids))
+                pending = []
+            yield dataclasses.replace(segment, id=next(ids))
+            kept_end_s = segment.end
+        if pending:
+            upper_s = audio.shape[0] / WHISPER_SAMPLE_RATE
+            for redecoded in self._redecode(audio, pending, kept_end_s, upper_s, language, options):
+                yield dataclasses.replace(redecoded, id=next(ids))
+
+    def _redecode(
+        self,
+        audio: np.ndarray,
+        weak: list[FWSegment],
+        lower_s: float,
+        upper_s: float,
+        language: str,
+        options: dict[str, Any],
+    ) -> Iterator[FWSegment]:
+        start_s = max(lower_s, weak[0].start - self.config.context_s)
+        end_s = min(upper_s, weak[-1].end + self.config.context_s)
+        if end_s <= start_s:
+            yield from weak
+            return
+
+        span = audio[int(start_s * WHISPER_SAMPLE_RATE) : int(end_s * WHISPER_SAMPLE_RATE)]
+        metrics.cascade_redecoded_seconds().inc(end_s - start_s)
+        segments, _ = self.large.transcribe(span, language=language, **options)
+        for segment in segments:
+            yield shift_segment(segment, start_s)
+
+
+def shift_segment(segment: FWSegment, offset_s: float) -> FWSegment:
+    """Move a segment decoded from a span slice back onto the timeline of the full audio."""
+    words = segment.words
+    if words:
+        words = [dataclasses.replace(w, start=w.start + offset_s, end=w.end + offset_s) for w in words]
+    return dataclasses.replace(
+        segment,
+        seek=segment.seek + round(offset_s * _FRAMES_PER_SECOND),
+        start=segment.start + offset_s,
+        end=segment.end + offset_s,
+        words=words,
+    )
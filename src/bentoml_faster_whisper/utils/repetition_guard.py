@@ -0,0 +1,196 @@
+"""Online detection of decode repetition loops.
+
+On music, noise or long silence Whisper can fall into a loop: one phrase decoded over
+and over, segment after segment, often with timestamps that barely advance.
+faster-whisper only notices through ``compression_ratio_threshold``, which re-decodes
+the window at every fallback temperature and, when all of them loop, keeps the loop
+and moves its seek just past it, so the next window over the same audio loops again.
+
+``guard_repetitions`` watches a ``transcribe()`` call's segments as they arrive. Once
+a loop is recognised it drops the looping segments, closes that segment generator (no
+further window of it is decoded) and restarts decoding a stride past the loop. The
+stride starts at ``skip_s`` and doubles while restarts keep landing in loops, up to
+one 30 s window, so a long passage of music costs a few windows rather than many
+fallback decodes each. After ``max_restarts`` restarts within one passage (restarts
+that pass on nothing but loops) the guard stops cutting and passes that passage on as
+faster-whisper decodes it; it cuts again once speech follows. A loop is either
+
+* a tail of tokens made of one period (at most ``max_period_tokens`` long) repeated
+  at least ``min_repeats`` times over ``min_span_tokens`` tokens, within a segment or
+  across consecutive segments; or
+* a segment of at least ``min_rate_duration_s`` with at least ``min_rate_tokens``
+  tokens and more than ``max_tokens_per_s`` of them per second of audio, a rate speech
+  does not reach. Shorter segments carry too coarse timestamps to judge.
+
+Segments extending a repetition in progress are held back until it either breaks
+(they are passed on unchanged) or becomes a loop (they are dropped), so speech that
+repeats nothing streams without delay. ctranslate2 generates a window in one call, so
+the earliest a loop can be cut is the end of the window that shows it.
+"""
+
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+from faster_whisper import WhisperModel
+from faster_whisper.transcribe import Segment as FWSegment
+from faster_whisper.transcribe import TranscriptionInfo
+
+from bentoml_faster_whisper.config import RepetitionConfig, repetition_config
+from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.model_cascade import shift_segment
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+
+_MAX_STRIDE_S = 30.0  # one Whisper window
+
+
+def _tail_repetition(tokens: Sequence[int], max_period: int) -> tuple[int, int]:
+    """``(period, span)`` of the periodic run ``tokens`` ends with, ``(0, 0)`` if there is none.
+
+    ``span`` counts the tokens the run covers, at least two periods. The period
+    covering the most tokens wins, the shortest one on ties.
+    """
+    n = len(tokens)
+    best = (0, 0)
+    for period in range(1, min(max_period, n // 2) + 1):
+        matched = 0
+        while matched < n - period and tokens[n - 1 - matched] == tokens[n - 1 - matched - period]:
+            matched += 1
+        if matched >= period and matched + period > best[1]:
+            best = (period, matched + period)
+    return best
+
+
+class RepetitionDetector:
+    """Token history of one decode, checked for a loop after every segment."""
+
+    def __init__(self, config: RepetitionConfig) -> None:
+        self.config = config
+        self._tokens: list[int] = []
+        # Long enough to hold the longest span that is still not a loop, twice.
+        self._history = 2 * max(
+            config.min_repeats * config.max_period_tokens, config.min_span_tokens + config.max_period_tokens
+        )
+
+    def reset(self) -> None:
+        self._tokens.clear()
+
+    def observe(self, segment: FWSegment) -> tuple[str | None, bool]:
+        """Add ``segment``; return the reason it completes a loop (or ``None``) and
+        whether it only repeats tokens seen before it."""
+        config = self.config
+        tokens = segment.tokens
+        duration = segment.end - segment.start
+        if (
+            duration >= config.min_rate_duration_s
+            and len(tokens) >= config.min_rate_tokens
+            and len(tokens) > config.max_tokens_per_s * duration
+        ):
+            return "token_rate", True
+
+        self._tokens.extend(tokens)
+        del self._tokens[: -self._history]
+        period, span = _tail_repetition(self._tokens, config.max_period_tokens)
+        if period and span // period >= config.min_repeats and span >= config.min_span_tokens:
+            return "ngram", True
+        return None, period > 0 and span >= len(tokens) + period
+
+
+def guard_repetitions(
+    segments: Iterable[FWSegment],
+    restart: Callable[[float], Iterable[FWSegment]],
+    duration_s: float,
+    config: RepetitionConfig | None = None,
+) -> Iterator[FWSegment]:
+    """Pass one decode's ``segments`` through, cutting repetition loops short.
+
+    ``restart(offset_s)`` decodes the audio from ``offset_s`` on (``duration_s`` long
+    in all), with timestamps relative to ``offset_s``. After ``max_restarts`` restarts
+    in one passage, its loops are passed on until a segment repeats nothing again.
+    """
+    if config is None:
+        config = repetition_config
+    detector = RepetitionDetector(config)
+    offset_s = 0.0
+    stride_s = config.skip_s
+    restarts = 0  # in the current passage of loops
+    exhausted = False
+    while True:
+        held: list[FWSegment] = []
+        loop: tuple[str, FWSegment, FWSegment] | None = None
+        passed = 0
+        try:
+            for segment in segments:
+                if offset_s:
+                    segment = shift_segment(segment, offset_s)
+                reason, repeating = detector.observe(segment)
+                if exhausted:
+                    if reason is None and not repeating:
+                        exhausted, restarts = False, 0
+                    yield segment
+                    continue
+                if reason is not None and restarts >= config.max_restarts:
+                    # Out of restarts for this passage: decode through it as faster-whisper would.
+                    exhausted = True
+                    yield from held
+                    held.clear()
+                    yield segment
+                    continue
+                if reason is not None:
+                    loop = (reason, held[0] if held else segment, segment)
+                    break
+                if repeating:
+                    held.append(segment)
+                    continue
+                yield from held
+                held.clear()
+                passed += 1
+                if passed > 1:
+                    # Passing on more than the loop's first occurrence ends the passage.
+                    restarts = 0
+                yield segment
+        finally:
+            close = getattr(segments, "close", None)
+            if close is not None:
+                close()
+
+        if loop is None:
+            yield from held
+            return
+
+        reason, first, last = loop
+        metrics.repetition_loops().labels(reason).inc()
+        stride_s = min(2 * stride_s, _MAX_STRIDE_S) if restarts else config.skip_s
+        resume_s = max(last.end, offset_s) + stride_s
+        if resume_s >= duration_s:
+            metrics.repetition_skipped_seconds().inc(max(0.0, duration_s - first.start))
+            return
+        metrics.repetition_skipped_seconds().inc(resume_s - min(first.start, resume_s))
+        restarts += 1
+        offset_s = resume_s
+        detector.reset()
+        segments = restart(resume_s)
+
+
+def transcribe_guarded(
+    whisper: WhisperModel,
+    audio: np.ndarray,
+    config: RepetitionConfig | None = None,
+    **options: Any,
+) -> tuple[Iterable[FWSegment], TranscriptionInfo]:
+    """``whisper.transcribe(audio, **options)`` with repetition loops cut short.
+
+    Restarts decode the rest of ``audio`` with the same options, in the language of
+    the first decode, and without the loop as their prompt.
+    """
+    if config is None:
+        config = repetition_config
+    segments, info = whisper.transcribe(audio, **options)
+    if not config.enabled:
+        return segments, info
+
+    def restart(offset_s: float) -> Iterable[FWSegment]:
+        restart_options = {**options, "language": options.get("language") or info.language}
+        restarted, _ = whisper.transcribe(audio[int(offset_s * WHISPER_SAMPLE_RATE) :], **restart_options)
+        return restarted
+
+    return guard_repetitions(segments, restart, audio.shape[0] / WHISPER_SAMPLE_RATE, config), info
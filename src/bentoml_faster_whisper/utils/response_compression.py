@@ -0,0 +1,146 @@
+"""Negotiated compression of transcript responses.
+
+``verbose_json`` with word timestamps and token lists runs to tens of MB for long audio
+and compresses several times over. ``CompressionMiddleware`` gzips the bodies of the
+``/v1/audio/`` endpoints when the request's ``Accept-Encoding`` allows it.
+
+* A body sent in one piece is compressed when it is at least ``min_bytes`` long.
+* A body sent in pieces (the streaming endpoint, transcripts written as they are
+  decoded) is compressed as it goes. Each piece is flushed, so the client can decode
+  everything it has received.
+* A body or piece of at least ``offload_bytes`` is compressed on a worker thread, so
+  compressing a long transcript does not stall the event loop.
+
+Responses that already carry a ``Content-Encoding`` pass through unchanged.
+"""
+
+import time
+import zlib
+from typing import Any, Awaitable, Callable
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+from bentoml_faster_whisper.config import CompressionConfig, compression_config
+from bentoml_faster_whisper.utils import metrics
+
+_PATH_PREFIX = "/v1/audio/"
+_ENCODINGS = ("gzip",)
+
+Message = dict[str, Any]
+Send = Callable[[Message], Awaitable[None]]
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, last: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """The coding of ``available`` with the highest ``q`` in ``accept_encoding``, earlier
+    ones winning ties; ``None`` if the client accepts none of them."""
+    weights: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        key, _, value = params.strip().partition("=")
+        if key.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing transcript response bodies; see the module docstring."""
+
+    def __init__(self, app: Callable[..., Awaitable[None]], config: CompressionConfig | None = None) -> None:
+        self.app = app
+        self.config = config if config is not None else compression_config
+
+    async def __call__(self, scope: Message, receive: Callable[[], Awaitable[Message]], send: Send) -> None:
+        if scope["type"] != "http" or not self.config.enabled or not scope["path"].startswith(_PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), _ENCODINGS)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.config))
+
+
+class _CompressingSender:
+    """The ``send`` of one response, compressing its body on the way out."""
+
+    def __init__(self, send: Send, encoding: str, config: CompressionConfig) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._config = config
+        self._start: Message | None = None
+        self._compressor: _GzipCompressor | None = None
+        self._passthrough = False
+        self._raw_bytes = 0
+        self._compressed_bytes = 0
+        self._compress_s = 0.0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(scope=start)
+            if "content-encoding" in headers or (not more_body and len(body) < self._config.min_bytes):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            headers["content-encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+            self._compressor = _GzipCompressor(self._config.gzip_level)
+            body = await self._compress(body, last=not more_body)
+            if more_body:
+                del headers["content-length"]
+            else:
+                headers["content-length"] = str(len(body))
+            await self._send(start)
+        else:
+            body = await self._compress(body, last=not more_body)
+
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+        if not more_body and self._compressed_bytes:
+            metrics.response_compression_ratio().labels(self._encoding).observe(
+                self._raw_bytes / self._compressed_bytes
+            )
+            metrics.response_compression_seconds().labels(self._encoding).observe(self._compress_s)
+
+    async def _compress(self, data: bytes, last: bool) -> bytes:
+        assert self._compressor is not None
+        t0 = time.perf_counter()
+        if len(data) >= self._config.offload_bytes:
+            compressed = await anyio.to_thread.run_sync(self._compressor.compress, data, last)
+        else:
+            compressed = self._compressor.compress(data, last)
+        self._compress_s += time.perf_counter() - t0
+        self._raw_bytes += len(data)
+        self._compressed_bytes += len(compressed)
+        return compressed
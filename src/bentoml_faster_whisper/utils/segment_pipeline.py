@@ -0,0 +1,102 @@
+"""Single-pass post-processing of a request's segments.
+
+Decoded segments used to flow through a chain of generators (speaker merge, word
+stripping, cleaning), each with its own per-item overhead and id renumbering. A
+``SegmentPipeline`` runs every enabled stage on one segment before pulling the next
+and numbers the segments it returns once, at the end.
+
+Stages are grouped by what they cost:
+
+* filters decide whether a segment is kept and run first, so a rejected segment
+  (silence, a known hallucination) never reaches the speaker merge;
+* splitters may turn a segment into several pieces (the speaker merge); pieces of a
+  split go through the filters again, since a verdict on the whole segment says
+  nothing about its parts;
+* finishers edit a kept segment in place (text normalization, dropping word
+  timings) and run last, on exactly the segments that are returned.
+
+Within a group, stages run in the order they were added.
+"""
+
+from typing import Callable, Iterable, Iterator
+
+from bentoml_faster_whisper.utils.core import Segment
+
+SegmentFilter = Callable[[Segment], bool]
+SegmentSplitter = Callable[[Segment], Iterable[Segment]]
+SegmentFinisher = Callable[[Segment], None]
+
+
+class SegmentPipeline:
+    """Filters, splitters and finishers applied to each segment in one pass."""
+
+    def __init__(self) -> None:
+        self.filters: list[SegmentFilter] = []
+        self.splitters: list[SegmentSplitter] = []
+        self.finishers: list[SegmentFinisher] = []
+        self.started = False
+
+    def add(
+        self,
+        filters: Iterable[SegmentFilter] = (),
+        splitters: Iterable[SegmentSplitter] = (),
+        finishers: Iterable[SegmentFinisher] = (),
+    ) -> None:
+        if self.started:
+            raise RuntimeError("cannot add stages to a segment pipeline that is already running")
+        self.filters.extend(filters)
+        self.splitters.extend(splitters)
+        self.finishers.extend(finishers)
+
+    def __call__(self, segments: Iterable[Segment]) -> Iterator[Segment]:
+        """Yield the processed ``segments``, numbered from 0."""
+        self.started = True
+        next_id = 0
+        for segment in segments:
+            for piece in self._process(segment):
+                piece.id = next_id
+                next_id += 1
+                yield piece
+
+    def _keep(self, segment: Segment) -> bool:
+        return all(keep(segment) for keep in self.filters)
+
+    def _process(self, segment: Segment) -> Iterable[Segment]:
+        if not self._keep(segment):
+            return ()
+        pieces = [segment]
+        for split in self.splitters:
+            split_pieces: list[Segment] = []
+            for piece in pieces:
+                parts = list(split(piece))
+                if len(parts) > 1:
+                    parts = [part for part in parts if self._keep(part)]
+                split_pieces.extend(parts)
+            pieces = split_pieces
+        for piece in pieces:
+            for finish in self.finishers:
+                finish(piece)
+        return pieces
+
+
+class SegmentStream:
+    """A request's lazily decoded segments, post-processed by ``pipeline``.
+
+    Until the first segment is pulled, consumers may add stages to ``pipeline`` and
+    they run in the same pass as the ones already there.
+    """
+
+    def __init__(self, segments: Iterator[Segment], pipeline: SegmentPipeline) -> None:
+        self._segments = segments
+        self.pipeline = pipeline
+
+    def __iter__(self) -> Iterator[Segment]:
+        return self
+
+    def __next__(self) -> Segment:
+        return next(self._segments)
+
+    def close(self) -> None:
+        close = getattr(self._segments, "close", None)
+        if close is not None:
+            close()
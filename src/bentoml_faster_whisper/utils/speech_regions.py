@@ -1,5 +1,8 @@
+import bisect
+import dataclasses
 import itertools
 import math
+import threading
 from typing import Iterable, Protocol
 
 import numpy as np
@@ -76,17 +79,52 @@ def speech_intervals_to_chunks(
     return chunks
 
 
+_run_buffers = threading.local()
+
+
+def _thread_run_buffer(num_samples: int, dtype: np.dtype) -> np.ndarray:
+    """This thread's scratch buffer for assembling run audio, grown (never shrunk) on demand."""
+    buffer: np.ndarray | None = getattr(_run_buffers, "buffer", None)
+    if buffer is None or buffer.dtype != dtype or buffer.shape[0] < num_samples:
+        # Runs are bounded by MAX_RUN_S, so the buffer settles after the first few runs.
+        capacity = (
+            max(num_samples, 2 * buffer.shape[0]) if buffer is not None and buffer.dtype == dtype else num_samples
+        )
+        buffer = np.empty(capacity, dtype=dtype)
+        _run_buffers.buffer = buffer
+    return buffer[:num_samples]
+
+
 def collapse_decoded_to_speech(
     decoded: np.ndarray,
     intervals: Iterable[tuple[float, float]],
     sampling_rate: int = WHISPER_SAMPLE_RATE,
+    reuse_buffer: bool = False,
 ) -> tuple[np.ndarray, list[dict]] | None:
-    """Cut decoded audio down to speech intervals."""
+    """Cut decoded audio down to speech intervals.
+
+    A single speech chunk (the common case after ``pad_and_merge_intervals``) is
+    returned as a view of ``decoded``, without copying. With ``reuse_buffer``,
+    several chunks are written into a per-thread buffer instead of a fresh array;
+    the result is then only valid until the same thread collapses again, which
+    suits a decode run that is done with its audio before the next one starts.
+    """
     speech_chunks = speech_intervals_to_chunks(intervals, decoded.shape[0], sampling_rate)
     if not speech_chunks:
         return None
 
-    audio = np.concatenate([decoded[c["start"] : c["end"]] for c in speech_chunks])
+    if len(speech_chunks) == 1:
+        chunk = speech_chunks[0]
+        return decoded[chunk["start"] : chunk["end"]], speech_chunks
+    if not reuse_buffer:
+        return np.concatenate([decoded[c["start"] : c["end"]] for c in speech_chunks]), speech_chunks
+
+    audio = _thread_run_buffer(sum(c["end"] - c["start"] for c in speech_chunks), decoded.dtype)
+    offset = 0
+    for chunk in speech_chunks:
+        length = chunk["end"] - chunk["start"]
+        audio[offset : offset + length] = decoded[chunk["start"] : chunk["end"]]
+        offset += length
     return audio, speech_chunks
 
 
@@ -167,6 +205,7 @@ def restore_and_split_segments(
     restored = restore_speech_timestamps(fw_segments, speech_chunks, sampling_rate)
     core_segments = Segment.from_faster_whisper_segments(restored)
 
+    index = IntervalIndex(intervals, _SPLIT_TOLERANCE_S)
     next_id = 0
     for seg in core_segments:
         seg.start = clamp(seg.start, 0.0, original_duration_s)
@@ -182,27 +221,56 @@ def restore_and_split_segments(
             word.start = clamp(word.start, 0.0, original_duration_s)
             word.end = clamp(word.end, 0.0, original_duration_s)
 
-        for piece in _split_segment_by_intervals(seg, intervals):
+        for piece in _split_segment_by_intervals(seg, index):
             piece.id = next_id
             next_id += 1
             yield piece
 
 
-def _interval_index(intervals: list[tuple[float, float]], midpoint: float) -> int | None:
-    for i, (start, end) in enumerate(intervals):
-        if start - _SPLIT_TOLERANCE_S <= midpoint <= end + _SPLIT_TOLERANCE_S:
-            return i
-    return None
+class IntervalIndex:
+    """The first of ``intervals`` (in list order) containing a time point, within ``tolerance_s``.
 
+    Speech intervals and runs are sorted and disjoint, so both their widened starts
+    and ends increase: the first interval ending at or after the point is the only
+    candidate, found by bisection instead of a scan over every interval. Intervals
+    out of order (never produced here) fall back to the scan, with the same answers.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[float, float]], tolerance_s: float = 0.0) -> None:
+        self.intervals = list(intervals)
+        self._starts = [start - tolerance_s for start, _ in self.intervals]
+        self._ends = [end + tolerance_s for _, end in self.intervals]
+        self._sorted = all(a <= b for a, b in itertools.pairwise(self._starts)) and all(
+            a <= b for a, b in itertools.pairwise(self._ends)
+        )
 
-def _split_segment_by_intervals(seg: Segment, intervals: list[tuple[float, float]]) -> Iterable[Segment]:
+    def find(self, t: float) -> int | None:
+        if not self._sorted:
+            return next((i for i, (s, e) in enumerate(zip(self._starts, self._ends)) if s <= t <= e), None)
+        i = bisect.bisect_left(self._ends, t)
+        return i if i < len(self._ends) and self._starts[i] <= t else None
+
+    def find_many(self, points: np.ndarray) -> np.ndarray:
+        """``find`` for every point at once; ``-1`` where no interval contains it."""
+        points = np.asarray(points, dtype=np.float64)
+        if not self._sorted or not self.intervals:
+            found = [self.find(t) for t in points.tolist()]
+            return np.array([-1 if i is None else i for i in found], dtype=np.int64)
+        starts = np.asarray(self._starts, dtype=np.float64)
+        ends = np.asarray(self._ends, dtype=np.float64)
+        index = np.searchsorted(ends, points, side="left")
+        candidate = np.minimum(index, len(ends) - 1)
+        return np.where((index < len(ends)) & (starts[candidate] <= points), index, -1).astype(np.int64)
+
+
+def _split_segment_by_intervals(seg: Segment, index: IntervalIndex) -> Iterable[Segment]:
     """Break segment where consecutive words fall in different speech intervals."""
     groups: list[list[Word]] = []
     current: list[Word] = []
     current_idx: int | None = None
 
     for word in seg.words or []:
-        idx = _interval_index(intervals, (word.start + word.end) / 2)
+        idx = index.find((word.start + word.end) / 2)
         if idx is None:
             idx = current_idx
         if current and idx != current_idx:
@@ -218,11 +286,10 @@ def _split_segment_by_intervals(seg: Segment, intervals: list[tuple[float, float
         return
 
     for group in groups:
-        yield seg.model_copy(
-            update={
-                "start": group[0].start,
-                "end": group[-1].end,
-                "text": "".join(word.word for word in group),
-                "words": group,
-            }
+        yield dataclasses.replace(
+            seg,
+            start=group[0].start,
+            end=group[-1].end,
+            text="".join(word.word for word in group),
+            words=group,
         )
@@ -0,0 +1,119 @@
+"""Pacing of the streaming endpoint's output.
+
+A stream can go quiet for minutes: diarization and language identification run before
+the first segment, and long silences decode to nothing. Proxies and load balancers
+drop connections idle for longer than their read timeout, typically 60 s.
+
+``paced_chunks`` produces a stream's chunks on a thread of its own and passes them on
+from the thread sending the response,
+
+* with ``heartbeat`` whenever nothing was sent for ``heartbeat_s``, so the connection
+  never looks idle; and
+* optionally coalesced: chunks arriving within ``flush_s`` of the first unsent one go
+  out together, trading a little latency for fewer, larger writes. The first chunk of
+  the stream is always sent at once.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Iterator
+
+from bentoml_faster_whisper.utils import metrics
+
+_DONE = object()
+
+
+class _Failed:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def paced_chunks(
+    produce: Callable[[], Iterator[str]],
+    started_at: float,
+    stream_format: str,
+    heartbeat: str | None = None,
+    heartbeat_s: float = 0.0,
+    flush_s: float = 0.0,
+    on_close: Callable[[], None] | None = None,
+) -> Iterator[str]:
+    """Chunks of ``produce()``, paced for sending.
+
+    ``produce`` runs on a worker thread and its exceptions are re-raised here.
+    ``on_close`` runs when the stream ends early (client gone, send failed), so the
+    worker can be told to stop; the worker also stops at its next chunk.
+    ``started_at`` (``time.monotonic()``) is when the request came in, for the
+    time-to-first-chunk metric; ``stream_format`` labels the metrics.
+    """
+    chunks: queue.Queue = queue.Queue()
+    stopped = threading.Event()
+
+    def work() -> None:
+        iterator = produce()
+        try:
+            for chunk in iterator:
+                if stopped.is_set():
+                    return
+                chunks.put(chunk)
+            chunks.put(_DONE)
+        except BaseException as e:  # noqa: BLE001 - handed to the sending thread
+            chunks.put(_Failed(e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=work, name="stream-producer", daemon=True).start()
+
+    sent = metrics.stream_chunks()
+    first_sent = False
+    pending: list[str] = []
+    flush_at = 0.0
+    finished = False
+    try:
+        while True:
+            if pending:
+                timeout: float | None = max(flush_at - time.monotonic(), 0.0)
+            else:
+                timeout = heartbeat_s if heartbeat is not None and heartbeat_s > 0 else None
+            try:
+                item = chunks.get(timeout=timeout)
+            except queue.Empty:
+                if pending:
+                    yield "".join(pending)
+                    sent.labels(stream_format, "segments").inc()
+                    pending.clear()
+                else:
+                    yield heartbeat
+                    sent.labels(stream_format, "heartbeat").inc()
+                continue
+
+            if item is _DONE or isinstance(item, _Failed):
+                if pending:
+                    yield "".join(pending)
+                    sent.labels(stream_format, "segments").inc()
+                finished = True
+                if isinstance(item, _Failed):
+                    raise item.error
+                return
+
+            if not first_sent:
+                first_sent = True
+                metrics.stream_first_chunk_seconds().labels(stream_format).observe(time.monotonic() - started_at)
+                yield item
+                sent.labels(stream_format, "segments").inc()
+                continue
+            if not pending:
+                flush_at = time.monotonic() + flush_s
+            pending.append(item)
+            if time.monotonic() >= flush_at:
+                yield "".join(pending)
+                sent.labels(stream_format, "segments").inc()
+                pending.clear()
+    finally:
+        stopped.set()
+        if not finished and on_close is not None:
+            on_close()
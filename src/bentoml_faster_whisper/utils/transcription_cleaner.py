@@ -3,28 +3,52 @@ from typing import Iterable
 from faster_whisper.transcribe import TranscriptionInfo
 
 from bentoml_faster_whisper.utils.hallucinations import detect_hallucinations
+from bentoml_faster_whisper.utils.segment_pipeline import SegmentPipeline, SegmentStream
 from bentoml_faster_whisper.utils.whisper_diarization_merger import WhisperSegment
 
 NO_SPEECH_PROB_THRESHOLD = 0.9
 
 
-def clean_transcription_segments(
-    whisper_segments: Iterable[WhisperSegment],
+def add_cleaning_stages(
+    pipeline: SegmentPipeline,
     transcription_info: TranscriptionInfo,
     text_language: str | None = None,
-) -> Iterable[WhisperSegment]:
-    """Filter out silence and hallucinations from segments, and normalize text."""
+) -> None:
+    """Add the silence and hallucination filters and the text normalization to ``pipeline``."""
     log_prob_threshold = transcription_info.transcription_options.log_prob_threshold
-    for segment in whisper_segments:
-        if segment.no_speech_prob > NO_SPEECH_PROB_THRESHOLD and (
-            log_prob_threshold is None or segment.avg_logprob < log_prob_threshold
-        ):
-            continue
 
+    def is_speech(segment: WhisperSegment) -> bool:
+        return not (
+            segment.no_speech_prob > NO_SPEECH_PROB_THRESHOLD
+            and (log_prob_threshold is None or segment.avg_logprob < log_prob_threshold)
+        )
+
+    def is_not_hallucination(segment: WhisperSegment) -> bool:
         hallucination_language = text_language or segment.language or transcription_info.language
-        if detect_hallucinations(segment.text.strip(), hallucination_language):
-            continue
+        return not detect_hallucinations(segment.text.strip(), hallucination_language)
+
+    def normalize(segment: WhisperSegment) -> None:
         segment.text = segment.text.replace("ß", "ss")
         for word in segment.words or []:
             word.word = word.word.replace("ß", "ss")
-        yield segment
+
+    pipeline.add(filters=[is_speech, is_not_hallucination], finishers=[normalize])
+
+
+def clean_transcription_segments(
+    whisper_segments: Iterable[WhisperSegment],
+    transcription_info: TranscriptionInfo,
+    text_language: str | None = None,
+) -> Iterable[WhisperSegment]:
+    """Filter out silence and hallucinations from segments, and normalize text.
+
+    A ``SegmentStream`` that has not started yet gets the cleaning added to its own
+    pipeline, so the segments it rejects skip the stages it already had.
+    """
+    if isinstance(whisper_segments, SegmentStream) and not whisper_segments.pipeline.started:
+        add_cleaning_stages(whisper_segments.pipeline, transcription_info, text_language)
+        return whisper_segments
+
+    pipeline = SegmentPipeline()
+    add_cleaning_stages(pipeline, transcription_info, text_language)
+    return pipeline(whisper_segments)
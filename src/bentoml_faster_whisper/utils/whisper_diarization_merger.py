@@ -181,54 +181,67 @@ def _split_segment_by_speaker(
         yield piece
 
 
+class SpeakerMerger:
+    """Per-segment speaker attribution against diarization turns, consumed in one pass.
+
+    Each call labels one segment (and its words) and returns it, or its pieces when
+    its words were assigned to different speakers. Segments must be passed in time
+    order; ids are left to the caller.
+    """
+
+    def __init__(self, diarization_segments: Iterable[DiarizationSegment]):
+        self._turns = _PeekWithMemory(diarization_segments)
+
+    def __call__(self, seg: WhisperSegment) -> Iterable[WhisperSegment]:
+        turns = self._turns
+        candidates = list(_pack_segements_in_range(turns, seg.start, seg.end))
+
+        seg_prev = turns.last
+        seg_next = turns.peek() if turns.has_next() else None
+
+        if not seg.words:
+            best_speaker, _ = _find_best_speaker(iter(candidates), seg.start, seg.end)
+            if best_speaker is None:
+                best_speaker = _nearest_speaker(seg.start, seg.end, (*candidates, seg_prev, seg_next))
+            if best_speaker:
+                seg.speaker = best_speaker
+            return (seg,)
+
+        word_candidates = _PeekWithMemory(iter(candidates))
+        word_speakers: list[Optional[str]] = []
+        split_speakers: list[Optional[str]] = []
+
+        for word in seg.words:
+            current_word_candidates = _pack_segements_in_range(word_candidates, word.start, word.end)
+            best_word_speaker, overlap = _find_best_speaker(current_word_candidates, word.start, word.end)
+            confident = overlap >= _SPLIT_MIN_OVERLAP_FRACTION * (word.end - word.start)
+
+            if best_word_speaker is None:
+                word_next = word_candidates.peek() if word_candidates.has_next() else None
+                best_word_speaker = _nearest_speaker(
+                    word.start,
+                    word.end,
+                    (word_candidates.last, word_next, seg_prev, seg_next),
+                )
+
+            word_speakers.append(best_word_speaker)
+            split_speakers.append(best_word_speaker if confident else None)
+            if best_word_speaker:
+                word.speaker = best_word_speaker
+
+        return list(_split_segment_by_speaker(seg, split_speakers, word_speakers))
+
+
 def merge_whisper_diarization(
     whisper_segments: Iterable[WhisperSegment],
     diarization_segments: Iterable[DiarizationSegment],
 ) -> Iterable[WhisperSegment]:
     """Merge speaker labels from diarization segments into whisper segments and words."""
-    diarization_segments_peekable = _PeekWithMemory(diarization_segments)
+    merge = SpeakerMerger(diarization_segments)
     next_id = 0
 
     for seg in whisper_segments:
-        candidates = list(_pack_segements_in_range(diarization_segments_peekable, seg.start, seg.end))
-
-        seg_prev = diarization_segments_peekable.last
-        seg_next = diarization_segments_peekable.peek() if diarization_segments_peekable.has_next() else None
-
-        if seg.words:
-            word_candidates = _PeekWithMemory(iter(candidates))
-            word_speakers: list[Optional[str]] = []
-            split_speakers: list[Optional[str]] = []
-
-            for word in seg.words:
-                current_word_candidates = _pack_segements_in_range(word_candidates, word.start, word.end)
-                best_word_speaker, overlap = _find_best_speaker(current_word_candidates, word.start, word.end)
-                confident = overlap >= _SPLIT_MIN_OVERLAP_FRACTION * (word.end - word.start)
-
-                if best_word_speaker is None:
-                    word_next = word_candidates.peek() if word_candidates.has_next() else None
-                    best_word_speaker = _nearest_speaker(
-                        word.start,
-                        word.end,
-                        (word_candidates.last, word_next, seg_prev, seg_next),
-                    )
-
-                word_speakers.append(best_word_speaker)
-                split_speakers.append(best_word_speaker if confident else None)
-                if best_word_speaker:
-                    word.speaker = best_word_speaker
-
-            for piece in _split_segment_by_speaker(seg, split_speakers, word_speakers):
-                piece.id = next_id
-                next_id += 1
-                yield piece
-        else:
-            best_speaker, _ = _find_best_speaker(iter(candidates), seg.start, seg.end)
-            if best_speaker is None:
-                best_speaker = _nearest_speaker(seg.start, seg.end, (*candidates, seg_prev, seg_next))
-            if best_speaker:
-                seg.speaker = best_speaker
-
-            seg.id = next_id
+        for piece in merge(seg):
+            piece.id = next_id
             next_id += 1
-            yield seg
+            yield piece
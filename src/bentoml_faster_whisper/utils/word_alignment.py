@@ -0,0 +1,154 @@
+"""Word timings for decoded segments, computed only where speaker attribution needs them.
+
+Decoding with ``word_timestamps=True`` runs Whisper's cross-attention DTW alignment
+on every window. A diarized request only needs word timings to split a segment
+between speakers, so the handler decodes its runs without them and aligns just the
+segments that span a speaker change (or a gap between collapsed speech chunks,
+which restoring needs words to split). Alignment reuses the segment's decoded
+tokens: one batched encoder pass and ``align`` call, nothing is re-decoded.
+"""
+
+import bisect
+import dataclasses
+import itertools
+from typing import Iterable, Protocol, Sequence
+
+import numpy as np
+from faster_whisper import WhisperModel
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from faster_whisper.transcribe import Segment, Word, merge_punctuations
+from faster_whisper.vad import SpeechTimestampsMap
+
+from bentoml_faster_whisper.services.replica_pool import pinned
+from bentoml_faster_whisper.utils import metrics
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+
+ALIGN_BATCH_SIZE = 8
+# faster-whisper's transcribe() defaults, so aligned words match eagerly decoded ones.
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+
+
+class _SpeakerTurn(Protocol):
+    @property
+    def start(self) -> float: ...
+
+    @property
+    def end(self) -> float: ...
+
+    @property
+    def speaker(self) -> str: ...
+
+
+class SpeakerTurnIndex:
+    """Diarization turns sorted by start, answering which speakers overlap a time span."""
+
+    def __init__(self, turns: Iterable[_SpeakerTurn]) -> None:
+        self._turns = sorted(turns, key=lambda turn: turn.start)
+        self._starts = [turn.start for turn in self._turns]
+        # Running max of turn ends: turns before the first index reaching past ``start`` cannot overlap.
+        self._reach = list(itertools.accumulate((turn.end for turn in self._turns), max))
+
+    def speakers(self, start: float, end: float) -> set[str]:
+        lo = bisect.bisect_right(self._reach, start)
+        hi = bisect.bisect_left(self._starts, end)
+        return {turn.speaker for turn in self._turns[lo:hi] if turn.end > start}
+
+    def spans_speaker_change(self, start: float, end: float) -> bool:
+        return len(self.speakers(start, end)) > 1
+
+
+def segments_needing_words(
+    segments: Sequence[Segment],
+    speech_chunks: list[dict],
+    turn_index: SpeakerTurnIndex,
+    sampling_rate: int = WHISPER_SAMPLE_RATE,
+) -> list[int]:
+    """Indices of collapsed-timeline ``segments`` that need word timings for speaker attribution."""
+    ts_map = SpeechTimestampsMap(speech_chunks, sampling_rate)
+    indices: list[int] = []
+    for index, segment in enumerate(segments):
+        if segment.words or segment.end <= segment.start:
+            continue
+        first_chunk = ts_map.get_chunk_index(segment.start)
+        last_chunk = ts_map.get_chunk_index(segment.end, is_end=True)
+        if first_chunk != last_chunk or turn_index.spans_speaker_change(
+            ts_map.get_original_time(segment.start, first_chunk),
+            ts_map.get_original_time(segment.end, last_chunk),
+        ):
+            indices.append(index)
+    return indices
+
+
+def align_segment_words(
+    whisper: WhisperModel,
+    audio: np.ndarray,
+    segments: Sequence[Segment],
+    language: str,
+    batch_size: int = ALIGN_BATCH_SIZE,
+    sampling_rate: int = WHISPER_SAMPLE_RATE,
+) -> list[Segment]:
+    """Return ``segments`` with word timings, each aligned against its own span of ``audio``.
+
+    Segments without text tokens are returned unchanged.
+    """
+    tokenizer = Tokenizer(whisper.hf_tokenizer, whisper.model.is_multilingual, task="transcribe", language=language)
+    extractor = whisper.feature_extractor
+    aligned = list(segments)
+    todo = [
+        (index, [token for token in segment.tokens if token < tokenizer.eot])
+        for index, segment in enumerate(segments)
+        if segment.end > segment.start
+    ]
+    todo = [(index, text_tokens) for index, text_tokens in todo if text_tokens]
+    for batch_start in range(0, len(todo), batch_size):
+        batch = todo[batch_start : batch_start + batch_size]
+        windows: list[np.ndarray] = []
+        num_frames: list[int] = []
+        for index, _ in batch:
+            segment = segments[index]
+            clip = audio[int(segment.start * sampling_rate) : int(segment.end * sampling_rate)]
+            features = extractor(clip)[..., : extractor.nb_max_frames]
+            windows.append(pad_or_trim(features))
+            num_frames.append(features.shape[-1])
+        text_tokens = [tokens for _, tokens in batch]
+        # The encoder output lives on the device of the instance that computed it.
+        with pinned(whisper) as model:
+            encoder_output = model.encode(np.stack(windows))
+            alignments = model.find_alignment(tokenizer, text_tokens, encoder_output, num_frames)
+        for (index, _), alignment in zip(batch, alignments):
+            segment = segments[index]
+            merge_punctuations(alignment, PREPEND_PUNCTUATIONS, APPEND_PUNCTUATIONS)
+            words = [
+                Word(
+                    start=round(segment.start + timing["start"], 2),
+                    end=round(segment.start + timing["end"], 2),
+                    word=timing["word"],
+                    probability=timing["probability"],
+                )
+                for timing in alignment
+                if timing["word"]
+            ]
+            aligned[index] = dataclasses.replace(segment, words=words or None)
+    return aligned
+
+
+def add_words_where_speakers_change(
+    whisper: WhisperModel,
+    audio: np.ndarray,
+    segments: Iterable[Segment],
+    speech_chunks: list[dict],
+    turn_index: SpeakerTurnIndex,
+    language: str,
+) -> list[Segment]:
+    """Align words for the segments of one collapsed decode run that span a speaker change or chunk gap."""
+    segments = list(segments)
+    indices = segments_needing_words(segments, speech_chunks, turn_index)
+    metrics.word_aligned_segments().labels("aligned").inc(len(indices))
+    metrics.word_aligned_segments().labels("skipped").inc(len(segments) - len(indices))
+    if indices:
+        aligned = align_segment_words(whisper, audio, [segments[index] for index in indices], language)
+        for index, segment in zip(indices, aligned):
+            segments[index] = segment
+    return segments
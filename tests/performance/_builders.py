@@ -0,0 +1,47 @@
+"""Timing helper and a synthetic 50k-word diarized transcript for the response benchmarks."""
+
+import time
+from typing import Any
+
+from bentoml_faster_whisper.utils.core import Segment, Word
+
+NUM_WORDS = 50_000
+WORDS_PER_SEGMENT = 20
+
+
+def best_of(repeats: int, fn, *args) -> tuple[Any, float]:
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - t0)
+    return result, min(timings)
+
+
+def transcript() -> list[Segment]:
+    segments = []
+    for i in range(NUM_WORDS // WORDS_PER_SEGMENT):
+        t0 = i * 6.0
+        speaker = f"SPEAKER_{i % 3:02d}"
+        words = [
+            Word(start=t0 + k * 0.25, end=t0 + k * 0.25 + 0.2, word=f" wört{k}", probability=0.93, speaker=speaker)
+            for k in range(WORDS_PER_SEGMENT)
+        ]
+        segments.append(
+            Segment(
+                id=i,
+                seek=i * 600,
+                start=t0,
+                end=t0 + 5.0,
+                text="".join(word.word for word in words),
+                tokens=list(range(50_000, 50_000 + WORDS_PER_SEGMENT + 3)),
+                temperature=0.0,
+                avg_logprob=-0.21,
+                compression_ratio=1.37,
+                no_speech_prob=0.02,
+                words=words,
+                speaker=speaker,
+                language="de",
+            )
+        )
+    return segments
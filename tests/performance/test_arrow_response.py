@@ -0,0 +1,47 @@
+"""Microbenchmark for the ``arrow`` response format against ``verbose_json``.
+
+Times writing a synthetic 50k-word diarized transcript as ``verbose_json`` and as an
+Arrow IPC stream, and reading each back into flat word-start columns the way a machine
+consumer would, and checks both carry the same word timings and speakers.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+from bentoml_faster_whisper.models.enums import ResponseFormat
+from bentoml_faster_whisper.models.output_models import segments_to_response
+from tests.performance._builders import best_of, transcript
+
+pytestmark = pytest.mark.performance
+
+
+def test_arrow_body_of_a_50k_word_transcript():
+    segments = transcript()
+    info = SimpleNamespace(language="de", duration=len(segments) * 6.0)
+
+    verbose, verbose_s = best_of(5, lambda: segments_to_response(segments, info, ResponseFormat.VERBOSE_JSON))
+    arrow, arrow_s = best_of(5, lambda: segments_to_response(segments, info, ResponseFormat.ARROW))
+    assert isinstance(verbose, str) and isinstance(arrow, bytes)
+
+    def read_verbose():
+        words = json.loads(verbose)["words"]
+        return [word["start"] for word in words], [word["speaker"] for word in words]
+
+    def read_arrow():
+        table = pa.ipc.open_stream(arrow).read_all()
+        speakers = table["word_speaker"].combine_chunks().values
+        return table["word_start"].combine_chunks().values, speakers
+
+    (verbose_starts, verbose_speakers), verbose_read_s = best_of(5, read_verbose)
+    (arrow_starts, arrow_speakers), arrow_read_s = best_of(5, read_arrow)
+
+    print(
+        f"\nverbose_json {len(verbose) / 2**20:.1f} MiB: write {verbose_s * 1000:.1f} ms, "
+        f"read {verbose_read_s * 1000:.1f} ms; arrow {len(arrow) / 2**20:.1f} MiB: "
+        f"write {arrow_s * 1000:.1f} ms, read {arrow_read_s * 1000:.1f} ms"
+    )
+    assert arrow_starts.to_pylist() == verbose_starts
+    assert arrow_speakers.to_pylist() == verbose_speakers
@@ -0,0 +1,95 @@
+"""Memory benchmark for assembling decode-run audio from a long diarized file.
+
+Compares the bytes allocated while collapsing every language run of a
+synthetic 30-minute diarization with the old per-run ``np.concatenate`` against
+``collapse_decoded_to_speech`` (views for single-interval runs, one reusable
+per-thread buffer for the rest). Uses tracemalloc, which numpy reports its data
+buffers to, so no GPU or model is needed.
+"""
+
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.utils.speech_regions import (
+    WHISPER_SAMPLE_RATE,
+    collapse_decoded_to_speech,
+    speech_intervals_to_chunks,
+    turns_to_language_runs,
+)
+
+pytestmark = pytest.mark.performance
+
+FILE_S = 30 * 60.0
+
+
+def _diarized_turns() -> list[tuple[float, float]]:
+    """Alternating 3-8 s speaker turns separated by short pauses, like a meeting recording."""
+    rng = np.random.default_rng(0)
+    turns: list[tuple[float, float]] = []
+    t = 0.5
+    while t < FILE_S - 10.0:
+        length = float(rng.uniform(3.0, 8.0))
+        turns.append((t, t + length))
+        t += length + float(rng.uniform(0.2, 2.5))
+    return turns
+
+
+def _concatenate_per_run(decoded: np.ndarray, run_intervals) -> int:
+    chunks = speech_intervals_to_chunks(run_intervals, decoded.shape[0], WHISPER_SAMPLE_RATE)
+    audio = np.concatenate([decoded[c["start"] : c["end"]] for c in chunks])
+    return audio.shape[0]
+
+
+def _collapse_reusing_buffer(decoded: np.ndarray, run_intervals) -> int:
+    collapsed = collapse_decoded_to_speech(decoded, run_intervals, reuse_buffer=True)
+    assert collapsed is not None
+    return collapsed[0].shape[0]
+
+
+def _traced(collapse, decoded: np.ndarray, runs) -> tuple[int, int]:
+    """(samples assembled, bytes newly allocated summed over runs).
+
+    Runs on a fresh thread so the per-thread buffer starts empty.
+    """
+    result: list[tuple[int, int]] = []
+
+    def measure() -> None:
+        tracemalloc.start()
+        try:
+            samples = 0
+            allocated = 0
+            for _, run_intervals in runs:
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                samples += collapse(decoded, run_intervals)
+                _, run_peak = tracemalloc.get_traced_memory()
+                allocated += max(0, run_peak - before)
+        finally:
+            tracemalloc.stop()
+        result.append((samples, allocated))
+
+    thread = threading.Thread(target=measure)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_run_audio_assembly_allocation_drops():
+    turns = _diarized_turns()
+    languages = ["de" if (i // 40) % 3 else "fr" for i in range(len(turns))]
+    runs = turns_to_language_runs(turns, languages)
+    decoded = np.random.default_rng(1).standard_normal(int(FILE_S * WHISPER_SAMPLE_RATE)).astype(np.float32)
+
+    baseline = _traced(_concatenate_per_run, decoded, runs)
+    optimized = _traced(_collapse_reusing_buffer, decoded, runs)
+
+    print(
+        f"\n{len(runs)} runs, {baseline[0] / WHISPER_SAMPLE_RATE:.0f} s of run audio: "
+        f"concatenate allocated {baseline[1] / 2**20:.1f} MiB, reused buffer allocated {optimized[1] / 2**20:.1f} MiB"
+    )
+    assert optimized[0] == baseline[0]
+    # The reused buffer is allocated once (plus growth); concatenation allocates every run anew.
+    assert optimized[1] < baseline[1] / 4
@@ -0,0 +1,68 @@
+"""Microbenchmark for ``HallucinationMatcher`` against the exact set lookup it replaced.
+
+The cleaning stage checks every segment, nearly all of them real speech. Times the
+stripped-text set lookup (kept below as the reference) and the normalized matcher on
+a transcript-like mix, with the shipped phrase list and with a large deployment
+pattern file, and checks the matcher flags everything the set lookup flags.
+"""
+
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.utils.hallucinations import HALLUCINATIONS, HallucinationMatcher
+from tests.performance._builders import best_of
+
+pytestmark = pytest.mark.performance
+
+_SPEECH = [
+    " Guten Morgen, wir beginnen mit der Sitzung des Gemeinderats.",
+    " Der Antrag wurde mit grosser Mehrheit angenommen.",
+    " Untertitel sind für viele Menschen eine grosse Hilfe.",
+    " Par ailleurs, la commission a rendu son rapport hier soir.",
+    " Okay.",
+]
+
+
+def _reference_lookup(phrases: dict[str, set[str]]):
+    stripped = {language: {text.strip() for text in texts} for language, texts in phrases.items()}
+    return lambda text, language: text.strip() in stripped.get(language, set())
+
+
+def _deployment_phrases(extra: int) -> dict[str, set[str]]:
+    phrases = {language: set(texts) for language, texts in HALLUCINATIONS.items()}
+    rng = np.random.default_rng(0)
+    for i in range(extra):
+        words = " ".join(f"w{n}" for n in rng.integers(0, 50_000, size=5))
+        phrases.setdefault("de", set()).add(f" Sendung {i} {words}")
+    return phrases
+
+
+def _segments(count: int) -> list[tuple[str, str]]:
+    rng = np.random.default_rng(1)
+    hallucinations = sorted(HALLUCINATIONS["de"])
+    texts = []
+    for i in range(count):
+        # One segment in fifty is a known hallucination, the rest is speech.
+        pool = hallucinations if i % 50 == 0 else _SPEECH
+        texts.append((pool[int(rng.integers(len(pool)))], "de"))
+    return texts
+
+
+def _match_all(match, segments: list[tuple[str, str]]) -> list[bool]:
+    return [match(text, language) for text, language in segments]
+
+
+@pytest.mark.parametrize("extra_phrases", [0, 20_000])
+def test_matcher_cost_per_segment(extra_phrases: int):
+    phrases = _deployment_phrases(extra_phrases)
+    segments = _segments(20_000)
+
+    expected, reference_s = best_of(5, _match_all, _reference_lookup(phrases), segments)
+    actual, matcher_s = best_of(5, _match_all, HallucinationMatcher(phrases), segments)
+
+    print(
+        f"\n{sum(len(t) for t in phrases.values())} phrases: set lookup "
+        f"{reference_s / len(segments) * 1e9:.0f} ns/segment, matcher {matcher_s / len(segments) * 1e9:.0f} ns/segment"
+    )
+    assert all(a for a, e in zip(actual, expected) if e)
+    assert sum(actual) == sum(expected)
@@ -0,0 +1,59 @@
+"""Microbenchmark for ``IntervalIndex`` against the per-point interval scan it replaced.
+
+Splitting restored segments looks up one interval per word, and the language-ID fill
+pass one per undetected turn; the scan made both O(points x intervals). Times the
+scan (kept below as the reference), bisection per point and the batched lookup for
+long files, and checks all three agree under the split tolerance.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.utils.speech_regions import _SPLIT_TOLERANCE_S, IntervalIndex
+
+pytestmark = pytest.mark.performance
+
+WORDS_PER_INTERVAL = 8
+
+
+def _reference_interval_index(intervals: list[tuple[float, float]], midpoint: float) -> int | None:
+    for i, (start, end) in enumerate(intervals):
+        if start - _SPLIT_TOLERANCE_S <= midpoint <= end + _SPLIT_TOLERANCE_S:
+            return i
+    return None
+
+
+def _long_file(num_intervals: int, seed: int = 0) -> tuple[list[tuple[float, float]], list[float]]:
+    """Merged speech intervals 1-12 s long with 1-6 s gaps, and word midpoints across them."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.uniform(1.0, 12.0, size=num_intervals)
+    gaps = rng.uniform(1.0, 6.0, size=num_intervals)
+    starts = np.cumsum(gaps + np.concatenate(([0.0], lengths[:-1])))
+    intervals = list(zip(starts.tolist(), (starts + lengths).tolist()))
+    midpoints = rng.uniform(0.0, intervals[-1][1] + 1.0, size=num_intervals * WORDS_PER_INTERVAL)
+    return intervals, midpoints.tolist()
+
+
+def _timed(fn) -> tuple[list, float]:
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+@pytest.mark.parametrize("num_intervals", [250, 1_000, 4_000])
+def test_interval_lookup_scales_to_long_files(num_intervals: int):
+    intervals, midpoints = _long_file(num_intervals)
+    index = IntervalIndex(intervals, _SPLIT_TOLERANCE_S)
+
+    expected, scan_s = _timed(lambda: [_reference_interval_index(intervals, t) for t in midpoints])
+    bisected, bisect_s = _timed(lambda: [index.find(t) for t in midpoints])
+    batched, batch_s = _timed(lambda: index.find_many(np.array(midpoints)).tolist())
+
+    print(
+        f"\n{num_intervals} intervals, {len(midpoints)} words: scan {scan_s * 1000:.1f} ms, "
+        f"bisect {bisect_s * 1000:.1f} ms, searchsorted {batch_s * 1000:.1f} ms"
+    )
+    assert bisected == expected
+    assert batched == [-1 if i is None else i for i in expected]
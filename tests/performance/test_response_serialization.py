@@ -0,0 +1,45 @@
+"""Microbenchmark for writing the JSON response formats of a long transcript.
+
+Times building and dumping the response models (kept below as the reference) against
+``segments_to_response``, which writes the JSON straight from the internal segments,
+on a synthetic 50k-word diarized transcript, and checks both produce the same bytes.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from bentoml_faster_whisper.models.enums import ResponseFormat
+from bentoml_faster_whisper.models.output_models import segments_to_response
+from bentoml_faster_whisper.models.transcription_json_diarized_response import TranscriptionJsonDiarizedResponse
+from bentoml_faster_whisper.models.transcription_json_response import TranscriptionJsonResponse
+from bentoml_faster_whisper.models.transcription_verbose_json_response import TranscriptionVerboseJsonResponse
+from bentoml_faster_whisper.utils.core import Segment
+from tests.performance._builders import best_of, transcript
+
+pytestmark = pytest.mark.performance
+
+
+def _reference_response(segments: list[Segment], info, response_format: ResponseFormat) -> str:
+    if response_format == ResponseFormat.JSON:
+        return TranscriptionJsonResponse.from_segments(segments).model_dump_json()
+    if response_format == ResponseFormat.JSON_DIARIZED:
+        return TranscriptionJsonDiarizedResponse.from_segments(segments).model_dump_json()
+    return TranscriptionVerboseJsonResponse.from_segments(segments, info).model_dump_json()
+
+
+@pytest.mark.parametrize(
+    "response_format", [ResponseFormat.JSON, ResponseFormat.JSON_DIARIZED, ResponseFormat.VERBOSE_JSON]
+)
+def test_json_response_of_a_50k_word_transcript(response_format: ResponseFormat):
+    segments = transcript()
+    info = SimpleNamespace(language="de", duration=len(segments) * 6.0)
+
+    expected, model_s = best_of(5, _reference_response, segments, info, response_format)
+    actual, direct_s = best_of(5, segments_to_response, segments, info, response_format)
+
+    print(
+        f"\n{response_format.value} ({len(expected) / 2**20:.1f} MiB): response models {model_s * 1000:.1f} ms, "
+        f"direct {direct_s * 1000:.1f} ms"
+    )
+    assert actual == expected
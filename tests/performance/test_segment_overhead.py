@@ -0,0 +1,141 @@
+"""Microbenchmark for the per-segment cost of the internal segment representation.
+
+Runs the pipeline steps a long verbose_json request puts every segment through
+(conversion from faster-whisper, a split copy, the response model and its JSON)
+with the slotted dataclasses against the pydantic models they replaced (kept below
+as the reference), and checks both produce the same JSON.
+"""
+
+import dataclasses
+
+import pytest
+from faster_whisper.transcribe import Segment as FWSegment
+from faster_whisper.transcribe import TranscriptionInfo
+from faster_whisper.transcribe import Word as FWWord
+from pydantic import BaseModel
+
+from bentoml_faster_whisper.models.transcription_verbose_json_response import TranscriptionVerboseJsonResponse
+from bentoml_faster_whisper.utils.core import Segment, segments_to_text
+from tests.performance._builders import best_of
+
+pytestmark = pytest.mark.performance
+
+WORDS_PER_SEGMENT = 25
+
+
+class _PydanticWord(BaseModel):
+    start: float
+    end: float
+    word: str
+    probability: float
+    speaker: str | None = None
+
+
+class _PydanticSegment(BaseModel):
+    id: int
+    seek: int
+    start: float
+    end: float
+    text: str
+    tokens: list[int]
+    temperature: float
+    avg_logprob: float
+    compression_ratio: float
+    no_speech_prob: float
+    words: list[_PydanticWord] | None
+    speaker: str | None = None
+    language: str | None = None
+    degraded: bool = False
+
+
+class _PydanticVerboseResponse(BaseModel):
+    task: str = "transcribe"
+    language: str
+    duration: float
+    text: str
+    words: list[_PydanticWord]
+    segments: list[_PydanticSegment]
+
+
+def _fw_segments(num_segments: int) -> list[FWSegment]:
+    segments = []
+    for i in range(num_segments):
+        t0 = i * 6.0
+        words = [
+            FWWord(start=t0 + k * 0.2, end=t0 + k * 0.2 + 0.15, word=f" w{k}", probability=0.9)
+            for k in range(WORDS_PER_SEGMENT)
+        ]
+        segments.append(
+            FWSegment(
+                id=i,
+                seek=i * 600,
+                start=t0,
+                end=t0 + 5.0,
+                text="".join(word.word for word in words),
+                tokens=list(range(50_000, 50_000 + WORDS_PER_SEGMENT)),
+                avg_logprob=-0.25,
+                compression_ratio=1.4,
+                no_speech_prob=0.01,
+                words=words,
+                temperature=0.0,
+            )
+        )
+    return segments
+
+
+def _reference_pipeline(fw_segments: list[FWSegment], info: TranscriptionInfo) -> str:
+    segments = []
+    for fw in fw_segments:
+        segment = _PydanticSegment(
+            id=fw.id,
+            seek=fw.seek,
+            start=fw.start,
+            end=fw.end,
+            text=fw.text,
+            tokens=fw.tokens,
+            temperature=fw.temperature,
+            avg_logprob=fw.avg_logprob,
+            compression_ratio=fw.compression_ratio,
+            no_speech_prob=fw.no_speech_prob,
+            words=[_PydanticWord(start=w.start, end=w.end, word=w.word, probability=w.probability) for w in fw.words],
+        )
+        segments.append(segment.model_copy(update={"speaker": "SPEAKER_00"}))
+    return _PydanticVerboseResponse(
+        language=info.language,
+        duration=info.duration,
+        text="".join(segment.text for segment in segments).strip(),
+        words=[word for segment in segments for word in segment.words or []],
+        segments=segments,
+    ).model_dump_json()
+
+
+def _pipeline(fw_segments: list[FWSegment], info: TranscriptionInfo) -> str:
+    segments = [
+        dataclasses.replace(segment, speaker="SPEAKER_00")
+        for segment in Segment.from_faster_whisper_segments(fw_segments)
+    ]
+    assert segments_to_text(segments)
+    return TranscriptionVerboseJsonResponse.from_segments(segments, info).model_dump_json()
+
+
+@pytest.mark.parametrize("num_segments", [1_000, 5_000])
+def test_segment_overhead_on_a_long_verbose_json_request(num_segments: int):
+    fw_segments = _fw_segments(num_segments)
+    info = TranscriptionInfo(
+        language="de",
+        language_probability=0.99,
+        duration=num_segments * 6.0,
+        duration_after_vad=num_segments * 6.0,
+        all_language_probs=None,
+        transcription_options=None,  # type: ignore[arg-type]
+        vad_options=None,  # type: ignore[arg-type]
+    )
+
+    expected, reference_s = best_of(3, _reference_pipeline, fw_segments, info)
+    actual, dataclass_s = best_of(3, _pipeline, fw_segments, info)
+
+    print(
+        f"\n{num_segments} segments: pydantic {reference_s / num_segments * 1e6:.1f} us/segment, "
+        f"dataclasses {dataclass_s / num_segments * 1e6:.1f} us/segment"
+    )
+    assert actual == expected
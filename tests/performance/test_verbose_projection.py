@@ -0,0 +1,46 @@
+"""Microbenchmark for projected and compact ``verbose_json`` responses.
+
+Times writing the full ``verbose_json`` of a synthetic 50k-word transcript against the
+compact mode (no token ids, words only at the top level) and a subtitle projection
+(``start``, ``end``, ``text``; such clients do not ask for word timestamps, so that
+transcript has no words), and checks the projections hold exactly the selected fields
+of the full response.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from bentoml_faster_whisper.models.enums import ResponseFormat
+from bentoml_faster_whisper.models.output_models import segments_to_response
+from bentoml_faster_whisper.models.transcription_request import TranscriptionRequest
+from tests.performance._builders import best_of, transcript
+
+pytestmark = pytest.mark.performance
+
+
+@pytest.mark.parametrize("params, word_timestamps", [({"compact": True}, True), ({"include": "start,end,text"}, False)])
+def test_projected_verbose_json_of_a_50k_word_transcript(params, word_timestamps):
+    segments = transcript()
+    if not word_timestamps:
+        for segment in segments:
+            segment.words = None
+    info = SimpleNamespace(language="de", duration=len(segments) * 6.0)
+    segment_fields = TranscriptionRequest.from_dict({"file": "/tmp/example.mp3", **params}).verbose_segment_fields
+    assert segment_fields is not None
+
+    full, full_s = best_of(5, segments_to_response, segments, info, ResponseFormat.VERBOSE_JSON, None)
+    projected, projected_s = best_of(
+        5, segments_to_response, segments, info, ResponseFormat.VERBOSE_JSON, segment_fields
+    )
+
+    print(
+        f"\n{params}: full {len(full) / 2**20:.1f} MiB in {full_s * 1000:.1f} ms, "
+        f"projected {len(projected) / 2**20:.1f} MiB in {projected_s * 1000:.1f} ms"
+    )
+    expected = json.loads(full)
+    expected["segments"] = [
+        {key: value for key, value in segment.items() if key in segment_fields} for segment in expected["segments"]
+    ]
+    assert json.loads(projected) == expected
@@ -0,0 +1,95 @@
+"""Microbenchmark for ``viterbi_smooth_languages`` on long multilingual meetings.
+
+Times the implementation with the NumPy emission matrix against the pure-Python
+version it replaced (kept below as the reference) for 1k to 100k turns, and checks
+that both assign identical languages, including on tied probabilities.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.utils.language_id import _MIN_PROB, viterbi_smooth_languages
+from tests.performance._builders import best_of
+
+pytestmark = pytest.mark.performance
+
+INVENTORY = ["de", "fr", "it", "en"]
+SWITCH_PENALTY = 2.0
+EVIDENCE_CAP_S = 10.0
+
+
+def _reference_viterbi(prob_rows, durations, inventory, switch_penalty, evidence_cap_s) -> list[str]:
+    emissions: list[list[float]] = []
+    for row, duration in zip(prob_rows, durations, strict=True):
+        if row is None:
+            emissions.append([0.0] * len(inventory))
+            continue
+        probs = [max(row.get(language, 0.0), _MIN_PROB) for language in inventory]
+        norm = sum(probs)
+        weight = min(duration, evidence_cap_s)
+        emissions.append([weight * math.log(prob / norm) for prob in probs])
+
+    scores = emissions[0]
+    backpointers: list[list[int]] = []
+    for emission in emissions[1:]:
+        best_idx = max(range(len(inventory)), key=lambda i: scores[i])
+        step_pointers = []
+        step_scores = []
+        for j, e in enumerate(emission):
+            stay = scores[j]
+            switch = scores[best_idx] - switch_penalty
+            if best_idx != j and switch > stay:
+                step_pointers.append(best_idx)
+                step_scores.append(switch + e)
+            else:
+                step_pointers.append(j)
+                step_scores.append(stay + e)
+        backpointers.append(step_pointers)
+        scores = step_scores
+
+    idx = max(range(len(inventory)), key=lambda i: scores[i])
+    path = [idx]
+    for step_pointers in reversed(backpointers):
+        idx = step_pointers[path[-1]]
+        path.append(idx)
+    return [inventory[i] for i in reversed(path)]
+
+
+def _meeting(num_turns: int, seed: int = 0) -> tuple[list[dict[str, float] | None], list[float]]:
+    """Language stretches of 20-200 turns like Whisper's language ID reports them.
+
+    Soft distributions over the inventory, 10% of turns leaning towards another
+    language, short turns left undetected and some exact ties.
+    """
+    rng = np.random.default_rng(seed)
+    rows: list[dict[str, float] | None] = []
+    durations: list[float] = []
+    while len(rows) < num_turns:
+        language = INVENTORY[int(rng.integers(len(INVENTORY)))]
+        for _ in range(int(rng.integers(20, 200))):
+            duration = float(rng.uniform(0.3, 20.0))
+            draw = rng.random()
+            if duration < 1.0:
+                rows.append(None)
+            elif draw < 0.05:
+                rows.append({"de": 0.45, "fr": 0.45, "en": 0.1})
+            else:
+                leaning = INVENTORY[int(rng.integers(len(INVENTORY)))] if draw < 0.15 else language
+                probs = rng.dirichlet(np.ones(len(INVENTORY))) * 0.2
+                probs[INVENTORY.index(leaning)] += 0.8
+                rows.append(dict(zip(INVENTORY, probs.tolist())))
+            durations.append(duration)
+    return rows[:num_turns], durations[:num_turns]
+
+
+@pytest.mark.parametrize("num_turns", [1_000, 10_000, 100_000])
+def test_viterbi_scales_to_long_meetings(num_turns: int):
+    rows, durations = _meeting(num_turns)
+
+    expected, reference_s = best_of(3, _reference_viterbi, rows, durations, INVENTORY, SWITCH_PENALTY, EVIDENCE_CAP_S)
+    actual, numpy_s = best_of(3, viterbi_smooth_languages, rows, durations, INVENTORY, SWITCH_PENALTY, EVIDENCE_CAP_S)
+
+    print(f"\n{num_turns} turns: python {reference_s * 1000:.1f} ms, numpy {numpy_s * 1000:.1f} ms")
+    assert actual == expected
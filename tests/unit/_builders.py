@@ -0,0 +1,117 @@
+"""Stand-ins for faster-whisper segments, transcription info, models and replica pools.
+Shared by the unit tests that drive the handler and model manager without a real model."""
+
+import contextlib
+import dataclasses
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from faster_whisper.transcribe import Segment as FWSegment
+from faster_whisper.transcribe import Word as FWWord
+
+from bentoml_faster_whisper.config import Quantization
+from bentoml_faster_whisper.services.replica_pool import ReplicaPool
+from bentoml_faster_whisper.utils.core import Segment
+
+
+def fw_word(start: float, end: float, word: str) -> FWWord:
+    return FWWord(start=start, end=end, word=word, probability=1.0)
+
+
+def fw_segment(start, end, words=None, seg_id=0, **overrides) -> FWSegment:
+    fields = {
+        "id": seg_id,
+        "seek": 0,
+        "start": start,
+        "end": end,
+        "text": "".join(w.word for w in words) if words else "silence",
+        "tokens": [],
+        "avg_logprob": 0.0,
+        "compression_ratio": 1.0,
+        "no_speech_prob": 0.0,
+        "words": words,
+        "temperature": 0.0,
+    }
+    return FWSegment(**{**fields, **overrides})
+
+
+def core_segment(**overrides: Any) -> Segment:
+    defaults: dict[str, Any] = {
+        "id": 0,
+        "seek": 0,
+        "start": 0.0,
+        "end": 2.0,
+        "text": " Mein Name ist Janik.",
+        "tokens": [],
+        "temperature": 0.0,
+        "avg_logprob": -0.3,
+        "compression_ratio": 1.1,
+        "no_speech_prob": 0.05,
+        "words": None,
+    }
+    return Segment(**{**defaults, **overrides})
+
+
+def cleaner_info(language="de", log_prob_threshold=-1.0):
+    return SimpleNamespace(
+        language=language,
+        transcription_options=SimpleNamespace(log_prob_threshold=log_prob_threshold),
+    )
+
+
+@dataclasses.dataclass
+class Info:
+    """Minimal stand-in for faster_whisper TranscriptionInfo."""
+
+    language: str = "de"
+    language_probability: float = 0.9
+    all_language_probs: Any = None
+    duration: float = 0.0
+
+
+class FakeCTranslate2Whisper:
+    def __init__(self) -> None:
+        self.unloaded = False
+
+    def unload_model(self) -> None:
+        self.unloaded = True
+
+
+class FakeWhisperModel:
+    def __init__(self, model_id: str, compute_type: Quantization | None = None) -> None:
+        self.model_id = model_id
+        self.compute_type = compute_type
+        self.model = FakeCTranslate2Whisper()
+
+
+class FakeReplica:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def transcribe(self, audio, **kwargs):
+        return iter([f"{self.name}:{audio}"]), {"replica": self.name}
+
+
+def replica_pool(count: int) -> ReplicaPool:
+    return ReplicaPool((f"m/{i}", FakeReplica(f"r{i}")) for i in range(count))
+
+
+@contextlib.contextmanager
+def pool_with_request_arriving_during_encode(replicas: list) -> Iterator[ReplicaPool]:
+    """A pool of ``replicas`` in which another request takes a replica while the first one encodes.
+
+    Left to the least-loaded replica, a call following that ``encode()`` would go elsewhere.
+    """
+    pool = ReplicaPool((f"m/{i}", replica) for i, replica in enumerate(replicas))
+    other_request = pool.acquire()
+    encode = replicas[0].encode
+
+    def encode_while_another_request_arrives(features):
+        other_request.__enter__()
+        return encode(features)
+
+    replicas[0].encode = encode_while_another_request_arrives
+    try:
+        yield pool
+    finally:
+        other_request.__exit__(None, None, None)
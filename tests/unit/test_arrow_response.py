@@ -0,0 +1,76 @@
+"""The columnar ``arrow`` response format."""
+
+import pyarrow as pa
+
+from bentoml_faster_whisper.models.enums import ResponseFormat
+from bentoml_faster_whisper.models.output_models import content_type_for_format, segments_to_response
+from bentoml_faster_whisper.models.transcription_arrow_response import ARROW_MEDIA_TYPE, ARROW_SCHEMA
+from bentoml_faster_whisper.utils.core import Word
+from tests.unit._builders import Info, core_segment
+
+SEGMENTS = [
+    core_segment(
+        id=0,
+        start=0.0,
+        end=1.25,
+        text=" Grüezi mitenand",
+        words=[
+            Word(start=0.0, end=0.5, word=" Grüezi", probability=0.9, speaker="SPEAKER_00"),
+            Word(start=0.5, end=1.25, word=" mitenand", probability=0.75, speaker="SPEAKER_01"),
+        ],
+        speaker="SPEAKER_00",
+        language="de",
+    ),
+    core_segment(id=1, start=1.25, end=2.0, text=" …", language="de"),
+    core_segment(
+        id=2,
+        start=2.0,
+        end=3.0,
+        text=" Merci",
+        words=[Word(start=2.0, end=3.0, word=" Merci", probability=0.5, speaker="SPEAKER_00")],
+        speaker="SPEAKER_00",
+        language="de",
+    ),
+]
+
+
+def _table(body: bytes) -> pa.Table:
+    return pa.ipc.open_stream(body).read_all()
+
+
+def test_arrow_body_holds_flat_word_columns_and_segment_offsets():
+    body = segments_to_response(SEGMENTS, Info(duration=42.0), ResponseFormat.ARROW)
+
+    assert isinstance(body, bytes)
+    table = _table(body)
+    assert table.schema.remove_metadata() == ARROW_SCHEMA
+    assert table.schema.metadata == {b"language": b"de", b"duration": b"42.0"}
+    assert table["id"].to_pylist() == [0, 1, 2]
+    assert table["text"].to_pylist() == [" Grüezi mitenand", " …", " Merci"]
+
+    word_start = table["word_start"].combine_chunks()
+    assert word_start.offsets.to_pylist() == [0, 2, 2, 3]
+    assert word_start.values.to_pylist() == [0.0, 0.5, 2.0]
+    assert table["word_end"].combine_chunks().values.to_pylist() == [0.5, 1.25, 3.0]
+    assert table["word"].combine_chunks().values.to_pylist() == [" Grüezi", " mitenand", " Merci"]
+    assert table["word_probability"].combine_chunks().values.to_pylist() == [0.8999999761581421, 0.75, 0.5]
+
+
+def test_arrow_speakers_are_dictionary_codes():
+    table = _table(segments_to_response(SEGMENTS, Info(duration=42.0), ResponseFormat.ARROW))
+
+    speakers = table["speaker"].combine_chunks()
+    assert speakers.indices.to_pylist() == [0, None, 0]
+    assert speakers.dictionary.to_pylist() == ["SPEAKER_00"]
+    word_speakers = table["word_speaker"].combine_chunks().values
+    assert word_speakers.indices.to_pylist() == [0, 1, 0]
+    assert word_speakers.dictionary.to_pylist() == ["SPEAKER_00", "SPEAKER_01"]
+    assert table["language"].combine_chunks().dictionary.to_pylist() == ["de"]
+
+
+def test_arrow_body_of_an_empty_transcript_has_the_schema():
+    table = _table(segments_to_response([], Info(duration=42.0), ResponseFormat.ARROW))
+
+    assert table.num_rows == 0
+    assert table.schema.remove_metadata() == ARROW_SCHEMA
+    assert content_type_for_format(ResponseFormat.ARROW) == ARROW_MEDIA_TYPE
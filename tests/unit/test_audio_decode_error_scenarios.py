@@ -28,7 +28,7 @@ def test_prepare_audio_segments_propagates_transcribe_runtime_error():
     model_manager = MagicMock()
     whisper_mock = MagicMock()
     whisper_mock.transcribe.side_effect = RuntimeError("CUDA out of memory during transcribe")
-    model_manager.get.return_value = whisper_mock
+    model_manager.lease.return_value.model = whisper_mock
 
     handler = FasterWhisperHandler(model_manager=model_manager, diarization=MagicMock())
     request = TranscriptionRequest.model_validate(
@@ -45,7 +45,7 @@ def test_translate_audio_propagates_transcribe_runtime_error():
     model_manager = MagicMock()
     whisper_mock = MagicMock()
     whisper_mock.transcribe.side_effect = RuntimeError("CUDA out of memory during translate")
-    model_manager.get.return_value = whisper_mock
+    model_manager.lease.return_value.__enter__.return_value = whisper_mock
 
     handler = FasterWhisperHandler(model_manager=model_manager, diarization=MagicMock())
     request = TranslationRequest.model_validate({"file": "/tmp/dummy.mp3", "response_format": ResponseFormat.JSON})
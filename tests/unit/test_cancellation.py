@@ -0,0 +1,288 @@
+"""Cooperative cancellation: abandoned or overdue requests stop diarizing and decoding within one step."""
+
+import threading
+from types import SimpleNamespace
+
+import anyio
+import anyio.to_thread
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.service import _request_cancellation
+from bentoml_faster_whisper.services.diarization_service import _DiarizationProgressHook
+from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
+from bentoml_faster_whisper.utils.cancellation import (
+    PROBE_INTERVAL_S,
+    CancellationToken,
+    DeadlineExceeded,
+    RequestCancelled,
+)
+from bentoml_faster_whisper.utils.language_id import detect_turn_language_probs
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE, turns_to_language_runs
+from tests.unit._builders import Info, fw_segment
+
+
+def test_check_raises_once_cancelled_and_keeps_first_reason():
+    token = CancellationToken()
+    token.check()
+
+    token.cancel("client disconnected")
+    token.cancel("segments closed")
+
+    assert token.cancelled
+    with pytest.raises(RequestCancelled, match="client disconnected"):
+        token.check()
+
+
+def test_probe_is_rate_limited_but_unknown_answers_are_retried():
+    answers = iter([None, None, False, True])
+    calls: list[int] = []
+
+    def probe():
+        calls.append(1)
+        return next(answers)
+
+    token = CancellationToken(probe=probe, probe_interval_s=3600)
+    token.check()
+    token.check()
+    token.check()  # False: the next probe is due in an hour
+    token.check()
+
+    assert len(calls) == 3
+    assert not token.cancelled
+
+
+def test_probe_reporting_gone_cancels():
+    token = CancellationToken(probe=lambda: True)
+
+    with pytest.raises(RequestCancelled):
+        token.check()
+    assert token.cancelled
+
+
+def test_checked_stops_pulling_and_closes_the_source():
+    pulled: list[int] = []
+    closed = threading.Event()
+
+    def windows():
+        try:
+            for i in range(10):
+                pulled.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    token = CancellationToken()
+    stream = token.checked(windows())
+    assert next(stream) == 0
+    token.cancel()
+
+    with pytest.raises(RequestCancelled):
+        next(stream)
+    assert pulled == [0]
+    assert closed.is_set()
+
+
+def test_service_token_notices_a_disconnected_client_from_the_api_thread():
+    disconnected = False
+
+    async def is_disconnected() -> bool:
+        return disconnected
+
+    token = _request_cancellation(SimpleNamespace(request=SimpleNamespace(is_disconnected=is_disconnected)))
+    token.check()  # not on a BentoML worker thread: cannot tell, keeps going
+
+    def check_on_worker_thread() -> bool:
+        try:
+            token.check()
+        except RequestCancelled:
+            return True
+        return False
+
+    async def serve() -> tuple[bool, bool]:
+        nonlocal disconnected
+        before = await anyio.to_thread.run_sync(check_on_worker_thread)
+        disconnected = True
+        await anyio.sleep(PROBE_INTERVAL_S)
+        return before, await anyio.to_thread.run_sync(check_on_worker_thread)
+
+    assert anyio.run(serve) == (False, True)
+
+
+def test_deadline_fails_fast_with_gateway_timeout():
+    token = CancellationToken(deadline_s=0.0)
+
+    with pytest.raises(DeadlineExceeded) as exc_info:
+        token.check()
+    assert exc_info.value.error_code == 504
+    assert token.cancelled
+    # Later checks keep reporting the deadline, not a generic cancellation.
+    with pytest.raises(DeadlineExceeded):
+        token.check()
+
+
+def test_partial_deadline_truncates_streams_but_full_checks_still_fail():
+    token = CancellationToken(deadline_s=0.0, partial_on_deadline=True)
+
+    assert list(token.checked(range(5))) == []
+    assert token.truncated
+    assert not token.cancelled
+    with pytest.raises(DeadlineExceeded):
+        token.check()
+
+
+def test_language_id_stops_between_batches_past_the_deadline():
+    encoded: list[int] = []
+    cancel = CancellationToken(deadline_s=3600)
+
+    class _Extractor:
+        nb_max_frames = 3000
+
+        def __call__(self, audio):
+            return np.zeros((80, len(audio) // 160), dtype=np.float32)
+
+    def encode(features):
+        encoded.append(len(features))
+        cancel._deadline = 0.0  # the first batch used up the remaining time
+        return features
+
+    whisper = SimpleNamespace(
+        feature_extractor=_Extractor(),
+        encode=encode,
+        model=SimpleNamespace(detect_language=lambda output: [[("<|de|>", 1.0)]] * len(output)),
+    )
+    decoded = np.zeros(40 * WHISPER_SAMPLE_RATE, dtype=np.float32)
+    turns = [(i * 4.0, i * 4.0 + 3.0) for i in range(10)]
+
+    with pytest.raises(DeadlineExceeded):
+        detect_turn_language_probs(whisper, decoded, turns, batch_size=2, min_turn_s=1.0, cancel=cancel)  # type: ignore
+    assert encoded == [2]
+
+
+def test_diarization_hook_raises_once_cancelled():
+    token = CancellationToken()
+    hook = _DiarizationProgressHook(None, token)
+    hook("segmentation", None, total=10, completed=1)
+
+    token.cancel()
+    with pytest.raises(RequestCancelled):
+        hook("embeddings", None, total=10, completed=2)
+
+
+class _WindowedWhisper:
+    """Each run lazily yields one segment per 'window'; ``on_window`` runs before each one."""
+
+    def __init__(self, on_window) -> None:
+        self._on_window = on_window
+        self._lock = threading.Lock()
+        self.started = 0
+        self.windows = 0
+
+    def transcribe(self, audio, language=None, vad_filter=False, **options):
+        with self._lock:
+            self.started += 1
+            run = self.started
+
+        def windows():
+            for i in range(10):
+                with self._lock:
+                    self.windows += 1
+                self._on_window(run, i)
+                yield fw_segment(float(i), float(i) + 0.5, seg_id=i, seek=i, text=" x")
+
+        return windows(), Info(language=language or "de")
+
+
+def _decode(whisper, num_workers: int, cancel: CancellationToken):
+    turns = [(i * 30.0, i * 30.0 + 15.0) for i in range(12)]
+    assert len(turns_to_language_runs(turns, ["de"] * len(turns))) > num_workers
+    total_s = turns[-1][1] + 5.0
+    decoded = np.zeros(int(total_s * WHISPER_SAMPLE_RATE), dtype=np.float32)
+    model_manager = SimpleNamespace(whisper_config=SimpleNamespace(num_workers=num_workers))
+    handler = FasterWhisperHandler(model_manager=model_manager, diarization=SimpleNamespace())  # type: ignore
+    return handler._decode_language_runs(
+        whisper,  # type: ignore
+        decoded,
+        turns,
+        ["de"] * len(turns),
+        total_s,
+        decode_options={},
+        tag_language=False,
+        cancel=cancel,
+    )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_cancelled_request_drops_queued_runs_and_stops_running_ones_within_a_window(num_workers: int):
+    cancel = CancellationToken()
+
+    def on_window(run: int, window: int) -> None:
+        if run == 1 and window == 1:
+            cancel.cancel("client disconnected")
+
+    whisper = _WindowedWhisper(on_window)
+
+    with pytest.raises(RequestCancelled):
+        _decode(whisper, num_workers, cancel)
+
+    assert whisper.started <= num_workers, "queued runs must not start after cancellation"
+    # Run 1 stops after the window that cancelled; a concurrent run decodes at most one more.
+    assert whisper.windows <= 2 + (num_workers - 1) * 2
+
+
+def test_failing_run_cancels_the_others():
+    cancel = CancellationToken()
+    windows_per_run: dict[int, int] = {}
+    second_run_started = threading.Event()
+
+    def on_window(run: int, window: int) -> None:
+        windows_per_run[run] = window + 1
+        if run == 2 and window == 0:
+            second_run_started.set()
+            assert _wait_until(lambda: cancel.cancelled)
+        if run == 1 and window == 0:
+            second_run_started.wait(timeout=5)
+            raise ValueError("decoder blew up")
+
+    whisper = _WindowedWhisper(on_window)
+
+    with pytest.raises(ValueError, match="decoder blew up"):
+        _decode(whisper, 2, cancel)
+
+    assert cancel.cancelled
+    # The surviving run stops at its next window instead of decoding to the end.
+    assert windows_per_run[2] == 1
+    assert all(count <= 1 for count in windows_per_run.values())
+
+
+def test_partial_deadline_keeps_the_runs_decoded_so_far():
+    cancel = CancellationToken(deadline_s=3600, partial_on_deadline=True)
+
+    def on_window(run: int, window: int) -> None:
+        if run == 2 and window == 3:
+            cancel._deadline = 0.0
+
+    whisper = _WindowedWhisper(on_window)
+    segments, _ = _decode(whisper, 1, cancel)
+    segments = list(segments)
+
+    assert cancel.truncated
+    assert whisper.started == 2, "runs queued after the deadline must not start"
+    # Run 1 decoded in full, run 2 up to the window that hit the deadline.
+    assert len(segments) == 10 + 4
+
+
+def test_partial_deadline_before_any_run_still_fails():
+    cancel = CancellationToken(deadline_s=0.0, partial_on_deadline=True)
+
+    with pytest.raises(DeadlineExceeded):
+        _decode(_WindowedWhisper(lambda run, window: None), 2, cancel)
+
+
+def _wait_until(condition, timeout_s: float = 5.0) -> bool:
+    event = threading.Event()
+    for _ in range(int(timeout_s / 0.01)):
+        if condition():
+            return True
+        event.wait(0.01)
+    return False
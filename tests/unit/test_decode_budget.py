@@ -0,0 +1,140 @@
+"""Per-request decode budget: option cut-back tiers, fallback counting and segment flagging."""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
+from bentoml_faster_whisper.utils.decode_budget import DecodeBudget
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+from tests.unit._builders import Info, fw_segment
+
+TEMPERATURES = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+OPTIONS = {"temperature": TEMPERATURES, "best_of": 5, "beam_size": 5}
+
+
+def _budget(budget_s: float | None, elapsed_s: float) -> DecodeBudget:
+    return DecodeBudget(budget_s, TEMPERATURES, t0=time.perf_counter() - elapsed_s)
+
+
+def test_unbudgeted_and_early_runs_keep_request_options():
+    for budget in (_budget(None, 1_000.0), _budget(10.0, 1.0)):
+        options, degraded = budget.run_options(OPTIONS)
+        assert options is OPTIONS
+        assert not degraded
+
+
+def test_past_half_budget_allows_one_fallback_and_narrow_beam():
+    options, degraded = _budget(10.0, 6.0).run_options(OPTIONS)
+    assert degraded
+    assert options["temperature"] == [0.0, 0.2]
+    assert options["best_of"] == 2
+    assert options["beam_size"] == 2
+
+
+def test_spent_budget_decodes_greedily_at_first_temperature():
+    options, degraded = _budget(10.0, 11.0).run_options(OPTIONS)
+    assert degraded
+    assert options == {"temperature": [0.0], "best_of": 1, "beam_size": 1}
+
+
+def test_options_already_within_tier_are_not_degraded():
+    greedy = {"temperature": [0.0], "best_of": 1, "beam_size": 1}
+    options, degraded = _budget(10.0, 11.0).run_options(greedy)
+    assert options == greedy
+    assert not degraded
+
+
+def test_track_counts_fallbacks_once_per_window():
+    budget = _budget(None, 0.0)
+    windows = [
+        SimpleNamespace(seek=0, temperature=0.0),
+        SimpleNamespace(seek=3000, temperature=0.4),
+        SimpleNamespace(seek=3000, temperature=0.4),
+        SimpleNamespace(seek=6000, temperature=0.2),
+    ]
+    assert list(budget.track(windows)) == windows
+    assert budget.fallbacks == 2 + 1
+
+
+class _RecordingWhisper:
+    def __init__(self, segment_s: float | None = None) -> None:
+        self.segment_s = segment_s
+        self.options: list[dict] = []
+
+    def transcribe(self, audio, language=None, vad_filter=False, **options):
+        self.options.append({"language": language, **options})
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        starts = np.arange(0.0, duration, self.segment_s or duration)
+        segments = [
+            fw_segment(
+                float(start),
+                min(float(start) + (self.segment_s or duration), duration),
+                seg_id=index,
+                text=" hallo",
+                temperature=0.2,
+            )
+            for index, start in enumerate(starts)
+        ]
+        return iter(segments), Info()
+
+
+@pytest.mark.parametrize(("elapsed_s", "expect_degraded"), [(0.0, False), (20.0, True)])
+def test_decode_runs_use_budgeted_options_and_flag_segments(elapsed_s: float, expect_degraded: bool):
+    handler = FasterWhisperHandler(
+        model_manager=SimpleNamespace(whisper_config=SimpleNamespace(num_workers=1)),  # type: ignore
+        diarization=SimpleNamespace(),  # type: ignore
+    )
+    whisper = _RecordingWhisper()
+    turns = [(0.0, 5.0)]
+    decoded = np.zeros(10 * WHISPER_SAMPLE_RATE, dtype=np.float32)
+    budget = _budget(10.0, elapsed_s)
+
+    segments, _ = handler._decode_language_runs(
+        whisper,  # type: ignore
+        decoded,
+        turns,
+        ["de"],
+        10.0,
+        decode_options=dict(OPTIONS),
+        tag_language=False,
+        budget=budget,
+    )
+
+    produced = list(segments)
+    assert produced
+    assert all(seg.degraded is expect_degraded for seg in produced)
+    assert (whisper.options[0]["beam_size"] == 1) is expect_degraded
+    assert budget.fallbacks == 1
+
+
+def test_single_run_restarts_with_cut_back_options_once_the_budget_runs_low():
+    whisper = _RecordingWhisper(segment_s=5.0)
+    decoded = np.zeros(20 * WHISPER_SAMPLE_RATE, dtype=np.float32)
+    budget = _budget(10.0, 0.0)
+
+    segments, info = FasterWhisperHandler._transcribe_budgeted(
+        whisper,  # type: ignore
+        decoded,
+        budget,
+        dict(OPTIONS),
+        language=None,
+    )
+    produced = []
+    for segment in segments:
+        produced.append(segment)
+        if len(produced) == 2:
+            budget.t0 -= 6.0  # past half the budget while the run decodes
+
+    assert info.language == "de"
+    assert [(seg.start, seg.end, seg.degraded) for seg in produced] == [
+        (0.0, 5.0, False),
+        (5.0, 10.0, False),
+        (10.0, 15.0, True),
+        (15.0, 20.0, True),
+    ]
+    assert [options["beam_size"] for options in whisper.options] == [5, 2]
+    assert whisper.options[1]["language"] == "de"
+    assert budget.fallbacks == 2
@@ -6,7 +6,6 @@ finishes in microseconds after all the work is done. The decode phase must there
 report its own progress as runs complete.
 """
 
-import dataclasses
 import threading
 from types import SimpleNamespace
 from typing import Any
@@ -20,14 +19,7 @@ from bentoml_faster_whisper.models.transcription_request import TranscriptionReq
 from bentoml_faster_whisper.service import FasterWhisper
 from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
 from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE, turns_to_language_runs
-
-
-@dataclasses.dataclass
-class _Info:
-    language: str = "de"
-    language_probability: float = 0.9
-    all_language_probs: Any = None
-    duration: float = 0.0
+from tests.unit._builders import Info
 
 
 class _FakeWhisper:
@@ -52,7 +44,7 @@ class _FakeWhisper:
             words=None,
             temperature=0.0,
         )
-        return iter([segment]), _Info(language=language or "de")
+        return iter([segment]), Info(language=language or "de")
 
 
 def _handler(num_workers: int) -> FasterWhisperHandler:
@@ -107,7 +99,9 @@ class _ProgressReportingHandler:
         self._segments = segments
         self._info = info
 
-    def prepare_audio_segments(self, request, diarization_progress_callback=None, decode_progress_callback=None):
+    def prepare_audio_segments(
+        self, request, diarization_progress_callback=None, decode_progress_callback=None, cancel=None
+    ):
         if diarization_progress_callback is not None:
             diarization_progress_callback(1.0)
         if decode_progress_callback is not None:
@@ -0,0 +1,134 @@
+"""Request-scoped encoder outputs: language ID's turn windows reused by single-turn decode runs."""
+
+from types import SimpleNamespace
+
+import ctranslate2
+import numpy as np
+import pytest
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from bentoml_faster_whisper.config import CascadeConfig
+from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
+from bentoml_faster_whisper.utils.encoder_cache import EncoderCache, install_encoder_cache
+from bentoml_faster_whisper.utils.feature_store import FeatureStore, StoredFeatureExtractor
+from bentoml_faster_whisper.utils.language_id import detect_turn_language_probs
+from bentoml_faster_whisper.utils.model_cascade import CascadeWhisper
+from bentoml_faster_whisper.utils.speech_regions import (
+    SPEECH_PAD_S,
+    WHISPER_SAMPLE_RATE,
+    collapse_decoded_to_speech,
+    turns_to_language_runs,
+)
+
+SR = WHISPER_SAMPLE_RATE
+
+
+def _fake_whisper(encoded: list[int]) -> SimpleNamespace:
+    def encode(features):
+        batch = features if features.ndim == 3 else features[None]
+        encoded.append(batch.shape[0])
+        # A stand-in encoder output: the mean of every mel bin, per batch item.
+        return ctranslate2.StorageView.from_array(np.ascontiguousarray(batch.mean(axis=-1, keepdims=True)))
+
+    whisper = SimpleNamespace(
+        feature_extractor=StoredFeatureExtractor(FeatureExtractor()),
+        encode=encode,
+        model=SimpleNamespace(
+            device="cpu",
+            device_index=[0],
+            detect_language=lambda output: [[("<|de|>", 1.0)]] * output.shape[0],
+        ),
+    )
+    install_encoder_cache(whisper, "large-v3")  # type: ignore[arg-type]
+    return whisper
+
+
+def _first_decode_window(whisper, store: FeatureStore, decoded: np.ndarray, turns, languages) -> np.ndarray:
+    """The features transcribe() encodes first for the first run of ``turns``."""
+    _, run_intervals = turns_to_language_runs(turns, languages)[0]
+    collapsed = collapse_decoded_to_speech(decoded, run_intervals)
+    assert collapsed is not None
+    features = whisper.feature_extractor(store.attach(*collapsed))
+    content_frames = features.shape[-1] - 1
+    return pad_or_trim(features[:, : min(whisper.feature_extractor.nb_max_frames, content_frames)])
+
+
+@pytest.fixture(scope="module")
+def decoded() -> np.ndarray:
+    rng = np.random.default_rng(1)
+    return (0.1 * rng.standard_normal(60 * SR)).astype(np.float32)
+
+
+def test_single_turn_run_reuses_the_language_id_encoding(decoded):
+    encoded: list[int] = []
+    whisper = _fake_whisper(encoded)
+    store = FeatureStore(decoded)
+    cache = EncoderCache(2**20)
+    turns = [(2.0, 9.5), (20.0, 26.0)]
+
+    rows = detect_turn_language_probs(
+        whisper,  # type: ignore[arg-type]
+        decoded,
+        turns,
+        feature_store=store,
+        pad_s=SPEECH_PAD_S,
+        encoder_cache=cache,
+    )
+    assert rows == [{"de": 1.0}, {"de": 1.0}]
+    assert encoded == [2]
+
+    window = _first_decode_window(whisper, store, decoded, turns, ["de", "fr"])
+    with cache.serving():
+        output = whisper.encode(window)
+        whisper.encode(np.zeros_like(window))
+    assert encoded == [2, 1], "only the unseen window reaches the encoder"
+    np.testing.assert_array_equal(np.array(output)[0, :, 0], window.mean(axis=-1))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_windows_are_only_reused_for_the_same_model_and_device(decoded):
+    encoded: list[int] = []
+    whisper = _fake_whisper(encoded)
+    window = np.ones((80, 3000), dtype=np.float32)
+    cache = EncoderCache(2**20)
+    cache.store("small", [window], whisper.encode(window[None]))
+    assert cache.lookup("large-v3", ("cpu", 0), window) is None
+    assert cache.lookup("small", ("cuda", 0), window) is None
+    assert cache.lookup("small", ("cpu", 0), window) is not None
+
+    # Outside serving(), and for batches, the model always encodes.
+    cache.store("large-v3", [window], whisper.encode(window[None]))
+    whisper.encode(window)
+    with cache.serving():
+        whisper.encode(window[None])
+    assert encoded == [1, 1, 1, 1]
+
+
+def test_nothing_is_cached_when_a_draft_model_decodes_the_runs():
+    large, draft = _fake_whisper([]), _fake_whisper([])
+    cascade = CascadeWhisper(draft, large, CascadeConfig(draft_model="small"))  # type: ignore[arg-type]
+
+    assert FasterWhisperHandler._request_encoder_cache(cascade) is None  # type: ignore[arg-type]
+    assert isinstance(FasterWhisperHandler._request_encoder_cache(large), EncoderCache)  # type: ignore[arg-type]
+
+
+def test_budget_and_unmarked_windows_bound_what_is_kept():
+    windows = [np.full((80, 3000), float(i), dtype=np.float32) for i in range(3)]
+    output = ctranslate2.StorageView.from_array(np.zeros((3, 1500, 64), dtype=np.float32))
+    item_bytes = 1500 * 64 * 4
+
+    cache = EncoderCache(2 * item_bytes)
+    cache.store("m", [windows[0], None, windows[2]], output)
+    assert cache.used_bytes == 2 * item_bytes
+    assert cache.lookup("m", ("cpu", 0), windows[1]) is None
+    assert cache.lookup("m", ("cpu", 0), windows[2]) is not None
+
+    full = EncoderCache(item_bytes)
+    full.store("m", windows, output)
+    assert full.used_bytes == item_bytes
+    assert [full.lookup("m", ("cpu", 0), w) is not None for w in windows] == [True, False, False]
+
+    disabled = EncoderCache(0)
+    disabled.store("m", windows, output)
+    assert disabled.used_bytes == 0
@@ -0,0 +1,114 @@
+"""Per-request log-mel store: computed once per file, sliced per turn and decode run."""
+
+import numpy as np
+import pytest
+from faster_whisper.feature_extractor import FeatureExtractor
+
+from bentoml_faster_whisper.utils import feature_store as feature_store_module
+from bentoml_faster_whisper.utils.feature_store import FeatureStore, StoredFeatureExtractor
+
+SR = 16000
+
+
+@pytest.fixture(scope="module")
+def audio() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(75 * SR) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.shape[0])).astype(np.float32)
+
+
+def test_whole_file_matches_the_extractor(audio):
+    extractor = FeatureExtractor()
+
+    features = FeatureStore(audio).features(extractor, [{"start": 0, "end": audio.shape[0]}])
+
+    expected = extractor(audio)
+    assert features.shape == expected.shape
+    np.testing.assert_allclose(features, expected, atol=1e-4)
+
+
+def test_turn_slice_matches_extracting_the_turn_away_from_its_edges(audio):
+    extractor = FeatureExtractor()
+    chunk = {"start": 40 * 160, "end": 40 * 160 + 12 * SR}
+
+    features = FeatureStore(audio).features(extractor, [chunk])
+
+    expected = extractor(audio[chunk["start"] : chunk["end"]])
+    assert features.shape == expected.shape
+    np.testing.assert_allclose(features[:, 3:-3], expected[:, 3:-3], atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [{"start": 1234, "end": 5 * SR + 77}],
+        [{"start": 100, "end": 3 * SR}, {"start": 10 * SR + 5, "end": 31 * SR + 999}],
+        [{"start": 70 * SR, "end": 75 * SR}],
+    ],
+)
+def test_frame_count_matches_extracting_the_concatenated_chunks(audio, chunks):
+    extractor = FeatureExtractor()
+    concatenated = np.concatenate([audio[c["start"] : c["end"]] for c in chunks])
+
+    features = FeatureStore(audio).features(extractor, chunks)
+
+    assert features.shape == extractor(concatenated).shape
+
+
+def test_each_block_is_computed_once_per_mel_configuration(audio, monkeypatch):
+    computed: list[tuple[int, int]] = []
+    real_stft = FeatureExtractor.stft
+
+    def counting_stft(samples, n_fft, hop_length, **kwargs):
+        computed.append((n_fft, samples.shape[0]))
+        return real_stft(samples, n_fft, hop_length, **kwargs)
+
+    store = FeatureStore(audio)
+    small, large = FeatureExtractor(), FeatureExtractor(feature_size=128)
+    monkeypatch.setattr(small, "stft", counting_stft)
+    monkeypatch.setattr(large, "stft", counting_stft)
+
+    store.features(small, [{"start": 0, "end": 20 * SR}])
+    store.features(small, [{"start": 5 * SR, "end": 25 * SR}, {"start": 50 * SR, "end": 55 * SR}])
+    store.features(small, [{"start": 0, "end": 20 * SR}])
+    assert len(computed) == 2  # blocks 0-30 s and 30-60 s
+    assert store.features(large, [{"start": 0, "end": 20 * SR}]).shape[0] == 128
+    assert len(computed) == 3
+    assert feature_store_module.BLOCK_FRAMES * 160 == 30 * SR
+
+
+def test_only_recently_used_blocks_stay_cached_and_stft_runs_unlocked(audio, monkeypatch):
+    computed: list[int] = []
+    store = FeatureStore(audio)
+    extractor = FeatureExtractor()
+    real_stft = extractor.stft
+
+    def counting_stft(samples, n_fft, hop_length, **kwargs):
+        assert not store._lock.locked()
+        computed.append(samples.shape[0])
+        return real_stft(samples, n_fft, hop_length, **kwargs)
+
+    monkeypatch.setattr(extractor, "stft", counting_stft)
+    monkeypatch.setattr(feature_store_module, "MAX_CACHED_BLOCKS", 2)
+
+    first = store.features(extractor, [{"start": 0, "end": 5 * SR}])
+    store.features(extractor, [{"start": 35 * SR, "end": 40 * SR}, {"start": 65 * SR, "end": 70 * SR}])
+    assert len(computed) == 3
+    again = store.features(extractor, [{"start": 0, "end": 5 * SR}])  # block 0 was evicted
+
+    assert len(computed) == 4
+    np.testing.assert_array_equal(first, again)
+
+
+def test_stored_extractor_serves_attached_audio_from_the_store(audio):
+    extractor = StoredFeatureExtractor(FeatureExtractor())
+    store = FeatureStore(audio)
+    chunks = [{"start": 0, "end": 2 * SR}, {"start": 4 * SR, "end": 6 * SR}]
+    run_audio = np.concatenate([audio[c["start"] : c["end"]] for c in chunks])
+    attached = store.attach(run_audio, chunks)
+
+    np.testing.assert_array_equal(extractor(attached), store.features(extractor, chunks))
+    # Spans cut out of attached audio are plain audio again and get extracted as usual.
+    span = attached[SR : 3 * SR]
+    np.testing.assert_array_equal(extractor(span), FeatureExtractor()(np.asarray(span)))
+    assert extractor.nb_max_frames == 3000
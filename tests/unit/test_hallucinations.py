@@ -0,0 +1,65 @@
+"""Normalized, indexed matching of known Whisper hallucinations."""
+
+import pytest
+
+from bentoml_faster_whisper.utils.hallucinations import (
+    ANY_LANGUAGE,
+    HallucinationMatcher,
+    detect_hallucinations,
+    load_hallucination_patterns,
+)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        " Untertitel der Amara.org-Community",
+        "untertitel der amara.org community!",
+        " SWR 2021",
+        " Untertitel im Auftrag des ZDF, 2024.",
+        "  UNTERTITEL   im Auftrag des ZDF 2017",
+        " - Untertitel der Amara.org-Community",
+        "Untertitel/der Amara.org-Community",
+    ],
+)
+def test_variants_of_a_known_hallucination_match(text):
+    assert detect_hallucinations(text, "de")
+
+
+@pytest.mark.parametrize(
+    "text, language",
+    [
+        (" Untertitel sind für Gehörlose wichtig.", "de"),
+        (" Untertitel der Amara.org-Community", "en"),
+        (" Im Auftrag des ZDF, 2017", "de"),
+        (" SWR.", "de"),
+        ("", "de"),
+        (" ...", "de"),
+    ],
+)
+def test_speech_and_other_languages_do_not_match(text, language):
+    assert not detect_hallucinations(text, language)
+
+
+def test_entries_without_words_match_their_exact_text_only():
+    matcher = HallucinationMatcher({"ru": {" ???? ?.????"}})
+
+    assert matcher("???? ?.????", "ru")
+    assert not matcher("?", "ru")
+
+
+def test_pattern_file_adds_phrases_for_one_or_every_language(tmp_path):
+    path = tmp_path / "hallucinations.tsv"
+    path.write_text("# deployment extras\n\nde\tVielen Dank fürs Zuschauen\n*\tSubscribe to my channel\n")
+
+    phrases = load_hallucination_patterns(str(path))
+    matcher = HallucinationMatcher(phrases)
+
+    assert phrases == {"de": {"Vielen Dank fürs Zuschauen"}, ANY_LANGUAGE: {"Subscribe to my channel"}}
+    assert matcher(" Vielen Dank fürs Zuschauen!", "de")
+    assert not matcher(" Vielen Dank fürs Zuschauen!", "fr")
+    assert matcher(" subscribe to my channel.", "fr")
+
+    path.write_text("de Vielen Dank\n")
+    with pytest.raises(ValueError, match=":1:"):
+        load_hallucination_patterns(str(path))
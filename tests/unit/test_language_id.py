@@ -15,12 +15,15 @@ from bentoml_faster_whisper.config import LanguageIdConfig
 from bentoml_faster_whisper.models.enums import Language
 from bentoml_faster_whisper.models.transcription_request import TranscriptionRequest
 from bentoml_faster_whisper.utils.language_id import (
+    detect_dominant_language,
     detect_turn_language_probs,
     fill_missing_rows_from_intervals,
     resolve_language_inventory,
+    sample_turn_language_probs,
     viterbi_smooth_languages,
 )
 from bentoml_faster_whisper.utils.speech_regions import turns_to_language_runs
+from tests.unit._builders import pool_with_request_arriving_during_encode
 
 # ---------------------------------------------------------------------------
 # viterbi_smooth_languages
@@ -72,6 +75,19 @@ def test_viterbi_empty_rows():
     assert viterbi_smooth_languages([], [], ["de", "fr"]) == []
 
 
+def test_viterbi_ties_go_to_the_first_inventory_language_and_staying():
+    rows = [{"de": 0.5, "fr": 0.5}, None, {"fr": 0.5, "de": 0.5}]
+    assert viterbi_smooth_languages(rows, [3.0, 1.0, 3.0], ["fr", "de"], switch_penalty=0.0) == ["fr", "fr", "fr"]
+    # Languages missing from a row count as _MIN_PROB, so "it" ties with nothing here.
+    rows = [{"de": 0.9, "fr": 0.1}, {"de": 0.5, "fr": 0.5}]
+    assert viterbi_smooth_languages(rows, [3.0, 3.0], ["it", "fr", "de"]) == ["de", "de"]
+
+
+def test_viterbi_mismatched_durations_raise():
+    with pytest.raises(ValueError):
+        viterbi_smooth_languages([{"de": 1.0}, None], [1.0], ["de", "fr"])
+
+
 # ---------------------------------------------------------------------------
 # resolve_language_inventory
 
@@ -222,6 +238,16 @@ def test_detect_drops_sub_minimum_tail_window():
     assert fake.encode_batch_sizes == [1]
 
 
+def test_detection_through_a_replica_pool_stays_on_the_encoding_replica():
+    replicas = [_FakeWhisper(results=[[("<|de|>", 1.0)]]) for _ in range(2)]
+
+    with pool_with_request_arriving_during_encode(replicas) as pool:
+        rows = detect_turn_language_probs(cast(WhisperModel, pool), _samples(10.0), [(0.0, 8.0)])
+
+    assert rows[0] is not None and rows[0]["de"] == pytest.approx(1.0)
+    assert replicas[1].model._queue == [[("<|de|>", 1.0)]], "the other replica must not detect on r0's output"
+
+
 def test_fill_missing_rows_detects_merged_short_turn_cluster():
     # Three sub-2s turns in quick succession: individually undetectable, but their
     # merged interval is ~4s and detects fine -> all three inherit its row.
@@ -250,6 +276,64 @@ def test_fill_missing_rows_keeps_detected_rows_untouched():
     assert rows[1] is not None and rows[1]["fr"] == pytest.approx(1.0)
 
 
+def test_sampling_spends_the_window_budget_on_the_longest_turns():
+    fake = _FakeWhisper(results=[[("<|de|>", 1.0)]] * 3)
+    turns = [(0.0, 3.0), (4.0, 12.0), (13.0, 15.0), (16.0, 26.0), (27.0, 31.0), (32.0, 39.0)]
+    rows = sample_turn_language_probs(
+        cast(WhisperModel, fake), _samples(40.0), turns, max_windows=3, stable_batches=10, batch_size=2
+    )
+    assert fake.encode_batch_sizes == [2, 1]
+    assert [row is not None for row in rows] == [False, True, False, True, False, True]
+
+
+def test_sampling_stops_once_decisions_are_stable():
+    # The first batch alone says de; the second brings in fr and changes the decisions,
+    # then two batches in a row leave them unchanged.
+    fake = _FakeWhisper(
+        results=[[("<|de|>", 1.0)]] * 2 + [[("<|fr|>", 1.0)]] * 2 + [[("<|fr|>", 1.0)]] * 4 + [[("<|de|>", 1.0)]] * 12
+    )
+    turns = [(float(i * 10), float(i * 10 + 9.5 - i * 0.1)) for i in range(20)]
+    rows = sample_turn_language_probs(
+        cast(WhisperModel, fake), _samples(200.0), turns, max_windows=0, stable_batches=2, batch_size=2
+    )
+    assert fake.encode_batch_sizes == [2, 2, 2, 2]
+    assert sum(row is not None for row in rows) == 8
+
+
+_PRECHECK_TURNS = [(float(i * 10), float(i * 10 + 8)) for i in range(12)]
+
+
+def test_precheck_finds_the_one_language_from_a_single_batch_of_sampled_turns():
+    fake = _FakeWhisper(results=[[("<|de|>", 0.97), ("<|en|>", 0.03)]] * 4)
+    language = detect_dominant_language(
+        cast(WhisperModel, fake), _samples(120.0), _PRECHECK_TURNS, num_windows=4, threshold=0.9
+    )
+    assert language == "de"
+    assert fake.encode_batch_sizes == [4]
+
+
+@pytest.mark.parametrize(
+    ("results", "candidates"),
+    [
+        ([[("<|de|>", 0.97)]] * 3 + [[("<|fr|>", 0.95)]], None),  # one sampled turn disagrees
+        ([[("<|de|>", 0.6), ("<|en|>", 0.4)]] * 4, None),  # agreeing but unsure
+        ([[("<|de|>", 0.97)]] * 4, ["fr", "it"]),  # sure, but not an allowed language
+    ],
+)
+def test_precheck_leaves_mixed_or_uncertain_samples_to_per_turn_detection(results, candidates):
+    fake = _FakeWhisper(results=results)
+    language = detect_dominant_language(
+        cast(WhisperModel, fake), _samples(120.0), _PRECHECK_TURNS, candidates, num_windows=4, threshold=0.9
+    )
+    assert language is None
+
+
+def test_precheck_without_detectable_turns_decides_nothing():
+    fake = _FakeWhisper(results=[])
+    assert detect_dominant_language(cast(WhisperModel, fake), _samples(10.0), [(1.0, 1.5)], min_turn_s=1.0) is None
+    assert fake.encode_batch_sizes == []
+
+
 # ---------------------------------------------------------------------------
 # TranscriptionRequest.language_candidates
 
@@ -0,0 +1,119 @@
+"""Two-tier cascade: weak draft spans are re-decoded by the served model and spliced back by time."""
+
+import numpy as np
+import pytest
+from faster_whisper.transcribe import Segment as FWSegment
+
+from bentoml_faster_whisper.config import CascadeConfig, WhisperModelConfig
+from bentoml_faster_whisper.services.model_manager import WhisperModelProvider
+from bentoml_faster_whisper.utils.model_cascade import CascadeWhisper
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+from tests.unit._builders import Info, fw_segment, fw_word
+
+AUDIO_S = 20.0
+CONFIG = CascadeConfig(draft_model="small", context_s=1.0)
+
+
+def _segment(start: float, end: float, text: str, avg_logprob: float = -0.2) -> FWSegment:
+    return fw_segment(start, end, [fw_word(start, end, text)], avg_logprob=avg_logprob)
+
+
+class _FakeModel:
+    def __init__(self, segments: list[FWSegment]) -> None:
+        self.segments = segments
+        self.calls: list[dict] = []
+
+    def transcribe(self, audio, language=None, **options):
+        self.calls.append({"seconds": len(audio) / WHISPER_SAMPLE_RATE, "language": language, **options})
+        return iter(self.segments), Info(language=language or "de")
+
+    def detect_language(self, audio=None, vad_filter=False, vad_parameters=None):
+        return "de", 0.8, [("de", 0.8), ("en", 0.2)]
+
+
+def _audio() -> np.ndarray:
+    return np.zeros(int(AUDIO_S * WHISPER_SAMPLE_RATE), dtype=np.float32)
+
+
+def test_confident_draft_is_never_redecoded():
+    draft = _FakeModel([_segment(0.0, 4.0, " eins"), _segment(5.0, 9.0, " zwei")])
+    large = _FakeModel([])
+
+    segments, _ = CascadeWhisper(draft, large, CONFIG).transcribe(_audio(), language="de")
+
+    assert [s.text for s in segments] == [" eins", " zwei"]
+    assert large.calls == []
+
+
+def test_weak_run_is_redecoded_within_its_neighbours_and_shifted_back():
+    draft = _FakeModel(
+        [
+            _segment(0.0, 4.0, " eins"),
+            _segment(4.5, 6.0, " zwo", avg_logprob=-1.5),
+            _segment(6.0, 8.0, " drö", avg_logprob=-1.5),
+            _segment(12.0, 14.0, " vier"),
+        ]
+    )
+    large = _FakeModel([_segment(1.0, 4.5, " zwei drei")])
+
+    segments, _ = CascadeWhisper(draft, large, CONFIG).transcribe(_audio(), language="de")
+    produced = list(segments)
+
+    assert [s.text for s in produced] == [" eins", " zwei drei", " vier"]
+    assert [s.id for s in produced] == [0, 1, 2]
+    # Span: weak run ±1 s context, clipped to the kept neighbours' edges (4.0 .. 9.0).
+    assert large.calls[0]["seconds"] == pytest.approx(5.0)
+    assert large.calls[0]["language"] == "de"
+    redecoded = produced[1]
+    assert (redecoded.start, redecoded.end) == pytest.approx((5.0, 8.5))
+    assert redecoded.words is not None
+    assert (redecoded.words[0].start, redecoded.words[0].end) == pytest.approx((5.0, 8.5))
+
+
+def test_trailing_weak_run_is_bounded_by_audio_end():
+    draft = _FakeModel([_segment(0.0, 4.0, " eins"), _segment(18.0, 19.5, " ähm", avg_logprob=-2.0)])
+    large = _FakeModel([])
+
+    segments, _ = CascadeWhisper(draft, large, CONFIG).transcribe(_audio(), language="de")
+
+    assert [s.text for s in segments] == [" eins"]
+    assert large.calls[0]["seconds"] == pytest.approx(3.0)
+
+
+def test_unknown_language_is_detected_by_the_served_model():
+    draft = _FakeModel([_segment(0.0, 4.0, " eins")])
+    large = _FakeModel([])
+
+    _, info = CascadeWhisper(draft, large, CONFIG).transcribe(_audio())
+
+    assert draft.calls[0]["language"] == "de"
+    assert info.language_probability == pytest.approx(0.8)
+
+
+def test_translation_bypasses_the_draft():
+    draft = _FakeModel([_segment(0.0, 4.0, " eins")])
+    large = _FakeModel([_segment(0.0, 4.0, " one")])
+
+    segments, _ = CascadeWhisper(draft, large, CONFIG).transcribe(_audio(), task="translate")
+
+    assert [s.text for s in segments] == [" one"]
+    assert draft.calls == []
+
+
+def test_provider_wraps_served_model_only_when_draft_configured(monkeypatch):
+    loaded: list[str] = []
+
+    def fake_load_model(self, model_id, config=None):
+        loaded.append(model_id)
+        return _FakeModel([])
+
+    monkeypatch.setattr(WhisperModelProvider, "_load_model", fake_load_model)
+
+    plain = WhisperModelProvider(WhisperModelConfig(), "large-v2")
+    assert isinstance(plain.get(), _FakeModel)
+
+    cascading = WhisperModelProvider(WhisperModelConfig(), "large-v2", CONFIG)
+    model = cascading.get()
+    assert isinstance(model, CascadeWhisper)
+    assert cascading.get() is model
+    assert loaded == ["large-v2", "large-v2", "small"]
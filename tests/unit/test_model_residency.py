@@ -0,0 +1,105 @@
+"""Multi-model residency: on-demand loads, LRU eviction under a memory budget, leases pin models."""
+
+import pytest
+
+from bentoml_faster_whisper.config import WhisperModelConfig
+from bentoml_faster_whisper.services.model_manager import WhisperModelProvider
+from tests.unit._builders import FakeWhisperModel
+
+FOOTPRINT_MB = {"large-v2": 3000.0, "distil-large-v3": 1500.0, "german-ft": 3000.0}
+
+
+@pytest.fixture
+def provider_factory(monkeypatch):
+    loads: list[str] = []
+
+    def fake_load_model(self, model_id, config=None):
+        loads.append(model_id)
+        return FakeWhisperModel(model_id)
+
+    monkeypatch.setattr(WhisperModelProvider, "_load_model", fake_load_model)
+    monkeypatch.setattr(
+        WhisperModelProvider, "_footprint_mb", lambda self, model_id, config, with_draft: FOOTPRINT_MB[model_id]
+    )
+
+    def make(budget_mb: float | None) -> tuple[WhisperModelProvider, list[str]]:
+        config = WhisperModelConfig(memory_budget_mb=budget_mb)
+        return WhisperModelProvider(config, "large-v2"), loads
+
+    return make
+
+
+def test_models_load_on_demand_and_stay_resident_without_budget(provider_factory):
+    provider, loads = provider_factory(None)
+
+    assert provider.get().model_id == "large-v2"
+    assert provider.get("distil-large-v3").model_id == "distil-large-v3"
+    assert provider.get("german-ft").model_id == "german-ft"
+    provider.get()
+
+    assert loads == ["large-v2", "distil-large-v3", "german-ft"]
+    assert provider.resident_models() == ["distil-large-v3", "german-ft", "large-v2"]
+
+
+def test_least_recently_used_idle_model_is_evicted(provider_factory):
+    provider, loads = provider_factory(6000.0)
+
+    provider.get()
+    provider.get("distil-large-v3")
+    provider.get()  # large-v2 is now the most recently used
+    provider.get("german-ft")
+
+    assert provider.resident_models() == ["large-v2", "german-ft"]
+    provider.get("distil-large-v3")
+    assert provider.resident_models() == ["german-ft", "distil-large-v3"]
+    assert loads == ["large-v2", "distil-large-v3", "german-ft", "distil-large-v3"]
+
+
+def test_evicted_model_unloads_its_weights(provider_factory):
+    provider, _ = provider_factory(3000.0)
+
+    evicted = provider.get()
+    kept = provider.get("german-ft")
+
+    assert evicted.model.unloaded
+    assert not kept.model.unloaded
+
+
+def test_model_downloaded_by_its_load_is_fit_into_the_budget_once_sized(provider_factory, monkeypatch):
+    provider, loads = provider_factory(4000.0)
+    provider.get("distil-large-v3")
+    # Weights not on disk yet size as 0 until their load has downloaded them.
+    monkeypatch.setattr(
+        WhisperModelProvider,
+        "_footprint_mb",
+        lambda self, model_id, config, with_draft: FOOTPRINT_MB[model_id] if model_id in loads else 0.0,
+    )
+
+    provider.get("german-ft")
+
+    assert provider.resident_models() == ["german-ft"]
+
+
+def test_leased_model_is_not_evicted_until_released(provider_factory):
+    provider, _ = provider_factory(5000.0)
+
+    lease = provider.lease("german-ft")
+    provider.get()  # over budget: german-ft is leased, so nothing can go
+    assert provider.resident_models() == ["german-ft", "large-v2"]
+
+    lease.release()
+    lease.release()  # idempotent
+    provider.get("distil-large-v3")
+    assert provider.resident_models() == ["large-v2", "distil-large-v3"]
+
+
+def test_lease_is_a_context_manager_yielding_the_model(provider_factory):
+    provider, _ = provider_factory(3000.0)
+
+    with provider.lease() as model:
+        assert model.model_id == "large-v2"
+        provider.get("distil-large-v3")
+        assert "large-v2" in provider.resident_models()
+
+    provider.get("german-ft")
+    assert provider.resident_models() == ["german-ft"]
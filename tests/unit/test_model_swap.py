@@ -0,0 +1,124 @@
+"""Zero-downtime hot-swap of the default model."""
+
+import asyncio
+import threading
+from typing import cast
+
+import pytest
+from fastapi import HTTPException
+from faster_whisper import WhisperModel
+
+from bentoml_faster_whisper import service as service_module
+from bentoml_faster_whisper.config import CascadeConfig, Quantization, WhisperModelConfig
+from bentoml_faster_whisper.models.model_swap import ModelSwapRequest
+from bentoml_faster_whisper.service import FasterWhisper
+from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
+from bentoml_faster_whisper.services.model_manager import WhisperModelProvider
+from bentoml_faster_whisper.utils.model_cascade import CascadeWhisper
+from tests.unit._builders import FakeWhisperModel, replica_pool
+
+
+@pytest.fixture
+def provider(monkeypatch) -> WhisperModelProvider:
+    def fake_load_model(self, model_id, config=None):
+        config = config or self.whisper_config
+        if model_id == "broken":
+            raise RuntimeError("no such model")
+        return FakeWhisperModel(model_id, config.compute_type)
+
+    monkeypatch.setattr(WhisperModelProvider, "_load_model", fake_load_model)
+    return WhisperModelProvider(WhisperModelConfig(compute_type=Quantization.FLOAT16), "large-v2")
+
+
+def test_swap_serves_new_model_under_default_name_after_warmup(provider):
+    warmed: list[str] = []
+    in_flight = provider.lease()
+
+    provider.swap("german-ft", Quantization.INT8, warm=lambda model: warmed.append(model.model_id))
+
+    assert warmed == ["german-ft"]
+    assert provider.model_id == "german-ft"
+    new = provider.get()
+    assert (new.model_id, new.compute_type) == ("german-ft", Quantization.INT8)
+    # The request that started before the swap keeps decoding with the old model.
+    assert in_flight.model.model_id == "large-v2"
+    assert provider.resident_models() == ["large-v2"]
+    in_flight.release()
+
+
+def test_swapped_out_model_is_freed_once_its_last_lease_is_released(provider, monkeypatch):
+    freed: list[str] = []
+    original_free = WhisperModelProvider._free_locked
+
+    def record_free(self, entry, event):
+        freed.append(entry.model_id)
+        original_free(self, entry, event)
+
+    monkeypatch.setattr(WhisperModelProvider, "_free_locked", record_free)
+    first, second = provider.lease(), provider.lease()
+
+    provider.swap("german-ft")
+    first.release()
+    assert freed == []
+    second.release()
+    assert freed == ["large-v2"]
+    assert first.model.model.unloaded
+
+
+def test_warmup_decodes_on_every_replica_of_both_cascade_tiers(monkeypatch):
+    warmed: list[object] = []
+    monkeypatch.setattr(FasterWhisperHandler, "_warm_decode", staticmethod(warmed.append))
+    draft, large = replica_pool(2), replica_pool(3)
+
+    FasterWhisperHandler._warm(cast(WhisperModel, CascadeWhisper(draft, large, CascadeConfig(draft_model="small"))))
+    FasterWhisperHandler._warm(cast(WhisperModel, large))
+
+    assert warmed == [*draft.models(), *large.models(), *large.models()]
+
+
+def test_failed_swap_keeps_serving_the_current_model(provider):
+    provider.get()
+
+    with pytest.raises(RuntimeError, match="no such model"):
+        provider.swap("broken")
+
+    assert provider.get().model_id == "large-v2"
+    assert provider.last_swap_error == "RuntimeError: no such model"
+
+
+def test_only_one_swap_runs_at_a_time(provider):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_warm(model):
+        started.set()
+        release.wait(timeout=5)
+
+    thread = provider.start_swap("german-ft", warm=slow_warm)
+    assert started.wait(timeout=5)
+    assert provider.swapping
+    with pytest.raises(RuntimeError, match="already in progress"):
+        provider.swap("distil-large-v3")
+    release.set()
+    thread.join(timeout=5)
+
+    assert not provider.swapping
+    assert provider.get().model_id == "german-ft"
+
+
+def test_admin_route_is_hidden_without_token_and_checks_it(monkeypatch):
+    service = FasterWhisper()
+    request = ModelSwapRequest(model="german-ft")
+
+    monkeypatch.setattr(service_module, "ADMIN_API_TOKEN", "")
+    with pytest.raises(HTTPException) as hidden:
+        asyncio.run(service.swap_model(request, authorization="Bearer anything"))
+    assert hidden.value.status_code == 404
+
+    monkeypatch.setattr(service_module, "ADMIN_API_TOKEN", "s3cret")
+    with pytest.raises(HTTPException) as denied:
+        asyncio.run(service.get_model_swap_status(authorization="Bearer wrong"))
+    assert denied.value.status_code == 401
+
+    status = asyncio.run(service.get_model_swap_status(authorization="Bearer s3cret"))
+    assert status.model_name == status.model_id
+    assert not status.swapping
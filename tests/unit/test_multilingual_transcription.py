@@ -97,8 +97,11 @@ def test_lid_fallback_detects_one_language_over_all_speech(diarizing_handler, mo
 
     # Force every per-turn detection to be indeterminate so _transcribe_language_runs takes
     # its detect_language(collapsed) fallback instead of the per-turn Viterbi path.
+    monkeypatch.setattr(handler_module, "detect_dominant_language", lambda *a, **k: None)
     monkeypatch.setattr(handler_module, "detect_turn_language_probs", lambda *a, **k: [None, None])
-    monkeypatch.setattr(handler_module, "fill_missing_rows_from_intervals", lambda whisper, decoded, turns, rows: rows)
+    monkeypatch.setattr(
+        handler_module, "fill_missing_rows_from_intervals", lambda whisper, decoded, turns, rows, **k: rows
+    )
 
     response = _transcribe(
         diarizing_handler,
@@ -1,8 +1,21 @@
 """Regression tests for response/subtitle formatting helpers in utils.core and
 the verbose_json response builder."""
 
+import json
+
+import pytest
+
+from bentoml_faster_whisper.models.enums import ResponseFormat, StreamFormat
+from bentoml_faster_whisper.models.output_models import (
+    coalesce_chunks,
+    response_chunks,
+    segments_to_response,
+    segments_to_streaming_response,
+)
+from bentoml_faster_whisper.models.transcription_json_diarized_response import TranscriptionJsonDiarizedResponse
+from bentoml_faster_whisper.models.transcription_json_response import TranscriptionJsonResponse
 from bentoml_faster_whisper.models.transcription_verbose_json_response import TranscriptionVerboseJsonResponse
-from bentoml_faster_whisper.utils.core import Segment, Word, segments_to_srt, segments_to_vtt
+from bentoml_faster_whisper.utils.core import Segment, Word, segments_to_srt, segments_to_text, segments_to_vtt
 
 
 def _segment(start: float, end: float, text: str, words: list[Word] | None) -> Segment:
@@ -71,3 +84,164 @@ def test_verbose_json_collects_words_when_present():
     response = TranscriptionVerboseJsonResponse.from_segments([seg], _Info())  # type: ignore
 
     assert response.words == words
+
+
+def test_json_formats_are_byte_identical_to_the_response_models():
+    words = [
+        Word(start=0, end=0.5, word=" Grüezi", probability=0.9, speaker="SPEAKER_00"),
+        Word(start=0.5, end=1.25, word=' "mitenand"', probability=float("nan")),
+    ]
+    segments = [
+        _segment(0, 1.25, ' Grüezi "mitenand"', words),
+        _segment(2.0, 3.0, " 你好\n", None),
+    ]
+    segments[0].speaker = "SPEAKER_00"
+    segments[1].language = "zh"
+    segments[1].avg_logprob = float("-inf")
+
+    expected = {
+        ResponseFormat.JSON: TranscriptionJsonResponse.from_segments(segments).model_dump_json(),
+        ResponseFormat.JSON_DIARIZED: TranscriptionJsonDiarizedResponse.from_segments(segments).model_dump_json(),
+        ResponseFormat.VERBOSE_JSON: TranscriptionVerboseJsonResponse.from_segments(
+            segments,
+            _Info(),  # type: ignore[arg-type]
+        ).model_dump_json(),
+    }
+    for response_format, body in expected.items():
+        assert segments_to_response(segments, _Info(), response_format) == body  # type: ignore[arg-type]
+
+    streamed = list(segments_to_streaming_response(segments, _Info(), ResponseFormat.VERBOSE_JSON))  # type: ignore
+    assert streamed == [
+        TranscriptionVerboseJsonResponse.from_segment(segment, _Info()).model_dump_json() + "\n"  # type: ignore
+        for segment in segments
+    ]
+
+
+@pytest.mark.parametrize(
+    "texts",
+    [
+        [],
+        ["  ", "\n"],
+        [" Hallo", " ", " wie geht's? ", "", ' "Gut"\t'],
+        ["\u3000你好", "  "],
+    ],
+)
+def test_incremental_body_joins_to_the_whole_body(texts):
+    segments = [_segment(float(i), i + 1.0, text, None) for i, text in enumerate(texts)]
+    expected = {
+        ResponseFormat.TEXT: segments_to_text(segments),
+        ResponseFormat.JSON: TranscriptionJsonResponse.from_segments(segments).model_dump_json(),
+        ResponseFormat.JSON_DIARIZED: TranscriptionJsonDiarizedResponse.from_segments(segments).model_dump_json(),
+        ResponseFormat.SRT: "".join(segments_to_srt(segment, i) for i, segment in enumerate(segments)),
+        ResponseFormat.VTT: "".join(segments_to_vtt(segment, i) for i, segment in enumerate(segments)),
+    }
+
+    for response_format, body in expected.items():
+        assert "".join(response_chunks(iter(segments), _Info(), response_format)) == body  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("segment_fields", [None, frozenset({"start", "end", "text"})])
+def test_incremental_verbose_json_holds_the_whole_body(segment_fields):
+    words = [Word(start=0.0, end=0.5, word=" hi", probability=0.9)]
+    segments = [_segment(0.0, 0.5, " hi", words), _segment(1.0, 2.0, " there\n", None)]
+    segments[1].avg_logprob = float("-inf")
+
+    chunks = response_chunks(iter(segments), _Info(), ResponseFormat.VERBOSE_JSON, segment_fields)  # type: ignore
+
+    # ``segments`` is written ahead of ``text`` and ``words``, so only the parsed bodies match.
+    assert json.loads("".join(chunks)) == json.loads(
+        segments_to_response(segments, _Info(), ResponseFormat.VERBOSE_JSON, segment_fields)  # type: ignore[arg-type]
+    )
+
+
+def test_incremental_body_is_written_before_the_last_segment_arrives():
+    arrived = []
+
+    def arriving():
+        for i in range(3):
+            arrived.append(i)
+            yield _segment(float(i), i + 1.0, f" Satz {i}.", None)
+
+    for response_format in (
+        ResponseFormat.JSON,
+        ResponseFormat.JSON_DIARIZED,
+        ResponseFormat.VERBOSE_JSON,
+        ResponseFormat.SRT,
+    ):
+        arrived.clear()
+        written = ""
+        for chunk in response_chunks(arriving(), _Info(), response_format):  # type: ignore[arg-type]
+            written += chunk
+            if "Satz 0." in written:
+                break
+        assert arrived == [0]
+
+
+@pytest.mark.parametrize(
+    "response_format", [ResponseFormat.JSON, ResponseFormat.JSON_DIARIZED, ResponseFormat.VERBOSE_JSON]
+)
+def test_failure_while_the_body_is_written_ends_it_with_the_error(response_format):
+    def failing():
+        yield _segment(0.0, 1.0, " Satz 0.", None)
+        raise ValueError("decoder crashed")
+
+    body = json.loads("".join(response_chunks(failing(), _Info(), response_format, in_band_errors=True)))  # type: ignore
+
+    assert "Satz 0." in json.dumps(body, ensure_ascii=False)
+    assert body["status"] == 500
+    assert "decoder crashed" not in body["error"]
+
+
+def test_failure_while_the_body_is_written_is_raised_without_in_band_errors():
+    def failing():
+        yield _segment(0.0, 1.0, " Satz 0.", None)
+        raise ValueError("decoder crashed")
+
+    with pytest.raises(ValueError, match="decoder crashed"):
+        "".join(response_chunks(failing(), _Info(), ResponseFormat.JSON))  # type: ignore[arg-type]
+
+
+def test_stream_failure_is_sent_as_an_error_event():
+    def failing():
+        yield _segment(0.0, 1.0, " Satz 0.", None)
+        raise ValueError("decoder crashed")
+
+    events = list(segments_to_streaming_response(failing(), _Info(), ResponseFormat.TEXT, StreamFormat.SSE))  # type: ignore
+
+    assert events[0] == "data:  Satz 0.\n\n"
+    assert events[1].startswith("event: error\ndata: {")
+    assert json.loads(events[1].split("data: ", 1)[1])["status"] == 500
+
+
+def test_coalesced_chunks_keep_the_text():
+    chunks = [f"{i}," for i in range(1000)]
+
+    coalesced = list(coalesce_chunks(chunks, min_chars=100))
+
+    assert "".join(coalesced) == "".join(chunks)
+    assert all(len(chunk) >= 100 for chunk in coalesced[:-1])
+
+
+def test_verbose_json_projection_leaves_unrequested_segment_fields_out():
+    words = [Word(start=0.0, end=0.5, word=" hi", probability=0.9)]
+    segments = [_segment(0.0, 0.5, " hi", words), _segment(1.0, 2.0, " there", None)]
+    full = json.loads(segments_to_response(segments, _Info(), ResponseFormat.VERBOSE_JSON))  # type: ignore[arg-type]
+
+    projected = json.loads(
+        segments_to_response(segments, _Info(), ResponseFormat.VERBOSE_JSON, frozenset({"start", "end", "text"}))  # type: ignore[arg-type]
+    )
+
+    assert {key: value for key, value in projected.items() if key != "segments"} == {
+        key: value for key, value in full.items() if key != "segments"
+    }
+    assert projected["segments"] == [
+        {"start": segment["start"], "end": segment["end"], "text": segment["text"]} for segment in full["segments"]
+    ]
+
+    streamed = segments_to_streaming_response(
+        segments,
+        _Info(),  # type: ignore[arg-type]
+        ResponseFormat.VERBOSE_JSON,
+        segment_fields=frozenset({"text"}),
+    )
+    assert [json.loads(chunk)["segments"] for chunk in streamed] == [[{"text": " hi"}], [{"text": " there"}]]
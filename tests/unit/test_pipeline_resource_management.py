@@ -42,6 +42,16 @@ def test_streaming_endpoint_completes_full_stream(service):
     assert all(chunk.endswith("\n") and not chunk.startswith("data:") for chunk in chunks)
 
 
+@pytest.mark.model
+def test_incremental_body_matches_the_whole_body(handler):
+    expected = handler.transcribe_audio(_request(LONG_AUDIO))
+
+    chunks = list(handler.transcribe_audio_chunks(_request(LONG_AUDIO)))
+
+    assert len(chunks) > 2
+    assert "".join(chunks) == expected
+
+
 @pytest.mark.model
 def test_concurrent_transcriptions_succeed(handler):
     errors: list[BaseException] = []
@@ -73,12 +83,12 @@ def test_provider_loads_model_once_under_concurrency(monkeypatch):
     provider = WhisperModelProvider(WhisperModelConfig(), faster_whisper_config.default_model_name)
     loads: list[int] = []
 
-    def fake_load() -> object:
+    def fake_load_model(model_id, config=None) -> object:
         loads.append(1)
         time.sleep(0.005)  # widen the race window
         return object()
 
-    monkeypatch.setattr(provider, "_load", fake_load)
+    monkeypatch.setattr(provider, "_load_model", fake_load_model)
 
     results: list[object] = []
     lock = threading.Lock()
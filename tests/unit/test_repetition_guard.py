@@ -0,0 +1,121 @@
+"""Repetition loops cut short while a decode streams, and decoding resumed past them."""
+
+from faster_whisper.transcribe import Segment as FWSegment
+
+from bentoml_faster_whisper.config import RepetitionConfig
+from bentoml_faster_whisper.utils.repetition_guard import guard_repetitions
+from tests.unit._builders import fw_segment
+
+CONFIG = RepetitionConfig(min_repeats=4, min_span_tokens=12, skip_s=2.0, max_restarts=3)
+LOOP = [101, 102, 103, 104]
+
+
+def _speech(start: float, first_token: int) -> FWSegment:
+    return fw_segment(
+        start, start + 2.0, tokens=list(range(first_token, first_token + 8)), text=f" speech {first_token}"
+    )
+
+
+def test_loop_is_dropped_and_decoding_resumes_past_it():
+    restarts: list[float] = []
+    closed = []
+
+    def first_decode():
+        try:
+            yield _speech(0.0, 1)
+            for i in range(10):
+                yield fw_segment(2.0 + i, 3.0 + i, tokens=LOOP, text=" Thank you.")
+        finally:
+            closed.append(True)
+
+    def restart(offset_s):
+        restarts.append(offset_s)
+        yield _speech(0.5, 50)
+
+    out = list(guard_repetitions(first_decode(), restart, duration_s=60.0, config=CONFIG))
+
+    # The first occurrence is not yet a repetition; the next three are held, then dropped with the fourth.
+    assert [s.text for s in out] == [" speech 1", " Thank you.", " speech 50"]
+    assert closed == [True]
+    assert restarts == [6.0 + CONFIG.skip_s]
+    assert (out[-1].start, out[-1].end) == (8.5, 10.5)
+
+
+def test_repetition_that_breaks_off_is_passed_on_unchanged():
+    segments = [
+        _speech(0.0, 1),
+        fw_segment(2.0, 3.0, tokens=LOOP, text=" Thank you."),
+        fw_segment(3.0, 4.0, tokens=LOOP, text=" Thank you."),
+        _speech(4.0, 20),
+    ]
+
+    out = list(guard_repetitions(iter(segments), lambda offset_s: iter(()), duration_s=10.0, config=CONFIG))
+
+    assert out == segments
+
+
+def test_token_rate_anomaly_is_a_loop():
+    crammed = fw_segment(5.0, 6.0, tokens=list(range(200, 240)))
+    restarts: list[float] = []
+
+    def restart(offset_s):
+        restarts.append(offset_s)
+        return iter(())
+
+    out = list(guard_repetitions(iter([_speech(0.0, 1), crammed]), restart, duration_s=60.0, config=CONFIG))
+
+    assert [s.text for s in out] == [" speech 1"]
+    assert restarts == [8.0]
+
+
+def test_token_rate_is_not_judged_on_segments_too_short_to_time():
+    # Whisper clamps the timestamps of a short segment; 30 tokens in "0 s" is still speech.
+    short = fw_segment(5.0, 5.0, tokens=list(range(200, 230)), text=" Das ist ein ganz normaler kurzer Satz.")
+
+    out = list(guard_repetitions(iter([_speech(0.0, 1), short]), lambda offset_s: iter(()), 60.0, CONFIG))
+
+    assert out == [_speech(0.0, 1), short]
+
+
+def test_stride_grows_while_restarts_keep_looping_and_a_passage_decodes_through_after_the_last_restart():
+    restarts: list[float] = []
+
+    def looping(start: float):
+        return iter([fw_segment(start + i * 0.5, start + (i + 1) * 0.5, tokens=LOOP) for i in range(6)])
+
+    def restart(offset_s):
+        restarts.append(offset_s)
+        return looping(0.0)
+
+    out = list(guard_repetitions(looping(0.0), restart, duration_s=600.0, config=CONFIG))
+
+    # Each decode passes on the loop's first occurrence and loops 2 s in; the stride
+    # doubles from 2 s while restarts produce nothing else. Out of restarts, the fourth
+    # decode is passed on whole.
+    assert [s.start for s in out] == [0.0, 4.0, 10.0, 20.0, 20.5, 21.0, 21.5, 22.0, 22.5]
+    assert restarts == [4.0, 10.0, 20.0]
+
+
+def test_loops_throughout_a_long_recording_never_end_the_transcript():
+    """An hour of speech with a few seconds of looping music every 100 s: each passage
+    costs restarts of its own, and everything after it is still transcribed."""
+    duration_s = 3600.0
+
+    def decode(offset_s: float):
+        t = float(int(offset_s + 0.999))
+        while t < duration_s:
+            if t % 100 < 8:  # music
+                yield fw_segment(t - offset_s, t + 0.5 - offset_s, tokens=LOOP, text=" Thank you.")
+                t += 0.5
+            else:
+                yield fw_segment(t - offset_s, t + 1.0 - offset_s, tokens=[1000 + int(t)], text=f" speech {int(t)}")
+                t += 1.0
+
+    out = list(guard_repetitions(decode(0.0), decode, duration_s, CONFIG))
+
+    spoken = {s.text for s in out if s.text != " Thank you."}
+    expected = {f" speech {t}" for t in range(3600) if t % 100 >= 8}
+    missing = sorted(int(text.split()[1]) for text in expected - spoken)
+    # Only speech right after a loop, inside the stride past it, is skipped.
+    assert all(t % 100 < 8 + 2 * CONFIG.skip_s for t in missing)
+    assert max(s.end for s in out) == duration_s
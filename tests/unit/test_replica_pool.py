@@ -0,0 +1,81 @@
+"""Replica pool: placement across devices / CPU threads and least-loaded dispatch."""
+
+import gc
+
+import pytest
+
+from bentoml_faster_whisper.config import Device, WhisperModelConfig
+from bentoml_faster_whisper.services.replica_pool import ReplicaPool, pinned, replica_placements
+from tests.unit._builders import FakeReplica, replica_pool
+
+
+def test_gpu_replicas_round_robin_over_device_indices():
+    config = WhisperModelConfig(inference_device=Device.CUDA, device_index=[0, 1], replicas=3, cpu_threads=4)
+
+    placements = replica_placements(config)
+
+    assert [p["device_index"] for p in placements] == [0, 1, 0]
+    assert all(p["cpu_threads"] == 4 for p in placements)
+
+
+def test_cpu_replicas_split_the_thread_budget():
+    config = WhisperModelConfig(inference_device=Device.CPU, device_index=0, replicas=4, cpu_threads=16)
+
+    assert [p["cpu_threads"] for p in replica_placements(config)] == [4, 4, 4, 4]
+
+
+def test_transcribe_goes_to_least_loaded_replica_until_segments_are_consumed():
+    pool = replica_pool(2)
+
+    first, info_first = pool.transcribe("a")
+    second, info_second = pool.transcribe("b")
+    assert {info_first["replica"], info_second["replica"]} == {"r0", "r1"}
+
+    # r0's generator is drained; r1's is still held, so the next call goes to r0.
+    assert list(first) == ["r0:a"]
+    _, info_third = pool.transcribe("c")
+    assert info_third["replica"] == "r0"
+    second.close()
+
+
+def test_unstarted_generator_releases_its_replica_when_collected():
+    pool = replica_pool(2)
+
+    unstarted, _ = pool.transcribe("a")  # r0
+    drained, _ = pool.transcribe("b")  # r1
+    list(drained)
+    unstarted.close()  # never started: its finally block does not run
+    del unstarted
+    gc.collect()
+
+    _, info = pool.transcribe("c")
+    assert info["replica"] == "r0", "the collected generator must have released r0"
+
+
+def test_acquired_replica_is_busy_until_the_block_ends():
+    pool = replica_pool(2)
+
+    with pool.acquire() as model:
+        held, info = pool.transcribe("a")
+        assert info["replica"] != model.name
+
+    # The other replica still holds the undrained segments; the released one is free again.
+    with pool.acquire() as again:
+        assert again is model
+    held.close()
+
+
+def test_pinned_passes_a_single_model_through():
+    model = FakeReplica("solo")
+
+    with pinned(model) as pinned_model:
+        assert pinned_model is model
+
+
+def test_other_attributes_come_from_a_replica():
+    assert replica_pool(3).name in {"r0", "r1", "r2"}
+
+
+def test_empty_pool_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaPool([])
@@ -0,0 +1,110 @@
+"""Accept-Encoding negotiation and compression of transcript response bodies."""
+
+import asyncio
+import gzip
+import zlib
+
+import anyio.to_thread
+import pytest
+
+from bentoml_faster_whisper.config import CompressionConfig
+from bentoml_faster_whisper.utils.response_compression import CompressionMiddleware, negotiate_encoding
+
+CONFIG = CompressionConfig(min_bytes=100)
+TRANSCRIPT = ('{"text":"' + "Grüezi mitenand, " * 200 + '"}').encode()
+
+
+def _app(*bodies: bytes, headers: list[tuple[bytes, bytes]] | None = None):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": list(headers or [])})
+        for i, body in enumerate(bodies):
+            await send({"type": "http.response.body", "body": body, "more_body": i < len(bodies) - 1})
+
+    return app
+
+
+def _call(app, accept_encoding: str | None, path: str = "/v1/audio/transcriptions", config: CompressionConfig = CONFIG):
+    headers = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    scope = {"type": "http", "path": path, "headers": headers}
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, config)(scope, None, send))
+    start, *bodies = sent
+    return {k.decode(): v.decode() for k, v in start["headers"]}, [m["body"] for m in bodies]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("deflate;q=1.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiation_honours_quality_values(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("gzip",)) == expected
+
+
+def test_earlier_available_encoding_wins_ties():
+    assert negotiate_encoding("gzip, deflate", ("deflate", "gzip")) == "deflate"
+    assert negotiate_encoding("gzip, deflate;q=0.5", ("deflate", "gzip")) == "gzip"
+
+
+def test_whole_body_is_compressed_above_the_threshold():
+    headers, bodies = _call(_app(TRANSCRIPT, headers=[(b"content-length", str(len(TRANSCRIPT)).encode())]), "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(bodies[0]))
+    assert headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(bodies[0]) == TRANSCRIPT
+
+
+def test_large_bodies_are_compressed_off_the_event_loop(monkeypatch):
+    offloaded: list[int] = []
+    run_sync = anyio.to_thread.run_sync
+
+    async def recording_run_sync(func, *args):
+        offloaded.append(len(args[0]))
+        return await run_sync(func, *args)
+
+    monkeypatch.setattr(anyio.to_thread, "run_sync", recording_run_sync)
+    config = CONFIG.model_copy(update={"offload_bytes": 1000})
+    chunks = [b"data: 1\n\n", TRANSCRIPT, b""]
+
+    _, bodies = _call(_app(*chunks), "gzip", config=config)
+
+    assert offloaded == [len(TRANSCRIPT)]
+    assert gzip.decompress(b"".join(bodies)) == b"".join(chunks)
+
+
+@pytest.mark.parametrize(
+    "body, accept_encoding, path",
+    [
+        (b'{"text":"Hallo"}', "gzip", "/v1/audio/transcriptions"),
+        (TRANSCRIPT, None, "/v1/audio/transcriptions"),
+        (TRANSCRIPT, "gzip", "/v1/models"),
+    ],
+)
+def test_small_unaccepted_or_other_bodies_pass_through(body, accept_encoding, path):
+    headers, bodies = _call(_app(body), accept_encoding, path)
+
+    assert "content-encoding" not in headers
+    assert bodies == [body]
+
+
+def test_streamed_body_is_decodable_after_every_chunk():
+    chunks = [b"data: 1\n\n", b": keep-alive\n\n", b"data: 2\n\n", b""]
+    headers, bodies = _call(_app(*chunks, headers=[(b"content-length", b"999")]), "gzip")
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    for chunk, body in zip(chunks, bodies):
+        assert decompressor.decompress(body) == chunk
+    assert decompressor.eof
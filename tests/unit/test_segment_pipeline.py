@@ -0,0 +1,86 @@
+"""One pass over each segment: filters before the speaker merge, ids assigned once."""
+
+from pyannote.core import Segment as Span
+
+from bentoml_faster_whisper.services.diarization_service import DiarizationSegment
+from bentoml_faster_whisper.utils.core import Word
+from bentoml_faster_whisper.utils.segment_pipeline import SegmentPipeline, SegmentStream
+from bentoml_faster_whisper.utils.transcription_cleaner import clean_transcription_segments
+from bentoml_faster_whisper.utils.whisper_diarization_merger import SpeakerMerger
+from tests.unit._builders import cleaner_info, core_segment
+
+
+class _CountingMerger(SpeakerMerger):
+    def __init__(self, turns):
+        super().__init__(turns)
+        self.merged: list[str] = []
+
+    def __call__(self, seg):
+        self.merged.append(seg.text)
+        return super().__call__(seg)
+
+
+def _turns() -> list[DiarizationSegment]:
+    return [
+        DiarizationSegment(segment=Span(0, 5), speaker="A"),
+        DiarizationSegment(segment=Span(5, 10), speaker="B"),
+        DiarizationSegment(segment=Span(10, 20), speaker="A"),
+    ]
+
+
+def test_rejected_segments_never_reach_the_speaker_merge():
+    merger = _CountingMerger(_turns())
+    pipeline = SegmentPipeline()
+    pipeline.add(splitters=[merger])
+    segments = [
+        core_segment(start=0, end=4, text=" Guten Tag."),
+        core_segment(start=4, end=6, text=" Untertitel der Amara.org-Community"),
+        core_segment(start=6, end=9, text=" Stille.", no_speech_prob=0.95, avg_logprob=-2.0),
+        core_segment(start=11, end=14, text=" Auf Wiedersehen."),
+    ]
+
+    stream = SegmentStream(pipeline(segments), pipeline)
+    cleaned = list(clean_transcription_segments(stream, cleaner_info()))
+
+    assert merger.merged == [" Guten Tag.", " Auf Wiedersehen."]
+    assert [(s.id, s.speaker, s.text) for s in cleaned] == [(0, "A", " Guten Tag."), (1, "A", " Auf Wiedersehen.")]
+
+
+def test_split_pieces_are_filtered_again_and_numbered_once():
+    words = [
+        Word(start=3.0, end=4.8, word=" Grüße", probability=0.9),
+        Word(start=5.2, end=7.0, word=" www.mooji.org", probability=0.9),
+        Word(start=10.5, end=12.0, word=" Straße", probability=0.9),
+    ]
+    pipeline = SegmentPipeline()
+    pipeline.add(splitters=[SpeakerMerger(_turns())])
+
+    cleaned = list(
+        clean_transcription_segments(
+            SegmentStream(
+                pipeline(
+                    [core_segment(start=3, end=12, text=" Grüße www.mooji.org Straße", words=words, language="en")]
+                ),
+                pipeline,
+            ),
+            cleaner_info(),
+        )
+    )
+
+    # The English hallucination spoken by B is dropped; the two A pieces keep contiguous ids.
+    assert [(s.id, s.speaker, s.text) for s in cleaned] == [(0, "A", " Grüsse"), (1, "A", " Strasse")]
+    assert [w.word for s in cleaned for w in s.words or []] == [" Grüsse", " Strasse"]
+
+
+def test_stages_cannot_be_added_once_the_stream_started():
+    pipeline = SegmentPipeline()
+    stream = SegmentStream(
+        pipeline([core_segment(start=0, end=1, text=" Eins."), core_segment(start=1, end=2, text=" Zwei.")]), pipeline
+    )
+    first = next(stream)
+
+    # Cleaning a started stream falls back to a pipeline of its own over the rest.
+    rest = list(clean_transcription_segments(stream, cleaner_info()))
+
+    assert (first.id, [s.text for s in rest]) == (0, [" Zwei."])
+    assert pipeline.filters == []
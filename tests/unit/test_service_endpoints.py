@@ -4,14 +4,18 @@ streaming applying the same cleaning as the other endpoints, and the task
 progress bar surviving a zero-duration transcription_info.
 """
 
+import json
 from types import SimpleNamespace
 from typing import Any, Optional
 
 import pytest
+from bentoml.exceptions import InvalidArgument
 
 from bentoml_faster_whisper.models.progress_response import ProgressResponse
 from bentoml_faster_whisper.models.transcription_request import TranscriptionRequest
 from bentoml_faster_whisper.service import FasterWhisper
+from bentoml_faster_whisper.services.faster_whisper_handler import FasterWhisperHandler
+from bentoml_faster_whisper.utils.cancellation import DeadlineExceeded
 from bentoml_faster_whisper.utils.core import Segment
 
 
@@ -47,7 +51,9 @@ class _StubHandler:
         self._segments = segments
         self._info = info
 
-    def prepare_audio_segments(self, request, diarization_progress_callback=None, decode_progress_callback=None):
+    def prepare_audio_segments(
+        self, request, diarization_progress_callback=None, decode_progress_callback=None, cancel=None
+    ):
         def gen():
             yield from self._segments
 
@@ -92,6 +98,21 @@ def test_streaming_drops_hallucinations_like_other_endpoints():
     assert "Bye." not in output
 
 
+def test_streaming_frames_segments_as_server_sent_events():
+    segments = [_segment(text=" Hello world."), _segment(id=1, start=1.0, end=2.0, text=" Bye now.")]
+    service = _service(_StubHandler(segments, _info(language="de")))
+    request = TranscriptionRequest.from_dict(
+        {"file": "/tmp/example.mp3", "diarization": False, "response_format": "srt", "stream_format": "sse"}
+    )
+
+    chunks = list(service.streaming_transcribe(**request.model_dump()))
+
+    assert chunks == [
+        "data: 1\ndata: 00:00:00,000 --> 00:00:01,000\ndata:  Hello world.\ndata: \ndata: \n\n",
+        "data: 2\ndata: 00:00:01,000 --> 00:00:02,000\ndata:  Bye now.\ndata: \ndata: \n\n",
+    ]
+
+
 def test_task_progress_survives_zero_duration():
     progress = _RecordingProgress()
     service = _service(_StubHandler([_segment(end=1.0)], _info(duration=0.0)))
@@ -106,3 +127,48 @@ def test_task_progress_survives_zero_duration():
     assert isinstance(result, str)
     assert progress.updates, "expected at least one progress update"
     assert progress.updates[-1].progress == pytest.approx(0.3)
+
+
+@pytest.mark.parametrize("endpoint", ["streaming_transcribe", "task_transcribe"])
+def test_arrow_is_rejected_where_the_body_must_be_text(endpoint):
+    service = _service(_StubHandler([_segment()], _info()))
+    request = TranscriptionRequest.from_dict(
+        {"file": "/tmp/example.mp3", "diarization": False, "response_format": "arrow"}
+    )
+
+    with pytest.raises(InvalidArgument, match="arrow"):
+        result = getattr(service, endpoint)(**request.model_dump())
+        list(result)
+
+
+def test_failure_after_the_first_segment_ends_the_body_with_the_error():
+    """An undiarized decode is lazy: a deadline after the first segment comes once the
+    body is being sent, so it is reported in the body rather than truncating it."""
+
+    def decode():
+        yield _segment()
+        raise DeadlineExceeded("deadline exceeded")
+
+    handler = FasterWhisperHandler(model_manager=SimpleNamespace(), diarization=SimpleNamespace())  # type: ignore
+    handler.prepare_audio_segments = lambda request, cancel=None: (decode(), _info())  # type: ignore
+    request = TranscriptionRequest.from_dict({"file": "/tmp/example.mp3", "diarization": False})
+
+    body = json.loads("".join(handler.transcribe_audio_chunks(request)))
+
+    assert body["text"] == "Hello world."
+    assert body["status"] == 504
+
+
+def test_failure_before_the_first_segment_is_raised_before_the_body_starts():
+    def decode():
+        raise DeadlineExceeded("deadline exceeded")
+        yield
+
+    handler = FasterWhisperHandler(model_manager=SimpleNamespace(), diarization=SimpleNamespace())  # type: ignore
+    handler.prepare_audio_segments = lambda request, cancel=None: (decode(), _info())  # type: ignore
+    service = _service(handler)
+    ctx = SimpleNamespace(request=None, response=SimpleNamespace(headers={}))
+    request = TranscriptionRequest.from_dict({"file": "/tmp/example.mp3", "diarization": False})
+
+    with pytest.raises(DeadlineExceeded):
+        service.transcribe(ctx=ctx, **request.model_dump())
@@ -1,16 +1,19 @@
+import threading
 from dataclasses import dataclass
 
-from faster_whisper.transcribe import Segment as FWSegment
-from faster_whisper.transcribe import Word as FWWord
+import numpy as np
 
 import bentoml_faster_whisper.utils.speech_regions as sr
 from bentoml_faster_whisper.utils.speech_regions import (
+    IntervalIndex,
+    collapse_decoded_to_speech,
     diarization_to_speech_intervals,
     group_intervals_by_language,
     restore_and_split_segments,
     speech_intervals_to_chunks,
     turns_to_language_runs,
 )
+from tests.unit._builders import fw_segment, fw_word
 
 
 @dataclass
@@ -19,26 +22,6 @@ class _Turn:
     end: float
 
 
-def _fw_word(start: float, end: float, word: str) -> FWWord:
-    return FWWord(start=start, end=end, word=word, probability=1.0)
-
-
-def _fw_segment(start, end, words, seg_id=0) -> FWSegment:
-    return FWSegment(
-        id=seg_id,
-        seek=0,
-        start=start,
-        end=end,
-        text="".join(w.word for w in words) if words else "silence",
-        tokens=[],
-        avg_logprob=0.0,
-        compression_ratio=1.0,
-        no_speech_prob=0.0,
-        words=words,
-        temperature=0.0,
-    )
-
-
 def test_empty_input_returns_empty_list():
     assert diarization_to_speech_intervals([]) == []
 
@@ -121,14 +104,53 @@ def test_chunks_entirely_past_audio_end_are_dropped():
     assert chunks == []
 
 
+def test_single_interval_collapse_is_a_view_of_the_decoded_audio():
+    decoded = np.arange(100, dtype=np.float32)
+
+    audio, chunks = collapse_decoded_to_speech(decoded, [(0.2, 0.5)], sampling_rate=100)
+
+    assert chunks == [{"start": 20, "end": 50}]
+    assert np.shares_memory(audio, decoded)
+    np.testing.assert_array_equal(audio, decoded[20:50])
+
+
+def test_multi_interval_collapse_reuses_the_thread_buffer():
+    decoded = np.arange(100, dtype=np.float32)
+
+    first, _ = collapse_decoded_to_speech(decoded, [(0.0, 0.1), (0.5, 0.6)], sampling_rate=100, reuse_buffer=True)
+    np.testing.assert_array_equal(first, np.r_[decoded[0:10], decoded[50:60]])
+    second, _ = collapse_decoded_to_speech(decoded, [(0.2, 0.25), (0.8, 0.9)], sampling_rate=100, reuse_buffer=True)
+    np.testing.assert_array_equal(second, np.r_[decoded[20:25], decoded[80:90]])
+    assert np.shares_memory(first, second)
+
+    other: list[np.ndarray] = []
+    thread = threading.Thread(
+        target=lambda: other.append(
+            collapse_decoded_to_speech(decoded, [(0.0, 0.1), (0.5, 0.6)], sampling_rate=100, reuse_buffer=True)[0]
+        )
+    )
+    thread.start()
+    thread.join()
+    assert not np.shares_memory(other[0], second)
+
+
+def test_multi_interval_collapse_without_reuse_returns_a_fresh_array():
+    decoded = np.arange(100, dtype=np.float32)
+
+    first, _ = collapse_decoded_to_speech(decoded, [(0.0, 0.1), (0.5, 0.6)], sampling_rate=100)
+    second, _ = collapse_decoded_to_speech(decoded, [(0.0, 0.1), (0.5, 0.6)], sampling_rate=100)
+
+    assert not np.shares_memory(first, second)
+
+
 def test_restore_splits_segment_straddling_the_seam():
     # Two speech regions, (0,2) and (10,12), collapsed back-to-back; 8s of silence removed.
     speech_chunks = [{"start": 0, "end": 32000}, {"start": 160000, "end": 192000}]
     intervals = [(0.0, 2.0), (10.0, 12.0)]
 
-    left = _fw_word(0.5, 1.0, " hello")
-    right = _fw_word(3.0, 3.5, " world")  # collapsed time in the second chunk
-    seg = _fw_segment(0.5, 3.5, [left, right])
+    left = fw_word(0.5, 1.0, " hello")
+    right = fw_word(3.0, 3.5, " world")  # collapsed time in the second chunk
+    seg = fw_segment(0.5, 3.5, [left, right])
 
     out = list(restore_and_split_segments([seg], speech_chunks, intervals, 12.0, 16000))
 
@@ -145,8 +167,8 @@ def test_restore_keeps_single_region_segment_intact():
     speech_chunks = [{"start": 0, "end": 32000}]
     intervals = [(0.0, 2.0)]
 
-    words = [_fw_word(0.2, 0.5, " a"), _fw_word(0.6, 0.9, " b")]
-    seg = _fw_segment(0.2, 0.9, words)
+    words = [fw_word(0.2, 0.5, " a"), fw_word(0.6, 0.9, " b")]
+    seg = fw_segment(0.2, 0.9, words)
 
     out = list(restore_and_split_segments([seg], speech_chunks, intervals, 2.0, 16000))
 
@@ -160,7 +182,7 @@ def test_restore_clamps_segment_end_to_duration():
     speech_chunks = [{"start": 0, "end": 32000}]  # interval (0, 2) but the file is only 1.5s
     intervals = [(0.0, 2.0)]
 
-    seg = _fw_segment(0.0, 2.0, None)
+    seg = fw_segment(0.0, 2.0, None)
 
     out = list(restore_and_split_segments([seg], speech_chunks, intervals, 1.5, 16000))
 
@@ -173,7 +195,7 @@ def test_restore_clamps_word_boundaries_to_duration():
     speech_chunks = [{"start": 0, "end": 32000}]
     intervals = [(0.0, 2.0)]
 
-    seg = _fw_segment(1.4, 2.0, [_fw_word(1.4, 2.0, " tail")])
+    seg = fw_segment(1.4, 2.0, [fw_word(1.4, 2.0, " tail")])
 
     out = list(restore_and_split_segments([seg], speech_chunks, intervals, 1.5, 16000))
 
@@ -183,6 +205,39 @@ def test_restore_clamps_word_boundaries_to_duration():
     assert out[0].end == 1.5
 
 
+def _first_containing(intervals, t: float, tolerance_s: float) -> int | None:
+    return next((i for i, (s, e) in enumerate(intervals) if s - tolerance_s <= t <= e + tolerance_s), None)
+
+
+def test_interval_index_matches_a_scan_within_the_tolerance():
+    rng = np.random.default_rng(3)
+    # Disjoint sorted intervals, some closer than twice the tolerance so widened ones overlap.
+    gaps = rng.choice([0.05, 0.15, 0.5, 3.0], size=200)
+    lengths = rng.uniform(0.2, 8.0, size=200)
+    starts = np.cumsum(gaps + np.concatenate(([0.0], lengths[:-1])))
+    intervals = list(zip(starts.tolist(), (starts + lengths).tolist()))
+    edges = [x + d for interval in intervals for x in interval for d in (-0.1, 0.0, 0.1)]
+    points = rng.uniform(-1.0, intervals[-1][1] + 1.0, size=2000).tolist() + edges
+
+    for tolerance_s in (0.0, 0.1):
+        index = IntervalIndex(intervals, tolerance_s)
+        expected = [_first_containing(intervals, t, tolerance_s) for t in points]
+        assert [index.find(t) for t in points] == expected
+        assert index.find_many(np.array(points)).tolist() == [-1 if i is None else i for i in expected]
+
+
+def test_interval_index_scans_unsorted_intervals_and_handles_none():
+    intervals = [(5.0, 8.0), (1.0, 3.0), (2.0, 6.0)]
+    index = IntervalIndex(intervals)
+    points = [0.0, 1.5, 2.5, 5.5, 7.0, 9.0]
+    assert [index.find(t) for t in points] == [_first_containing(intervals, t, 0.0) for t in points]
+    assert index.find_many(np.array([2.5, 9.0])).tolist() == [1, -1]
+
+    empty = IntervalIndex([])
+    assert empty.find(1.0) is None
+    assert empty.find_many(np.array([1.0])).tolist() == [-1]
+
+
 def test_group_intervals_by_language_groups_consecutive_runs():
     intervals = [(0.0, 5.0), (6.0, 10.0), (12.0, 20.0), (21.0, 25.0)]
     languages = ["de", "de", "en", "de"]
@@ -0,0 +1,68 @@
+"""Heartbeats, coalescing and early close of the streaming endpoint's output."""
+
+import threading
+import time
+
+import pytest
+
+from bentoml_faster_whisper.utils.stream_pacing import paced_chunks
+
+
+def _paced(produce, **options):
+    return paced_chunks(produce, time.monotonic(), "sse", **options)
+
+
+def test_heartbeats_are_sent_while_the_producer_is_quiet():
+    def produce():
+        time.sleep(0.35)
+        yield "data: a\n\n"
+
+    chunks = list(_paced(produce, heartbeat=": hb\n\n", heartbeat_s=0.1))
+
+    assert chunks[-1] == "data: a\n\n"
+    assert chunks[:-1] and set(chunks[:-1]) == {": hb\n\n"}
+
+
+def test_chunks_within_the_flush_interval_are_sent_together():
+    def produce():
+        yield "1"
+        yield "2"
+        yield "3"
+        time.sleep(0.3)
+        yield "4"
+
+    assert list(_paced(produce, flush_s=0.15)) == ["1", "23", "4"]
+    assert list(_paced(produce)) == ["1", "2", "3", "4"]
+
+
+def test_producer_failures_reach_the_sender():
+    def produce():
+        yield "1"
+        raise ValueError("decode failed")
+
+    chunks = _paced(produce)
+
+    assert next(chunks) == "1"
+    with pytest.raises(ValueError, match="decode failed"):
+        next(chunks)
+
+
+def test_closing_early_tells_the_producer_to_stop():
+    closed = threading.Event()
+    released = threading.Event()
+
+    def produce():
+        try:
+            yield "1"
+            released.wait(5)
+            yield "2"
+        finally:
+            closed.set()
+
+    chunks = _paced(produce, on_close=released.set)
+
+    assert next(chunks) == "1"
+    chunks.close()
+
+    assert released.is_set()
+    assert closed.wait(5)
@@ -1,9 +1,15 @@
+import dataclasses
+
+import pytest
+from pydantic import ValidationError
+
 from bentoml_faster_whisper.config import faster_whisper_config
-from bentoml_faster_whisper.models.enums import Language
+from bentoml_faster_whisper.models.enums import Language, SegmentField
 from bentoml_faster_whisper.models.transcription_request import (
     TranscriptionRequest,
     _process_empty_language,
 )
+from bentoml_faster_whisper.utils.core import Segment
 
 
 def test_invalid_language_falls_back_to_default_without_raising():
@@ -25,3 +31,19 @@ def test_valid_language_is_preserved():
 def test_request_accepts_invalid_language_and_auto_detects():
     request = TranscriptionRequest.from_dict({"file": "/tmp/example.mp3", "language": "xx", "diarization": False})
     assert request.language is None
+
+
+def test_segment_fields_name_the_segment_dataclass_fields():
+    assert [field.value for field in SegmentField] == [field.name for field in dataclasses.fields(Segment)]
+
+
+def test_include_and_compact_select_the_verbose_segment_fields():
+    def fields(**params):
+        return TranscriptionRequest.from_dict({"file": "/tmp/example.mp3", **params}).verbose_segment_fields
+
+    assert fields() is None
+    assert fields(include="start, end,text") == {"start", "end", "text"}
+    assert fields(**{"include[]": ["text", "words"], "compact": True}) == {"text"}
+    assert fields(compact=True) == {field.value for field in SegmentField} - {"tokens", "words"}
+    with pytest.raises(ValidationError):
+        fields(include="start,confidence")
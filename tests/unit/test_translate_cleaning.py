@@ -6,6 +6,7 @@ output while the same audio through ``/transcriptions`` was filtered. A fake Whi
 model drives the path without loading real weights.
 """
 
+import contextlib
 import json
 from pathlib import Path
 from types import SimpleNamespace
@@ -52,7 +53,7 @@ class _FakeWhisper:
 def _handler(segments) -> FasterWhisperHandler:
     model_manager = cast(
         WhisperModelProvider,
-        SimpleNamespace(get=lambda: _FakeWhisper(segments), model_id="fake"),
+        SimpleNamespace(lease=lambda model_id=None: contextlib.nullcontext(_FakeWhisper(segments)), model_id="fake"),
     )
     return FasterWhisperHandler(model_manager=model_manager, diarization=cast(DiarizationService, None))
 
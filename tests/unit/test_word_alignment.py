@@ -0,0 +1,140 @@
+"""Lazy word alignment: only segments spanning a speaker change (or a chunk gap) are aligned."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from faster_whisper.transcribe import Segment as FWSegment
+from pyannote.core import Segment
+
+from bentoml_faster_whisper.services.diarization_service import DiarizationSegment
+from bentoml_faster_whisper.utils import word_alignment
+from bentoml_faster_whisper.utils.speech_regions import WHISPER_SAMPLE_RATE
+from bentoml_faster_whisper.utils.word_alignment import (
+    SpeakerTurnIndex,
+    add_words_where_speakers_change,
+    align_segment_words,
+    segments_needing_words,
+)
+from tests.unit._builders import fw_segment, pool_with_request_arriving_during_encode
+
+EOT = 50257
+TURNS = [
+    DiarizationSegment(segment=Segment(0.0, 4.0), speaker="A"),
+    DiarizationSegment(segment=Segment(4.0, 8.0), speaker="B"),
+    DiarizationSegment(segment=Segment(12.0, 16.0), speaker="B"),
+]
+
+
+def _segment(start: float, end: float, tokens: list[int] | None = None) -> FWSegment:
+    return fw_segment(start, end, text=" text", tokens=tokens if tokens is not None else [1, 2])
+
+
+def _chunks(*intervals: tuple[float, float]) -> list[dict]:
+    return [{"start": int(s * WHISPER_SAMPLE_RATE), "end": int(e * WHISPER_SAMPLE_RATE)} for s, e in intervals]
+
+
+def test_turn_index_reports_overlapping_speakers():
+    index = SpeakerTurnIndex(reversed(TURNS))
+
+    assert index.speakers(1.0, 3.0) == {"A"}
+    assert index.speakers(3.0, 5.0) == {"A", "B"}
+    assert index.speakers(8.5, 11.5) == set()
+    assert not index.spans_speaker_change(4.0, 16.0)
+    assert index.spans_speaker_change(3.9, 16.0)
+
+
+def test_only_segments_spanning_a_speaker_change_or_chunk_gap_need_words():
+    # Collapsed timeline: chunk 0 = 0..8 s, chunk 1 = 12..16 s (collapsed 8..12 s).
+    chunks = _chunks((0.0, 8.0), (12.0, 16.0))
+    segments = [
+        _segment(0.0, 3.5),  # inside A
+        _segment(3.5, 5.0),  # A -> B
+        _segment(5.0, 7.5),  # inside B
+        _segment(7.5, 9.0),  # crosses the silence gap between chunks, same speaker
+        _segment(9.0, 11.0),  # inside B, second chunk
+    ]
+
+    assert segments_needing_words(segments, chunks, SpeakerTurnIndex(TURNS)) == [1, 3]
+
+
+def test_only_straddling_segments_are_aligned(monkeypatch):
+    aligned_calls: list[list[float]] = []
+
+    def fake_align(whisper, audio, segments, language):
+        aligned_calls.append([s.start for s in segments])
+        return [f"aligned@{s.start}" for s in segments]
+
+    monkeypatch.setattr(word_alignment, "align_segment_words", fake_align)
+    segments = [_segment(0.0, 3.5), _segment(3.5, 5.0), _segment(5.0, 7.5)]
+
+    result = add_words_where_speakers_change(
+        None, np.zeros(1), iter(segments), _chunks((0.0, 8.0)), SpeakerTurnIndex(TURNS), "de"
+    )
+
+    assert aligned_calls == [[3.5]]
+    assert result == [segments[0], "aligned@3.5", segments[2]]
+
+
+class _FakeTokenizer:
+    def token_to_id(self, token: str) -> int:
+        return EOT if token == "<|endoftext|>" else 50300
+
+
+class _FakeExtractor:
+    nb_max_frames = 3000
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        return np.zeros((80, len(audio) // 160), dtype=np.float32)
+
+
+class _FakeWhisper:
+    def __init__(self) -> None:
+        self.hf_tokenizer = _FakeTokenizer()
+        self.model = SimpleNamespace(is_multilingual=True)
+        self.feature_extractor = _FakeExtractor()
+        self.alignment_calls: list[tuple[list[list[int]], list[int]]] = []
+
+    def encode(self, features: np.ndarray) -> np.ndarray:
+        assert features.shape[1:] == (80, 3000)
+        return features
+
+    def find_alignment(self, tokenizer, text_tokens, encoder_output, num_frames):
+        self.alignment_calls.append((text_tokens, num_frames))
+        return [
+            [
+                {"word": " Hallo", "tokens": [1], "start": 0.1, "end": 0.5, "probability": 0.9},
+                {"word": ",", "tokens": [2], "start": 0.5, "end": 0.6, "probability": 0.8},
+                {"word": " du", "tokens": [3], "start": 0.7, "end": 1.0, "probability": 0.7},
+            ]
+            for _ in text_tokens
+        ]
+
+
+def test_align_segment_words_offsets_words_and_batches():
+    whisper = _FakeWhisper()
+    segments = [_segment(2.0, 3.5, [1, 2, 3, EOT + 60]), _segment(5.0, 6.0, [EOT + 1]), _segment(7.0, 8.0)]
+
+    aligned = align_segment_words(whisper, np.zeros(10 * WHISPER_SAMPLE_RATE), segments, "de", batch_size=1)
+
+    # Timestamp / special tokens are not aligned; a segment without text tokens keeps no words.
+    assert [call[0] for call in whisper.alignment_calls] == [[[1, 2, 3]], [[1, 2]]]
+    assert whisper.alignment_calls[0][1] == [150]
+    first = aligned[0].words
+    assert first is not None
+    assert [(w.word, w.start, w.end) for w in first] == [
+        (" Hallo,", pytest.approx(2.1), pytest.approx(2.5)),
+        (" du", pytest.approx(2.7), pytest.approx(3.0)),
+    ]
+    assert aligned[1] is segments[1]
+    assert aligned[2].words is not None
+
+
+def test_alignment_through_a_replica_pool_stays_on_the_encoding_replica():
+    replicas = [_FakeWhisper(), _FakeWhisper()]
+
+    with pool_with_request_arriving_during_encode(replicas) as pool:
+        align_segment_words(pool, np.zeros(10 * WHISPER_SAMPLE_RATE), [_segment(2.0, 3.5, [1, 2, 3])], "de")
+
+    assert len(replicas[0].alignment_calls) == 1
+    assert replicas[1].alignment_calls == []